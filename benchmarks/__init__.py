@@ -0,0 +1,6 @@
+"""Performance benchmarks. Standalone scripts that measure the API under load and print machine-readable JSON results.
+
+Run from the repository root, e.g. ``uv run python -m benchmarks.async_throughput``.
+``benchmarks.suite`` (micro-benchmarks) and ``benchmarks.load`` (end-to-end load)
+save reports with ``--output`` that later runs check for regressions with ``--baseline``.
+"""
@@ -0,0 +1,112 @@
+"""WSGI vs ASGI throughput benchmark. Drives the Flask app from a thread pool and the ASGI app from concurrent asyncio tasks against the same SQLite file, then prints requests per second and latency percentiles as JSON."""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _summarize(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    quantiles = statistics.quantiles(ordered, n=100)
+    return {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+def _paths(total: int, rows: int) -> list[str]:
+    # Alternate point reads and first-page listings so both query shapes are exercised
+    return [
+        f"/api/todos/{i % rows + 1}" if i % 2 else "/api/todos?limit=20"
+        for i in range(total)
+    ]
+
+
+def run_wsgi(paths: list[str], concurrency: int) -> dict:
+    from todo_api import create_app
+
+    app = create_app("development")
+
+    def _request(path: str) -> float:
+        start = time.perf_counter()
+        response = app.test_client().get(path)
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(_request, paths))
+        elapsed = time.perf_counter() - start
+    return _summarize(latencies, elapsed)
+
+
+async def _run_asgi(paths: list[str], concurrency: int) -> dict:
+    import httpx
+
+    from todo_api.asgi import create_asgi_app
+
+    app = create_asgi_app("development")
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def _request(path: str) -> float:
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    assert response.status_code == 200, response.status_code
+                    return time.perf_counter() - start
+
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(_request(path) for path in paths))
+            elapsed = time.perf_counter() - start
+    return _summarize(list(latencies), elapsed)
+
+
+def _seed(rows: int) -> None:
+    from todo_api import create_app
+    from todo_api.extensions import db
+    from todo_api.features.todos.models import TodoModel
+
+    app = create_app("development")
+    with app.app_context():
+        db.session.execute(
+            TodoModel.__table__.insert(),
+            [{"title": f"Todo {i}", "completed": False} for i in range(rows)],
+        )
+        db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        _seed(args.rows)
+        paths = _paths(args.requests, args.rows)
+        results = {
+            "concurrency": args.concurrency,
+            "rows": args.rows,
+            "wsgi": run_wsgi(paths, args.concurrency),
+            "asgi": asyncio.run(_run_asgi(paths, args.concurrency)),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Group commit benchmark. Drives single-todo creates from 1, 8 and 64 concurrent client threads against a SQLite file, once with every write committing on its own and once through GroupCommitTodoRepository, then prints write throughput and latency percentiles per client count as JSON.
+
+Clients are threads of one process, as the request threads of one server worker
+are; group commit only gathers writes made within a process. Each commit costs
+an fsync with ``--synchronous FULL``, which is where sharing one pays off most.
+Save a run with ``--output`` and pass it to a later run as ``--baseline`` to exit
+non-zero when any case's p95 write latency regressed by more than ``--threshold``.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from benchmarks.harness import check_baseline, environment, report, summarize
+from todo_api.config import Config
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.group_commit_repository import GroupCommitTodoRepository
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.domain import Todo
+from todo_api.infrastructure.database import configure_sqlite
+
+MODES = ("direct", "group_commit")
+
+
+def _csv(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def measure(
+    path: Path, mode: str, clients: int, writes: int, pragmas: dict, window: float, batch: int
+) -> dict:
+    """Time ``writes`` creates from each of ``clients`` threads against a new database."""
+    engine = create_engine(f"sqlite:///{path}", pool_size=clients + 2)
+    configure_sqlite(engine, pragmas)
+    db.metadata.create_all(engine)
+    # Scoped to the thread, so each client writes on its own session and connection
+    sessions = scoped_session(sessionmaker(engine))
+    if mode == "group_commit":
+        repository = GroupCommitTodoRepository(engine, sessions, window=window, max_batch=batch)
+    else:
+        repository = SqlTodoRepository(sessions)
+
+    barrier = threading.Barrier(clients)
+    latencies: list[list[float]] = [[] for _ in range(clients)]
+    spans: list[tuple[float, float]] = [(0.0, 0.0)] * clients
+    # Writes that waited out SQLite's busy timeout for the write lock and failed
+    errors = [0] * clients
+
+    def client(slot: int) -> None:
+        barrier.wait()
+        started = time.perf_counter()
+        for i in range(writes):
+            start = time.perf_counter()
+            try:
+                repository.create(Todo(title=f"Write {i}"))
+            except OperationalError:
+                errors[slot] += 1
+                sessions.rollback()
+                continue
+            latencies[slot].append(time.perf_counter() - start)
+        spans[slot] = (started, time.perf_counter())
+        sessions.remove()
+
+    threads = [threading.Thread(target=client, args=(slot,)) for slot in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if mode == "group_commit":
+        repository.close()
+    assert SqlTodoRepository(sessions).count_stats().total == clients * writes - sum(errors)
+    sessions.remove()
+    engine.dispose()
+    elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+    result = summarize([t for slot in latencies for t in slot], elapsed)
+    result["errors"] = sum(errors)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=_csv, default=[1, 8, 64])
+    parser.add_argument(
+        "--writes", type=int, default=3200, help="creates per case, split over clients"
+    )
+    parser.add_argument("--synchronous", default=Config.SQLITE_PRAGMAS["synchronous"])
+    parser.add_argument("--window-ms", type=float, default=Config.TODOS_GROUP_COMMIT_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=Config.TODOS_GROUP_COMMIT_MAX_BATCH)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    pragmas = {**Config.SQLITE_PRAGMAS, "synchronous": args.synchronous}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for clients in args.clients:
+            for mode in MODES:
+                results[f"{mode}[clients={clients}]"] = measure(
+                    Path(tmp) / f"{mode}-{clients}.db",
+                    mode,
+                    clients,
+                    max(args.writes // clients, 1),
+                    pragmas,
+                    args.window_ms / 1000,
+                    args.max_batch,
+                )
+    for clients in args.clients:
+        direct = results[f"direct[clients={clients}]"]
+        grouped = results[f"group_commit[clients={clients}]"]
+        grouped["speedup"] = round(grouped["per_sec"] / direct["per_sec"], 2)
+
+    report(
+        {
+            "environment": environment(),
+            "config": {
+                "clients": args.clients,
+                "writes": args.writes,
+                "synchronous": args.synchronous,
+                "window_ms": args.window_ms,
+                "max_batch": args.max_batch,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+    check_baseline(results, args.baseline, "p95_ms", args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Shared benchmark helpers. Times repeated calls, summarizes latencies as percentiles, seeds the todos table and compares results against a saved baseline."""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+SEED_CHUNK = 50_000
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict:
+    """Summarize latencies in seconds as ms percentiles and a rate over ``elapsed`` (their sum by default)."""
+    ordered = sorted(latencies)
+    if len(ordered) > 1:
+        quantiles = statistics.quantiles(ordered, n=100, method="inclusive")
+    else:
+        quantiles = ordered * 99
+    elapsed = sum(ordered) if elapsed is None else elapsed
+    return {
+        "count": len(ordered),
+        "per_sec": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(quantiles[49] * 1000, 4),
+        "p95_ms": round(quantiles[94] * 1000, 4),
+        "p99_ms": round(quantiles[98] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def time_calls(call: Callable[[], Any], iterations: int, warmup: int = 10) -> dict:
+    """Call ``call`` after ``warmup`` untimed calls and summarize the latency of each timed call."""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def seed_todos(rows: int) -> None:
+    """Insert ``rows`` todos, a third of them completed, into the current app's database."""
+    from todo_api.extensions import db
+    from todo_api.features.todos.models import TodoModel
+
+    for start in range(0, rows, SEED_CHUNK):
+        db.session.execute(
+            TodoModel.__table__.insert(),
+            [
+                {"title": f"Todo {i}", "completed": i % 3 == 0}
+                for i in range(start, min(start + SEED_CHUNK, rows))
+            ],
+        )
+    db.session.commit()
+
+
+def environment() -> dict:
+    """Describe where the results were taken, so runs are only compared like for like."""
+    import sqlalchemy
+
+    return {
+        "taken_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, metric: str, threshold: float) -> list[str]:
+    """Return a message for every result whose ``metric`` grew more than ``threshold`` over the baseline.
+
+    Both arguments map names to summaries; names missing from either side are skipped.
+    """
+    regressions = []
+    for name, summary in results.items():
+        before = baseline.get(name, {}).get(metric)
+        after = summary.get(metric)
+        if before and after is not None and after > before * (1 + threshold):
+            regressions.append(f"{name}: {metric} {before} -> {after} (+{after / before - 1:.0%})")
+    return regressions
+
+
+def report(results: dict, output: str | None) -> None:
+    """Print results as JSON and write them to ``output`` if given."""
+    encoded = json.dumps(results, indent=2)
+    print(encoded)
+    if output:
+        with open(output, "w") as file:
+            file.write(encoded + "\n")
+
+
+def check_baseline(
+    results: dict, baseline_path: str | None, metric: str, threshold: float
+) -> None:
+    """Exit with status 1 if any result regressed against the ``results`` of a report saved earlier."""
+    if not baseline_path:
+        return
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, metric, threshold)
+    for message in regressions:
+        print(f"regression: {message}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
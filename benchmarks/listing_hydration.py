@@ -0,0 +1,101 @@
+"""Listing hydration benchmark. Lists a large todos table through the ORM-instance path the repository used to take and through the current row-tuple path into slotted Todo objects, then prints time and memory per listing as JSON."""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class _DictTodo:
+    """The previous, non-slotted shape of the Todo domain type."""
+
+    title: str
+    completed: bool = False
+    id: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+def _orm_listing() -> list:
+    from sqlalchemy import select
+
+    from todo_api.extensions import db
+    from todo_api.features.todos.models import TodoModel
+
+    stmt = select(TodoModel).order_by(TodoModel.created_at, TodoModel.id)
+    todos = [
+        _DictTodo(
+            id=m.id,
+            title=m.title,
+            completed=m.completed,
+            created_at=m.created_at,
+            updated_at=m.updated_at,
+        )
+        for m in db.session.scalars(stmt)
+    ]
+    # Release the identity map, as the end of a request would
+    db.session.expunge_all()
+    return todos
+
+
+def _row_listing() -> list:
+    from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+
+    return SqlTodoRepository().get_all()
+
+
+def _measure(listing, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        listing()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    todos = listing()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(todos),
+        "best_ms": round(min(timings) * 1000, 1),
+        "rows_per_sec": round(len(todos) / min(timings)),
+        "peak_mib": round(peak / 2**20, 1),
+        "retained_mib": round(retained / 2**20, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from todo_api import create_app
+    from todo_api.extensions import db
+    from todo_api.features.todos.models import TodoModel
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        db.session.execute(
+            TodoModel.__table__.insert(),
+            [{"title": f"Todo {i}", "completed": i % 2 == 0} for i in range(args.rows)],
+        )
+        db.session.commit()
+
+        orm = _measure(_orm_listing, args.repeat)
+        rows = _measure(_row_listing, args.repeat)
+
+    rows["speedup"] = round(rows["rows_per_sec"] / orm["rows_per_sec"], 2)
+    rows["peak_memory_ratio"] = round(rows["peak_mib"] / orm["peak_mib"], 2)
+    print(json.dumps({"orm_dataclass": orm, "core_rows_slots": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""End-to-end load driver. Sends a weighted mix of REST and GraphQL requests to the WSGI app from concurrent worker threads, in process or against a running server, then prints requests per second and latency percentiles overall and per operation as JSON.
+
+Save a run with ``--output`` and pass it to a later run as ``--baseline`` to exit
+non-zero when any operation's p95 latency regressed by more than ``--threshold``.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks.harness import check_baseline, environment, report, seed_todos, summarize
+
+OPERATIONS = ("list", "get", "search", "stats", "create", "toggle", "delete", "graphql")
+DEFAULT_MIX = "list=35,get=25,search=5,stats=5,create=10,toggle=10,delete=5,graphql=5"
+
+GRAPHQL_QUERY = (
+    "query Page($first: Int) { todosConnection(first: $first) "
+    "{ edges { node { id title completed } } pageInfo { hasNextPage endCursor } } }"
+)
+
+# Statuses each operation is expected to answer with
+_OK = {200, 201, 204}
+
+
+class _Workload:
+    """Builds requests for each operation, tracking todos created by the run so deletes hit real rows."""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self._created: deque[int] = deque()
+        self._lock = threading.Lock()
+
+    def request(self, operation: str, rng: random.Random) -> tuple[str, str, str, dict | None]:
+        """Return the (operation, method, path, JSON body) of one request for the operation.
+
+        The operation returned differs from the one asked for when a delete finds
+        no todo of the run's own to delete and creates one instead.
+        """
+        todo_id = rng.randint(1, self.rows)
+        if operation == "delete":
+            with self._lock:
+                doomed = self._created.popleft() if self._created else None
+            if doomed is not None:
+                return operation, "DELETE", f"/api/todos/{doomed}", None
+            operation = "create"
+        if operation == "list":
+            return operation, "GET", "/api/todos?limit=20", None
+        if operation == "get":
+            return operation, "GET", f"/api/todos/{todo_id}", None
+        if operation == "search":
+            return operation, "GET", f"/api/todos?q=Todo+{todo_id}&limit=20", None
+        if operation == "stats":
+            return operation, "GET", "/api/todos/stats", None
+        if operation == "create":
+            return operation, "POST", "/api/todos", {"title": f"Load {todo_id}"}
+        if operation == "toggle":
+            return operation, "PATCH", f"/api/todos/{todo_id}", None
+        if operation == "graphql":
+            body = {"query": GRAPHQL_QUERY, "variables": {"first": 20}}
+            return operation, "POST", "/graphql", body
+        raise ValueError(f"Unknown operation {operation!r}")
+
+    def created(self, body: bytes) -> None:
+        with self._lock:
+            self._created.append(json.loads(body)["id"])
+
+
+class _InProcessClient:
+    """Calls the Flask app through its test client, skipping the network."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def send(self, method: str, path: str, body: dict | None) -> tuple[int, bytes]:
+        response = self._client.open(path, method=method, json=body)
+        return response.status_code, response.get_data()
+
+
+class _HttpClient:
+    """Sends requests to a running server over one keep-alive connection."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        connection = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self._connection = connection(parts.netloc, timeout=30)
+        self._prefix = parts.path.rstrip("/")
+
+    def send(self, method: str, path: str, body: dict | None) -> tuple[int, bytes]:
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        self._connection.request(method, self._prefix + path, payload, headers)
+        response = self._connection.getresponse()
+        return response.status, response.read()
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse ``name=weight`` pairs separated by commas."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}"
+            )
+        mix[name] = int(weight)
+    if not mix or min(mix.values()) < 0 or sum(mix.values()) == 0:
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def drive(
+    make_client,
+    workload: _Workload,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+    requests: int | None,
+) -> dict:
+    """Run ``concurrency`` workers until ``duration`` elapses or ``requests`` are sent, and summarize them."""
+    operations, weights = list(mix), list(mix.values())
+    budget = iter(range(requests)) if requests is not None else None
+    budget_lock = threading.Lock()
+
+    def worker(seed: int) -> tuple[dict[str, list[float]], dict[str, int]]:
+        rng = random.Random(seed)
+        client = make_client()
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                with budget_lock:
+                    if next(budget, None) is None:
+                        break
+            operation, method, path, body = workload.request(
+                rng.choices(operations, weights)[0], rng
+            )
+            start = time.perf_counter()
+            try:
+                status, content = client.send(method, path, body)
+            except OSError:
+                status, content = 0, b""
+            latencies[operation].append(time.perf_counter() - start)
+            if status not in _OK:
+                errors[operation] += 1
+            elif operation == "create":
+                workload.created(content)
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    for worker_latencies, worker_errors in outcomes:
+        for operation, timings in worker_latencies.items():
+            latencies[operation].extend(timings)
+        for operation, count in worker_errors.items():
+            errors[operation] += count
+
+    results = {"overall": summarize([t for ts in latencies.values() for t in ts], elapsed)}
+    results["overall"]["errors"] = sum(errors.values())
+    for operation in OPERATIONS:
+        if latencies[operation]:
+            results[operation] = summarize(latencies[operation], elapsed)
+            results[operation]["errors"] = errors[operation]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run for")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="name=weight,...")
+    parser.add_argument("--rows", type=int, default=10_000, help="todos to seed or present")
+    parser.add_argument("--url", help="base URL of a running server; seeds nothing")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    workload = _Workload(args.rows)
+    duration = float("inf") if args.requests is not None else args.duration
+    config = {
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "duration": None if args.requests is not None else args.duration,
+        "requests": args.requests,
+        "mix": args.mix,
+        "rows": args.rows,
+    }
+
+    if args.url:
+        results = drive(
+            lambda: _HttpClient(args.url),
+            workload,
+            args.mix,
+            args.concurrency,
+            duration,
+            args.requests,
+        )
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Config reads the environment on import. Request logs would dominate the measurement.
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'load.db'}"
+            os.environ.setdefault("LOG_LEVEL", "WARNING")
+            from todo_api import create_app
+            from todo_api.extensions import db
+
+            app = create_app("production")
+            with app.app_context():
+                db.create_all()
+                seed_todos(args.rows)
+                db.session.remove()
+            results = drive(
+                lambda: _InProcessClient(app),
+                workload,
+                args.mix,
+                args.concurrency,
+                duration,
+                args.requests,
+            )
+            with app.app_context():
+                db.engine.dispose()
+
+    report({"environment": environment(), "config": config, "results": results}, args.output)
+    check_baseline(results, args.baseline, "p95_ms", args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""List serialization benchmark. Encodes a large todo listing into a JSON response with marshmallow and the default provider, then with the fast serializer and the orjson provider, checks the bodies are byte-identical and prints rows per second as JSON."""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask.json.provider import DefaultJSONProvider
+
+
+def _todos(rows: int) -> list:
+    from todo_api.features.todos.domain import Todo
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Todo(
+            id=i,
+            title=f"Todo number {i}",
+            completed=i % 3 == 0,
+            created_at=start + timedelta(seconds=i, microseconds=i),
+            updated_at=start + timedelta(seconds=i * 2),
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def _measure(encode, repeat: int, rows: int) -> tuple[bytes, dict]:
+    body = encode()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return body, {"best_ms": round(best * 1000, 3), "rows_per_sec": round(rows / best)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from todo_api import create_app
+    from todo_api.features.todos.rest.schemas import todos_schema
+    from todo_api.features.todos.rest.serializers import todo_serializer
+    from todo_api.infrastructure.json_provider import OrjsonProvider
+
+    app = create_app("testing")
+    todos = _todos(args.rows)
+    default, fast = DefaultJSONProvider(app), OrjsonProvider(app)
+
+    variants = {
+        "marshmallow+json": lambda: default.response(todos_schema.dump(todos)).get_data(),
+        "fast+json": lambda: default.response(todo_serializer.dump_many(todos)).get_data(),
+        "fast+orjson": lambda: fast.response(todo_serializer.dump_many(todos)).get_data(),
+    }
+    bodies, results = {}, {"rows": args.rows}
+    with app.app_context():
+        for name, encode in variants.items():
+            bodies[name], results[name] = _measure(encode, args.repeat, args.rows)
+
+    baseline = bodies["marshmallow+json"]
+    results["byte_identical"] = all(body == baseline for body in bodies.values())
+    for name in ("fast+json", "fast+orjson"):
+        results[name]["speedup"] = round(
+            results[name]["rows_per_sec"] / results["marshmallow+json"]["rows_per_sec"], 2
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
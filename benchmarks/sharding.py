@@ -0,0 +1,127 @@
+"""Shard scaling benchmark. Drives single-todo writes for many tenants through ShardedTodoRepository from concurrent writer processes over 1, 2, 4 and 8 SQLite files, then prints write throughput and latency percentiles per shard count as JSON.
+
+SQLite takes one writer per database at a time, so throughput should grow with the
+shard count until the writers or the disk run out. Writers are processes, as server
+workers would be; threads in one interpreter mostly wait on each other for the GIL.
+Save a run with ``--output`` and pass it to a later run as ``--baseline`` to exit
+non-zero when any shard count's p95 write latency regressed by more than ``--threshold``.
+"""
+
+import argparse
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import check_baseline, environment, report, summarize
+
+
+def _csv(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _open(directory: Path, shards: int):
+    from todo_api.config import Config
+    from todo_api.features.todos.adapters.sharded_repository import (
+        ShardedTodoRepository,
+        create_shard,
+    )
+
+    return ShardedTodoRepository([
+        create_shard(
+            f"shard-{position}",
+            position,
+            f"sqlite:///{directory / f'shard-{position}.db'}",
+            pragmas=Config.SQLITE_PRAGMAS,
+        )
+        for position in range(shards)
+    ])
+
+
+def _writer(directory, shards, writes, tenants, seed, barrier, results) -> None:
+    # Runs in a child process; every writer connects before any starts writing
+    from todo_api.features.todos.domain import Todo
+
+    repository = _open(directory, shards)
+    rng = random.Random(seed)
+    barrier.wait()
+    started = time.perf_counter()
+    latencies = []
+    for i in range(writes):
+        todo = Todo(title=f"Write {i}", owner=f"tenant-{rng.randrange(tenants)}")
+        start = time.perf_counter()
+        repository.create(todo)
+        latencies.append(time.perf_counter() - start)
+    results.put((started, time.perf_counter(), latencies))
+    repository.close()
+
+
+def measure(root: Path, shards: int, writers: int, writes: int, tenants: int) -> dict:
+    """Time ``writes`` creates from each of ``writers`` processes against ``shards`` new databases."""
+    directory = root / f"shards-{shards}"
+    directory.mkdir()
+    repository = _open(directory, shards)
+    repository.create_all()
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(writers)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_writer, args=(directory, shards, writes, tenants, seed, barrier, results)
+        )
+        for seed in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert repository.count_stats().total == writers * writes
+    repository.close()
+    elapsed = max(end for _, end, _ in outcomes) - min(start for start, _, _ in outcomes)
+    return summarize([t for _, _, ts in outcomes for t in ts], elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shards", type=_csv, default=[1, 2, 4, 8])
+    parser.add_argument("--writers", type=int, default=8, help="concurrent writer processes")
+    parser.add_argument("--writes", type=int, default=200, help="creates per writer")
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for shards in args.shards:
+            results[f"shards={shards}"] = measure(
+                Path(tmp), shards, args.writers, args.writes, args.tenants
+            )
+    single = results.get("shards=1")
+    if single:
+        for summary in results.values():
+            summary["speedup"] = round(summary["per_sec"] / single["per_sec"], 2)
+
+    report(
+        {
+            "environment": environment(),
+            "config": {
+                "shards": args.shards,
+                "writers": args.writers,
+                "writes": args.writes,
+                "tenants": args.tenants,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+    check_baseline(results, args.baseline, "p95_ms", args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""SQLite reader/writer concurrency benchmark. Runs reader threads against a file database while a writer repeatedly rewrites the table, once with SQLite's default rollback journal and once with the WAL pragmas from Config, then prints read latency percentiles and throughput as JSON."""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import bindparam, create_engine, select, update
+from sqlalchemy.exc import OperationalError
+
+from todo_api.config import Config
+from todo_api.extensions import db
+from todo_api.features.todos.models import TodoModel
+from todo_api.infrastructure.database import configure_sqlite
+
+# SQLite's out-of-the-box behaviour, with the same busy timeout so readers wait rather than fail
+ROLLBACK_JOURNAL_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "busy_timeout": Config.SQLITE_PRAGMAS["busy_timeout"],
+}
+
+
+def _summarize(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    quantiles = statistics.quantiles(ordered, n=100)
+    return {
+        "reads": len(ordered),
+        "reads_per_sec": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def run(pragmas: dict, readers: int, duration: float, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}", pool_size=readers + 1
+        )
+        configure_sqlite(engine, pragmas)
+        db.metadata.create_all(engine)
+        table = TodoModel.__table__
+        with engine.begin() as conn:
+            conn.execute(
+                table.insert(), [{"title": f"Todo {i}", "completed": False} for i in range(rows)]
+            )
+
+        stop = threading.Event()
+        latencies: list[list[float]] = [[] for _ in range(readers)]
+        errors = [0] * readers
+        commits = 0
+
+        def _write() -> None:
+            # Rewrites every page of the table, so each commit has a lot to flush
+            nonlocal commits
+            stmt = update(table).values(completed=~table.c.completed)
+            while not stop.is_set():
+                with engine.begin() as conn:
+                    conn.execute(stmt)
+                commits += 1
+
+        def _read(slot: int) -> None:
+            stmt = select(table).where(table.c.id == bindparam("id"))
+            rng = random.Random(slot)
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(stmt, {"id": rng.randint(1, rows)}).one()
+                except OperationalError:
+                    errors[slot] += 1
+                    continue
+                latencies[slot].append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=_write)]
+        threads += [threading.Thread(target=_read, args=(slot,)) for slot in range(readers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    result = _summarize([lat for slot in latencies for lat in slot], elapsed)
+    result["read_errors"] = sum(errors)
+    result["write_commits"] = commits
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows rewritten per write transaction")
+    args = parser.parse_args()
+
+    results = {
+        "readers": args.readers,
+        "duration_s": args.duration,
+        "rows": args.rows,
+        "rollback_journal": run(ROLLBACK_JOURNAL_PRAGMAS, args.readers, args.duration, args.rows),
+        "wal": run(Config.SQLITE_PRAGMAS, args.readers, args.duration, args.rows),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Cold start benchmark. Boots the Flask app in fresh interpreters against a prepared SQLite file, times the package import, create_app and the first response from each of several endpoints, then prints medians as JSON and checks them against a startup budget.
+
+Exits non-zero when any budgeted median is over budget, or when ``--baseline`` is
+given and a median regressed by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import check_baseline, environment, report
+
+DEFAULT_BUDGET = "create_app_ms=150,time_to_first_response_ms=1000,first_graphql_ms=400"
+
+# Runs in each fresh interpreter; prints the timings of one cold start as JSON
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from todo_api import create_app
+imported = time.perf_counter()
+app = create_app("production")
+created = time.perf_counter()
+client = app.test_client()
+timings = {
+    "import_ms": imported - start,
+    "create_app_ms": created - imported,
+    "graphql_imported_at_startup": "graphql" in sys.modules,
+}
+requests = {
+    "first_health_ms": ("GET", "/health", None),
+    "first_docs_ms": ("GET", "/api/docs", None),
+    "first_listing_ms": ("GET", "/api/todos?limit=20", None),
+    "first_graphql_ms": ("POST", "/graphql", {"query": "{ todoStats { total } }"}),
+}
+for name, (method, path, body) in requests.items():
+    before = time.perf_counter()
+    response = client.open(path, method=method, json=body)
+    assert response.status_code == 200, (path, response.status_code)
+    timings[name] = time.perf_counter() - before
+    if name == "first_health_ms":
+        timings["time_to_first_response_ms"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def _prepare_database(path: Path) -> None:
+    # Runs the same step a deployment would, `flask db create`, in a child interpreter
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "todo_api:create_app('production')"]
+        + ["db", "create"],
+        check=True,
+        capture_output=True,
+        env=_child_env(path),
+    )
+
+
+def _child_env(path: Path) -> dict:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", LOG_LEVEL="WARNING")
+    env.pop("DATABASE_CREATE_ALL", None)
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return env
+
+
+def _cold_start(path: Path) -> dict:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=_child_env(path),
+    )
+    timings = json.loads(completed.stdout.splitlines()[-1])
+    timings["process_ms"] = time.perf_counter() - start
+    return timings
+
+
+def parse_budget(value: str) -> dict[str, float]:
+    """Parse ``metric=milliseconds`` pairs separated by commas."""
+    budget = {}
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        budget[name.strip()] = float(limit)
+    return budget
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", type=parse_budget, default=DEFAULT_BUDGET)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "startup.db"
+        _prepare_database(path)
+        runs = [_cold_start(path) for _ in range(args.runs)]
+
+    results = {}
+    for name in runs[0]:
+        if name == "graphql_imported_at_startup":
+            continue
+        samples = [run[name] * 1000 for run in runs]
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+        }
+        if name in args.budget:
+            results[name]["budget_ms"] = args.budget[name]
+    over = {
+        name: summary["median_ms"]
+        for name, summary in results.items()
+        if summary.get("budget_ms") is not None and summary["median_ms"] > summary["budget_ms"]
+    }
+
+    report(
+        {
+            "environment": environment(),
+            "config": {"runs": args.runs, "budget": args.budget},
+            "graphql_imported_at_startup": any(run["graphql_imported_at_startup"] for run in runs),
+            "over_budget": over,
+            "results": results,
+        },
+        args.output,
+    )
+    for name, median in over.items():
+        print(f"over budget: {name} {median} > {args.budget[name]}", file=sys.stderr)
+    check_baseline(results, args.baseline, "median_ms", args.threshold)
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
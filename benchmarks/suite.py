@@ -0,0 +1,254 @@
+"""Micro-benchmark suite. Times TodoService operations, SqlTodoRepository and InMemoryTodoRepository reads and writes at several table sizes, marshmallow schema dumps and loads, and GraphQL parsing, validation and execution through graphql_sync, then prints latency percentiles per case as JSON.
+
+Save a run with ``--output`` and pass it to a later run as ``--baseline`` to exit
+non-zero when any case's median latency regressed by more than ``--threshold``.
+"""
+
+import argparse
+import random
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.harness import check_baseline, environment, report, seed_todos, time_calls
+
+GROUPS = ("service", "repository", "memory", "serialization", "graphql")
+
+Cases = dict[str, Callable[[], Any]]
+
+PAGE_SIZE = 20
+
+TODOS_QUERY = """
+    query Todos($first: Int) {
+        todosConnection(first: $first) {
+            edges { cursor node { id title completed createdAt updatedAt } }
+            pageInfo { hasNextPage endCursor }
+        }
+    }
+"""
+TODO_QUERY = "query Todo($id: ID!) { todo(id: $id) { id title completed } }"
+
+
+def _ids(rows: int) -> Callable[[], int]:
+    rng = random.Random(rows)
+    return lambda: rng.randint(1, rows)
+
+
+def _deletable(repository, count: int) -> Callable[[], int]:
+    # Deletes consume rows, so each call takes the ID of a todo created up front
+    from todo_api.features.todos.domain import Todo
+
+    created = repository.create_many([Todo(title=f"Doomed {i}") for i in range(count)])
+    return iter([todo.id for todo in created]).__next__
+
+
+def repository_cases(repository, rows: int, calls: int) -> Cases:
+    from todo_api.features.todos.domain import Todo, TodoQuery
+
+    random_id = _ids(rows)
+    middle = repository.get_by_id(rows // 2)
+    after = (middle.created_at, middle.id)
+    completed = TodoQuery(completed=True)
+    search = TodoQuery(search=f"Todo {rows // 3}")
+    doomed = _deletable(repository, calls)
+
+    return {
+        "get_by_id": lambda: repository.get_by_id(random_id()),
+        "get_many[20]": lambda: repository.get_many([random_id() for _ in range(PAGE_SIZE)]),
+        "first_page": lambda: repository.get_all(limit=PAGE_SIZE),
+        "middle_page": lambda: repository.get_all(limit=PAGE_SIZE, after=after),
+        "completed_page": lambda: repository.get_all(limit=PAGE_SIZE, query=completed),
+        "search_page": lambda: repository.get_all(limit=PAGE_SIZE, query=search),
+        "get_stats": repository.get_stats,
+        "create": lambda: repository.create(Todo(title="Benchmark")),
+        "create_many[20]": lambda: repository.create_many(
+            [Todo(title="Benchmark") for _ in range(PAGE_SIZE)]
+        ),
+        "toggle": lambda: repository.toggle(random_id()),
+        "delete": lambda: repository.delete(doomed()),
+    }
+
+
+def memory_repository(source):
+    """Copy the seeded todos into an InMemoryTodoRepository, keeping their IDs and order."""
+    from todo_api.features.todos.adapters.memory_repository import InMemoryTodoRepository
+
+    repository = InMemoryTodoRepository()
+    batch = []
+    for todo in source.iter_all(batch_size=10_000):
+        batch.append(todo)
+        if len(batch) == 10_000:
+            repository.create_many(batch)
+            batch = []
+    repository.create_many(batch)
+    return repository
+
+
+def service_cases(rows: int, calls: int) -> Cases:
+    from todo_api.features.todos.dependencies import get_todo_repository, get_todo_service
+
+    service = get_todo_service()
+    random_id = _ids(rows)
+    page = service.list_todos_page(limit=PAGE_SIZE)
+    since = service.changes_cursor(service.get_version())
+    doomed = _deletable(get_todo_repository(), calls)
+
+    return {
+        "get_todo": lambda: service.get_todo(random_id()),
+        "list_todos_page": lambda: service.list_todos_page(limit=PAGE_SIZE),
+        "list_todos_page[after]": lambda: service.list_todos_page(
+            limit=PAGE_SIZE, after=page.end_cursor
+        ),
+        "list_changes": lambda: service.list_changes(since, limit=PAGE_SIZE),
+        "get_stats": service.get_stats,
+        "create_todo": lambda: service.create_todo("Benchmark"),
+        "toggle_completed": lambda: service.toggle_completed(random_id()),
+        "toggle_todos[20]": lambda: service.toggle_todos(
+            [random_id() for _ in range(PAGE_SIZE)]
+        ),
+        "delete_todo": lambda: service.delete_todo(doomed()),
+    }
+
+
+def serialization_cases() -> Cases:
+    from datetime import datetime, timedelta, timezone
+
+    from todo_api.features.todos.domain import Todo
+    from todo_api.features.todos.rest.schemas import (
+        batch_todo_schema,
+        create_todo_schema,
+        todo_list_query_schema,
+        todo_schema,
+        todos_schema,
+    )
+    from todo_api.features.todos.rest.serializers import todo_serializer
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    todos = [
+        Todo(
+            id=i,
+            title=f"Todo number {i}",
+            completed=i % 3 == 0,
+            created_at=start + timedelta(seconds=i),
+            updated_at=start + timedelta(seconds=i * 2),
+        )
+        for i in range(1, 101)
+    ]
+    batch = {
+        "create": [{"title": f"New {i}"} for i in range(10)],
+        "toggle": list(range(10)),
+        "delete": list(range(10, 20)),
+    }
+    listing = {"completed": "true", "sort": "-title", "q": "number", "limit": "20"}
+
+    return {
+        "dump_todo": lambda: todo_schema.dump(todos[0]),
+        "dump_todos[100]": lambda: todos_schema.dump(todos),
+        "fast_dump_todos[100]": lambda: todo_serializer.dump_many(todos),
+        "load_create": lambda: create_todo_schema.load({"title": "Write benchmarks"}),
+        "load_batch[30]": lambda: batch_todo_schema.load(batch),
+        "load_list_query": lambda: todo_list_query_schema.load(listing),
+    }
+
+
+def graphql_cases(rows: int) -> Cases:
+    from ariadne import graphql_sync
+    from flask import request
+    from graphql import parse, validate
+
+    from todo_api.graphql.schema import schema
+
+    document = parse(TODOS_QUERY)
+    random_id = _ids(rows)
+
+    def execute(query: str, variables: dict) -> None:
+        success, result = graphql_sync(
+            schema, {"query": query, "variables": variables}, context_value={"request": request}
+        )
+        assert success and "errors" not in result, result
+
+    return {
+        "parse": lambda: parse(TODOS_QUERY),
+        "validate": lambda: validate(schema, document),
+        "execute_connection[20]": lambda: execute(TODOS_QUERY, {"first": PAGE_SIZE}),
+        "execute_todo": lambda: execute(TODO_QUERY, {"id": random_id()}),
+    }
+
+
+def run(groups: list[str], rows: list[int], iterations: int, warmup: int) -> dict:
+    from todo_api import create_app
+    from todo_api.extensions import db
+    from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+    from todo_api.features.todos.dependencies import get_todo_service
+
+    results = {}
+    calls = iterations + warmup
+
+    def measure(prefix: str, cases: Cases) -> None:
+        for name, call in cases.items():
+            results[f"{prefix}.{name}"] = time_calls(call, iterations, warmup)
+            print(f"{prefix}.{name}", file=sys.stderr)
+
+    if "serialization" in groups:
+        with create_app("testing").app_context():
+            measure("serialization", serialization_cases())
+
+    for size in rows:
+        app = create_app("testing")
+        with app.test_request_context():
+            db.create_all()
+            seed_todos(size)
+            # The summary row is seeded by the first write through the repository
+            get_todo_service().create_todo("Seed")
+
+            if "memory" in groups:
+                # Copied before the SQL cases add their own rows, so both start from the same set
+                memory = memory_repository(SqlTodoRepository())
+                measure(f"memory[rows={size}]", repository_cases(memory, size, calls))
+            if "repository" in groups:
+                measure(
+                    f"repository[rows={size}]", repository_cases(SqlTodoRepository(), size, calls)
+                )
+            if "service" in groups:
+                measure(f"service[rows={size}]", service_cases(size, calls))
+            if "graphql" in groups:
+                measure(f"graphql[rows={size}]", graphql_cases(size))
+            db.session.remove()
+            db.drop_all()
+    return results
+
+
+def _csv(value: str) -> list[str]:
+    return [item for item in value.split(",") if item]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=_csv, default=["1000", "100000", "1000000"])
+    parser.add_argument("--groups", type=_csv, default=list(GROUPS))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+    rows = [int(size) for size in args.rows]
+
+    results = run(args.groups, rows, args.iterations, args.warmup)
+    report(
+        {
+            "environment": environment(),
+            "config": {"rows": rows, "iterations": args.iterations, "warmup": args.warmup},
+            "results": results,
+        },
+        args.output,
+    )
+    check_baseline(results, args.baseline, "p50_ms", args.threshold)
+
+
+if __name__ == "__main__":
+    main()
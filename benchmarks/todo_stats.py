@@ -0,0 +1,50 @@
+"""Todo stats benchmark. Reads todo counts from the maintained summary row and by counting the todos table, then prints the time per read as JSON."""
+
+import argparse
+import json
+import time
+
+
+def _measure(read, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stats = read()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"total": stats.total, "completed": stats.completed, "best_ms": round(best * 1000, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from todo_api import create_app
+    from todo_api.extensions import db
+    from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+    from todo_api.features.todos.domain import Todo
+    from todo_api.features.todos.models import TodoModel
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        db.session.execute(
+            TodoModel.__table__.insert(),
+            [{"title": f"Todo {i}", "completed": i % 3 == 0} for i in range(args.rows - 1)],
+        )
+        db.session.commit()
+        repository = SqlTodoRepository()
+        # The first write through the repository seeds the summary row
+        repository.create(Todo(title="Seed"))
+
+        counted = _measure(repository.count_stats, args.repeat)
+        summary = _measure(repository.get_stats, args.repeat)
+
+    summary["speedup"] = round(counted["best_ms"] / summary["best_ms"], 1)
+    print(json.dumps({"rows": args.rows, "count": counted, "summary_row": summary}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,10 @@
 """Todo API application package. Contains the Flask application factory and top-level configuration."""
 
 import os
-from pathlib import Path
 
 from flask import Flask
 
-from todo_api.config import configs
+from todo_api.config import load_config
 from todo_api.extensions import db, ma
 
 
@@ -15,7 +14,13 @@ def create_app(config_name=None):
         config_name = os.environ.get("FLASK_CONFIG", "development")
 
     app = Flask(__name__)
-    app.config.from_object(configs[config_name])
+    load_config(app.config, config_name)
+
+    from todo_api.infrastructure.logging import configure_logging
+    configure_logging(app)
+
+    from todo_api.infrastructure import json_provider
+    json_provider.init_app(app)
 
     db.init_app(app)
     ma.init_app(app)
@@ -26,26 +31,29 @@ def create_app(config_name=None):
     from todo_api.infrastructure.database import init_db
     init_db(app)
 
+    from todo_api.infrastructure import middleware
+    middleware.init_app(app)
+
+    from todo_api.infrastructure import profiling
+    profiling.init_app(app)
+
+    from todo_api.features.todos import dependencies as todos_dependencies
+    todos_dependencies.init_app(app)
+
     from todo_api.features.todos.rest import bp as todos_bp
     app.register_blueprint(todos_bp)
 
-    from todo_api.graphql import schema
-    from ariadne import graphql_sync
-    from flask import request, jsonify
+    from todo_api.features.todos.commands import todos_cli
+    app.cli.add_command(todos_cli)
+
+    from todo_api.graphql import views as graphql_views
+    graphql_views.init_app(app)
 
-    @app.route("/graphql", methods=["POST"])
-    def graphql_endpoint():
-        data = request.get_json()
-        success, result = graphql_sync(schema, data, context_value={"request": request})
-        return jsonify(result), 200 if success else 400
+    from todo_api.infrastructure import openapi
+    openapi.init_app(app)
 
     @app.route("/health")
     def health():
         return {"status": "ok"}
 
-    @app.route("/api/docs")
-    def openapi_spec():
-        spec_path = Path(app.root_path) / "openapi.yaml"
-        return spec_path.read_text(), 200, {"Content-Type": "application/yaml"}
-
     return app
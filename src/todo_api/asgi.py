@@ -0,0 +1,114 @@
+"""ASGI application factory. Serves the todo REST routes and GraphQL schema on an asyncio event loop, backed by the async SQLAlchemy repository.
+
+Run with an ASGI server, e.g. ``uvicorn --factory todo_api.asgi:create_asgi_app``.
+"""
+
+import os
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from flask import Config
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.types import ASGIApp, Receive, Scope, Send
+from werkzeug.http import parse_etags, quote_etag
+
+from todo_api.config import load_config
+from todo_api.core.events import EventBroker
+from todo_api.features.todos.adapters.async_sql_repository import AsyncSqlTodoRepository
+from todo_api.features.todos.rest import asgi_routes as todos_routes
+from todo_api.features.todos.service import AsyncTodoService
+from todo_api.infrastructure.async_database import create_async_sessions, init_async_db
+from todo_api.infrastructure.openapi import SPEC_CACHE_CONTROL, SPEC_MIMETYPE, load_spec
+
+
+class LazyASGIApp:
+    """ASGI app built by its first request, keeping its construction out of startup."""
+
+    def __init__(self, build: Callable[[], ASGIApp]):
+        self._build = build
+        self._app: ASGIApp | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Building is synchronous, so concurrent first requests cannot race
+        if self._app is None:
+            self._app = self._build()
+        await self._app(scope, receive, send)
+
+
+def create_asgi_app(config_name=None) -> Starlette:
+    """Create and configure the ASGI application."""
+    if config_name is None:
+        config_name = os.environ.get("FLASK_CONFIG", "development")
+
+    config = Config(Path(__file__).parent)
+    load_config(config, config_name)
+
+    # Import models so SQLAlchemy registers them before create_all
+    import todo_api.features.todos.models  # noqa: F401
+
+    engine, sessions = create_async_sessions(config)
+    todo_events = EventBroker(
+        config["TODOS_EVENTS_BACKEND"], max_queue=config["TODOS_EVENTS_QUEUE_SIZE"]
+    )
+    todo_service = AsyncTodoService(
+        repository=AsyncSqlTodoRepository(sessions), events=todo_events
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if config["DATABASE_CREATE_ALL"]:
+            await init_async_db(engine)
+        yield
+        todo_events.close()
+        await engine.dispose()
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def openapi_spec(request: Request):
+        body, etag = load_spec()
+        headers = {"ETag": quote_etag(etag), "Cache-Control": SPEC_CACHE_CONTROL}
+        if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type=SPEC_MIMETYPE, headers=headers)
+
+    def graphql_app() -> ASGIApp:
+        from ariadne.asgi import GraphQL
+        from ariadne.asgi.handlers import GraphQLTransportWSHandler
+
+        from todo_api.features.todos.graphql.async_resolvers import (
+            EVENTS_KEY,
+            SERVICE_KEY,
+        )
+        from todo_api.graphql.schema import make_async_schema
+
+        return GraphQL(
+            make_async_schema(),
+            context_value=lambda request, data=None: {
+                "request": request,
+                SERVICE_KEY: todo_service,
+                EVENTS_KEY: todo_events,
+            },
+            websocket_handler=GraphQLTransportWSHandler(),
+            debug=config.get("DEBUG", False),
+        )
+
+    app = Starlette(
+        debug=config.get("DEBUG", False),
+        routes=[
+            *todos_routes.routes,
+            Route("/health", health),
+            Route("/api/docs", openapi_spec),
+            Mount("/graphql", LazyASGIApp(graphql_app)),
+        ],
+        exception_handlers=todos_routes.exception_handlers,
+        lifespan=lifespan,
+    )
+    app.state.todo_service = todo_service
+    app.state.todo_events = todo_events
+    app.state.todo_events_keepalive = config["TODOS_EVENTS_KEEPALIVE"]
+    return app
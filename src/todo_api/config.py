@@ -1,6 +1,9 @@
 """Application configuration. Defines configuration classes for different environments (development, testing, production)."""
 
 import os
+from typing import Any, ClassVar
+
+import flask
 
 
 class Config:
@@ -9,6 +12,82 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "change-me-in-production")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Read-through cache in front of the todo repository
+    TODOS_CACHE_ENABLED = os.environ.get("TODOS_CACHE_ENABLED", "false").lower() == "true"
+    TODOS_CACHE_MAX_ENTRIES = int(os.environ.get("TODOS_CACHE_MAX_ENTRIES", "1024"))
+    TODOS_CACHE_TTL = float(os.environ.get("TODOS_CACHE_TTL", "30"))
+
+    # Tenant shards as comma-separated name=database-URL pairs, e.g. "a=sqlite:///a.db,b=...".
+    # Tenants are placed by hashing onto the names, and each shard's position fixes the range
+    # it allocates IDs from, so shards are only ever appended. Unset keeps one database.
+    TODOS_SHARDS = os.environ.get("TODOS_SHARDS")
+
+    # Read replicas of the todo database as comma-separated URLs. Todo reads go to them in turn
+    # and writes to the primary; a client that wrote reads from the primary for the sticky
+    # seconds after, by cookie. Applies to a single SQL database, not to shards or the memory store.
+    TODOS_READ_REPLICAS = os.environ.get("TODOS_READ_REPLICAS")
+    TODOS_READ_STICKY_SECONDS = float(os.environ.get("TODOS_READ_STICKY_SECONDS", "5"))
+
+    # "memory" keeps todos in process memory instead of the database, for single-process
+    # nodes: each process would hold its own copy. With a snapshot path, writes are journaled
+    # next to it and the whole store is snapshotted every interval seconds for crash recovery.
+    TODOS_STORE = os.environ.get("TODOS_STORE", "sql")
+    TODOS_MEMORY_SNAPSHOT_PATH = os.environ.get("TODOS_MEMORY_SNAPSHOT_PATH")
+    TODOS_MEMORY_SNAPSHOT_INTERVAL = float(os.environ.get("TODOS_MEMORY_SNAPSHOT_INTERVAL", "60"))
+
+    # Group commit: concurrent todo writes are queued to one writer thread, which commits those
+    # waiting, up to the batch size, in one transaction. A window makes it also wait that long
+    # after the first for more, which only pays if commits are slow; the queue fills while the
+    # writer is busy anyway. Applies to a single SQL database, not to shards or the memory store.
+    # Writers waiting longer than the timeout get an error, though their write may still commit.
+    TODOS_GROUP_COMMIT = os.environ.get("TODOS_GROUP_COMMIT", "false").lower() == "true"
+    TODOS_GROUP_COMMIT_WINDOW_MS = float(os.environ.get("TODOS_GROUP_COMMIT_WINDOW_MS", "0"))
+    TODOS_GROUP_COMMIT_MAX_BATCH = int(os.environ.get("TODOS_GROUP_COMMIT_MAX_BATCH", "64"))
+    TODOS_GROUP_COMMIT_TIMEOUT_SECONDS = float(
+        os.environ.get("TODOS_GROUP_COMMIT_TIMEOUT_SECONDS", "30")
+    )
+
+    # Deletion records kept for the change feed; cursors older than the pruned ones expire
+    TODOS_TOMBSTONE_RETENTION_DAYS = float(os.environ.get("TODOS_TOMBSTONE_RETENTION_DAYS", "30"))
+
+    # Live todo events: per-subscriber queue bound and idle keepalive interval in seconds.
+    # TODOS_EVENTS_BACKEND may be set to an EventBackend shared between processes.
+    TODOS_EVENTS_QUEUE_SIZE = int(os.environ.get("TODOS_EVENTS_QUEUE_SIZE", "100"))
+    TODOS_EVENTS_KEEPALIVE = float(os.environ.get("TODOS_EVENTS_KEEPALIVE", "15"))
+    TODOS_EVENTS_BACKEND = None
+
+    # Parsed and validated GraphQL documents, also the persisted query store
+    GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", "256"))
+    GRAPHQL_MAX_BATCH_SIZE = int(os.environ.get("GRAPHQL_MAX_BATCH_SIZE", "20"))
+
+    # "auto" uses orjson for response encoding when it is installed
+    JSON_PROVIDER = os.environ.get("JSON_PROVIDER", "auto")
+
+    # Structured request logs; requests slower than the threshold are logged as warnings
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "500"))
+
+    # Opt-in request profiling; see infrastructure.profiling for the request flags
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_SAMPLE_INTERVAL = float(os.environ.get("PROFILING_SAMPLE_INTERVAL", "0.005"))
+    PROFILING_DIR = os.environ.get("PROFILING_DIR")
+
+    # Create missing tables at startup. Deployments leave this off and run
+    # `flask db create` as a release step, so cold starts skip the schema checks.
+    DATABASE_CREATE_ALL = os.environ.get("DATABASE_CREATE_ALL", "false").lower() == "true"
+
+    # Applied to every new SQLite connection; WAL lets readers proceed while a write is in flight
+    SQLITE_PRAGMAS: ClassVar[dict[str, Any]] = {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        # Negative values are KiB rather than pages
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KIB", "64000")),
+    }
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -17,6 +96,7 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         "DATABASE_URL", "sqlite:///todo_dev.db"
     )
+    DATABASE_CREATE_ALL = os.environ.get("DATABASE_CREATE_ALL", "true").lower() == "true"
 
 
 class TestingConfig(Config):
@@ -24,10 +104,43 @@ class TestingConfig(Config):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    TODOS_CACHE_ENABLED = False
+    DATABASE_CREATE_ALL = True
+
+
+class ProductionConfig(Config):
+    """Production configuration."""
+
+    DEBUG = False
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///todo.db")
+    SQLALCHEMY_ENGINE_OPTIONS: ClassVar[dict[str, Any]] = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        # Recycle before server-side idle timeouts and test connections on checkout
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
 
 
 configs = {
     "development": DevelopmentConfig,
     "testing": TestingConfig,
+    "production": ProductionConfig,
     "default": DevelopmentConfig,
 }
+
+# Settings held in dicts, which each app gets its own copy of
+_DICT_SETTINGS = ("SQLITE_PRAGMAS", "SQLALCHEMY_ENGINE_OPTIONS")
+
+
+def load_config(config: flask.Config, config_name: str) -> None:
+    """Load the named configuration into an application's config mapping.
+
+    Dict settings are copied, so changing them in one app leaves the class and
+    other apps alone.
+    """
+    config.from_object(configs[config_name])
+    for key in _DICT_SETTINGS:
+        if key in config:
+            config[key] = dict(config[key])
@@ -0,0 +1,210 @@
+"""Event pub/sub primitives. Defines the publisher and backend ports, an in-process backend, and a broker fanning events out to bounded per-subscriber queues."""
+
+import asyncio
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any, Protocol
+
+Deliver = Callable[[Any], None]
+
+# Queued on close to wake a consumer waiting on an empty queue
+_CLOSED = object()
+
+
+class EventPublisher(Protocol):
+    """Port for announcing events to subscribers."""
+
+    def publish(self, event: Any) -> None: ...
+
+
+class EventBackend(Protocol):
+    """Port for the transport carrying published events to the broker of every process.
+
+    A multi-process backend publishes to a shared channel and calls each listener
+    once per event received from it, from whichever thread it reads on.
+    """
+
+    def publish(self, event: Any) -> None: ...
+
+    def listen(self, deliver: Deliver) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class LocalEventBackend:
+    """In-process backend delivering events straight to the listeners of this process."""
+
+    def __init__(self):
+        self._listeners: list[Deliver] = []
+
+    def publish(self, event: Any) -> None:
+        for deliver in self._listeners:
+            deliver(event)
+
+    def listen(self, deliver: Deliver) -> None:
+        self._listeners.append(deliver)
+
+    def close(self) -> None:
+        self._listeners.clear()
+
+
+class Subscription:
+    """A bounded queue of events for one blocking consumer.
+
+    When the consumer falls behind and the queue fills up, the broker drops the
+    subscription instead of waiting: events already queued can still be read, after
+    which get reports the subscription closed.
+    """
+
+    def __init__(self, broker: "EventBroker", max_queue: int):
+        self._broker = broker
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self.overflowed = False
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed and self._queue.empty()
+
+    def get(self, timeout: float | None = None) -> Any | None:
+        """Return the next event, or None if none arrives within the timeout or the subscription is closed."""
+        try:
+            if self._closed:
+                event = self._queue.get_nowait()
+            else:
+                event = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if event is _CLOSED else event
+
+    def close(self) -> None:
+        self._closed = True
+        self._broker._unsubscribe(self)
+        try:
+            self._queue.put_nowait(_CLOSED)
+        except queue.Full:
+            pass
+
+    def _offer(self, event: Any) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+            self.close()
+
+
+class AsyncSubscription:
+    """A bounded queue of events for one consumer on an asyncio event loop.
+
+    Events published from other threads are handed to the loop without blocking
+    the publisher. Overflow closes the subscription as for Subscription.
+    """
+
+    def __init__(self, broker: "EventBroker", max_queue: int, loop: asyncio.AbstractEventLoop):
+        self._broker = broker
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.overflowed = False
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed and self._queue.empty()
+
+    async def get(self, timeout: float | None = None) -> Any | None:
+        """Return the next event, or None if none arrives within the timeout or the subscription is closed."""
+        if not self._queue.empty():
+            event = self._queue.get_nowait()
+        elif self._closed:
+            return None
+        else:
+            try:
+                event = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                return None
+        return None if event is _CLOSED else event
+
+    def close(self) -> None:
+        self._closed = True
+        self._broker._unsubscribe(self)
+        try:
+            self._loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            pass
+
+    def _wake(self) -> None:
+        if self._queue.empty():
+            self._queue.put_nowait(_CLOSED)
+
+    def _offer(self, event: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._offer_now, event)
+        except RuntimeError:
+            # The loop has shut down without closing the subscription
+            self._closed = True
+            self._broker._unsubscribe(self)
+
+    def _offer_now(self, event: Any) -> None:
+        # Events handed over before an overflow are still delivered, later ones never
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+
+class EventBroker:
+    """Fans published events out to every subscriber of this process.
+
+    Publishing goes through the backend, which delivers to the broker of each
+    process sharing it. Delivery never blocks: a subscriber whose queue is full is
+    dropped, so slow consumers cannot hold up writers.
+    """
+
+    def __init__(self, backend: EventBackend | None = None, max_queue: int = 100):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self.max_queue = max_queue
+        self._backend = backend if backend is not None else LocalEventBackend()
+        self._subscribers: set[Subscription | AsyncSubscription] = set()
+        self._lock = threading.Lock()
+        self._backend.listen(self._deliver)
+
+    def publish(self, event: Any) -> None:
+        self._backend.publish(event)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self, self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def subscribe_async(self) -> AsyncSubscription:
+        """Subscribe a consumer running on the current event loop."""
+        subscription = AsyncSubscription(self, self.max_queue, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def close(self) -> None:
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscription in subscribers:
+            subscription.close()
+        self._backend.close()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def _deliver(self, event: Any) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._offer(event)
+
+    def _unsubscribe(self, subscription: Subscription | AsyncSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
@@ -15,3 +15,26 @@ class ValidationError(Exception):
 
     def __init__(self, message: str):
         super().__init__(message)
+
+
+class PreconditionFailedError(Exception):
+    """Raised when a conditional write targets a resource that has since changed."""
+
+    def __init__(self, resource: str, resource_id: int | str):
+        self.resource = resource
+        self.resource_id = resource_id
+        super().__init__(f"{resource} with id {resource_id} has changed")
+
+
+class UnsupportedError(Exception):
+    """Raised when the configured storage cannot serve a requested operation."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class ExpiredCursorError(Exception):
+    """Raised when a cursor points at history that is no longer retained."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
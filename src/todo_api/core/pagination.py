@@ -0,0 +1,72 @@
+"""Keyset pagination primitives. Provides opaque cursor encoding and a page container shared by feature slices that paginate on (sort key, id)."""
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from todo_api.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+# Type parameter syntax would leave the module unimportable on Python 3.11
+@dataclass
+class Page(Generic[T]):  # noqa: UP046
+    """A single page of results from a keyset-paginated listing."""
+
+    items: list[T]
+    end_cursor: str | None
+    has_next: bool
+
+
+# Mark string and integer sort keys; timestamps are written bare, as cursors always were
+_STRING_PREFIX = "s:"
+_INT_PREFIX = "n:"
+# Marks the scope leading a cursor; no sort key is written starting with it
+_SCOPE_PREFIX = "@"
+
+
+def encode_cursor(key: datetime | str | int, item_id: int, scope: str | None = None) -> str:
+    """Encode a (sort key, id) position as an opaque, URL-safe cursor.
+
+    ``scope`` names the ordering the position belongs to, such as a listing's sort
+    field and direction, so decode_cursor can reject the cursor in any other.
+    """
+    if isinstance(key, str):
+        text = _STRING_PREFIX + key
+    elif isinstance(key, int):
+        text = f"{_INT_PREFIX}{key}"
+    else:
+        text = key.isoformat()
+    if scope is not None:
+        text = f"{_SCOPE_PREFIX}{scope}|{text}"
+    raw = f"{text}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str | None = None) -> tuple[datetime | str | int, int]:
+    """Decode a cursor produced by encode_cursor with the same scope.
+
+    Raises ValidationError if the cursor is malformed or was encoded in another scope.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        encoded_scope = None
+        if raw.startswith(_SCOPE_PREFIX):
+            encoded_scope, raw = raw[len(_SCOPE_PREFIX):].split("|", 1)
+        text, item_id = raw.rsplit("|", 1)
+        if text.startswith(_STRING_PREFIX):
+            key = text[len(_STRING_PREFIX):]
+        elif text.startswith(_INT_PREFIX):
+            key = int(text[len(_INT_PREFIX):])
+        else:
+            key = datetime.fromisoformat(text)
+        position = key, int(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationError("Invalid pagination cursor") from exc
+    if encoded_scope != scope:
+        raise ValidationError("Pagination cursor belongs to another ordering")
+    return position
@@ -0,0 +1,15 @@
+"""Read routing primitives. Defines the port deciding when a client's reads must go to the primary database to see its own writes."""
+
+from typing import Protocol
+
+
+class ReadStickiness(Protocol):
+    """Port tracking clients that wrote recently, as replicas may not have their writes yet."""
+
+    def pinned(self) -> bool:
+        """Return True if the current client's reads must go to the primary."""
+        ...
+
+    def wrote(self) -> None:
+        """Record that the current client has just written to the primary."""
+        ...
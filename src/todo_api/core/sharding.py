@@ -0,0 +1,37 @@
+"""Consistent hashing. Maps keys such as tenant names onto a set of named nodes so that adding or removing a node moves only the keys that hashed to it."""
+
+import hashlib
+from bisect import bisect
+from collections.abc import Iterable
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring over named nodes.
+
+    Each node is placed at ``replicas`` points on the ring, and a key belongs to
+    the node at the first point after its hash. Placement depends only on
+    the node names, so every process builds the same ring from the same names.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 100):
+        self.nodes = tuple(dict.fromkeys(nodes))
+        if not self.nodes:
+            raise ValueError("A hash ring needs at least one node")
+        if replicas < 1:
+            raise ValueError("replicas must be at least 1")
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        """Return the node the key belongs to."""
+        index = bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
@@ -0,0 +1,298 @@
+"""Async SQL-based todo repository adapter. Implements the async todo repository port using SQLAlchemy's asyncio extension."""
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+from heapq import merge
+from itertools import islice, starmap
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from todo_api.features.todos.adapters.sql_statements import (
+    SUMMARY_ID,
+    adjust_counts,
+    count_todos,
+    insert_summary,
+    new_todo_rows,
+    next_version,
+    prune_tombstones,
+    raise_pruned_version,
+    release_version,
+    select_changed_todos,
+    select_prune_horizon,
+    select_pruned_version,
+    select_stats,
+    select_stats_drift,
+    select_todos,
+    select_tombstones,
+    toggle_todos,
+    update_todos,
+)
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.features.todos.models import (
+    TODO_COLUMNS,
+    TodoModel,
+    TodoSummaryModel,
+    TodoTombstoneModel,
+)
+
+
+class AsyncSqlTodoRepository:
+    """SQLAlchemy asyncio implementation of the AsyncTodoRepository port.
+
+    Each call runs in its own session and transaction, mirroring the commit-per-call
+    behaviour of SqlTodoRepository, and like it builds Todo objects from row tuples
+    and stamps every write with the next summary version, keeping the counts and
+    the change feed in step with the data.
+    """
+
+    def __init__(self, sessions: async_sessionmaker[AsyncSession]):
+        self._sessions = sessions
+
+    async def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        stmt = select_todos(query, limit=limit, after=after)
+        async with self._sessions() as session:
+            return list(starmap(Todo, await session.execute(stmt)))
+
+    async def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> AsyncIterator[Todo]:
+        stmt = select_todos(query).execution_options(yield_per=batch_size)
+        async with self._sessions() as session:
+            async for row in await session.stream(stmt):
+                yield Todo(*row)
+
+    async def get_version(self) -> int:
+        stmt = select(TodoSummaryModel.version).where(TodoSummaryModel.id == SUMMARY_ID)
+        async with self._sessions() as session:
+            return await session.scalar(stmt) or 0
+
+    async def get_stats(self) -> TodoStats:
+        async with self._sessions() as session:
+            row = (await session.execute(select_stats())).one_or_none()
+        return TodoStats(*row) if row is not None else await self.count_stats()
+
+    async def count_stats(self) -> TodoStats:
+        async with self._sessions() as session:
+            return TodoStats(*(await session.execute(count_todos())).one())
+
+    async def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        async with self._sessions() as session:
+            row = (await session.execute(select_stats_drift())).one_or_none()
+            if row is None:
+                await session.execute(insert_summary(version=0))
+                await session.commit()
+                counted = TodoStats(*(await session.execute(select_stats())).one())
+                return counted, counted
+            recorded, counted = TodoStats(*row[:2]), TodoStats(*row[2:])
+            if recorded != counted:
+                await session.execute(
+                    adjust_counts(
+                        total=counted.total - recorded.total,
+                        completed=counted.completed - recorded.completed,
+                    )
+                )
+            await session.commit()
+        return recorded, counted
+
+    async def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        async with self._sessions() as session:
+            written = [
+                TodoChange(version, todo_id, Todo(*columns))
+                for version, todo_id, *columns in await session.execute(
+                    select_changed_todos(after, limit)
+                )
+            ]
+            deleted = list(
+                starmap(TodoChange, await session.execute(select_tombstones(after, limit)))
+            )
+        merged = merge(written, deleted, key=lambda change: (change.version, change.todo_id))
+        return list(islice(merged, limit))
+
+    async def get_pruned_version(self) -> int:
+        async with self._sessions() as session:
+            return await session.scalar(select_pruned_version()) or 0
+
+    async def prune_tombstones(self, before: datetime) -> int:
+        async with self._sessions() as session:
+            horizon = await session.scalar(select_prune_horizon(before))
+            if horizon is None:
+                return 0
+            pruned = (await session.execute(prune_tombstones(horizon))).rowcount
+            await session.execute(raise_pruned_version(horizon))
+            await session.commit()
+        return pruned
+
+    async def get_by_id(self, todo_id: int) -> Todo | None:
+        stmt = select(*TODO_COLUMNS).where(TodoModel.id == todo_id)
+        async with self._sessions() as session:
+            row = (await session.execute(stmt)).one_or_none()
+        return Todo(*row) if row is not None else None
+
+    async def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        if not todo_ids:
+            return []
+        stmt = select(*TODO_COLUMNS).where(TodoModel.id.in_(todo_ids))
+        async with self._sessions() as session:
+            return list(starmap(Todo, await session.execute(stmt)))
+
+    async def create(self, todo: Todo) -> Todo:
+        return (await self.create_many([todo]))[0]
+
+    async def create_many(self, todos: list[Todo]) -> list[Todo]:
+        if not todos:
+            return []
+        async with self._sessions() as session:
+            created = await self._create_many(session, todos)
+            await session.commit()
+        return created
+
+    async def update(self, todo: Todo) -> Todo | None:
+        return (await self.update_many([todo]))[0]
+
+    async def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        groups: dict[tuple[str, bool], list[int]] = {}
+        for todo in todos:
+            groups.setdefault((todo.title, todo.completed), []).append(todo.id)
+
+        updated: dict[int, Todo] = {}
+        completed_delta = 0
+        async with self._sessions() as session:
+            version = await self._next_version(session)
+            for (title, completed), ids in groups.items():
+                for flipping in (True, False):
+                    stmt = update_todos(ids, title, completed, version, flipping)
+                    for todo in starmap(Todo, await session.execute(stmt)):
+                        updated[todo.id] = todo
+                        if flipping:
+                            completed_delta += 1 if completed else -1
+            await self._finish_write(session, bool(updated), completed=completed_delta)
+        return [updated.get(todo.id) for todo in todos]
+
+    async def toggle(self, todo_id: int) -> Todo | None:
+        async with self._sessions() as session:
+            stmt = toggle_todos(TodoModel.id == todo_id, await self._next_version(session))
+            row = (await session.execute(stmt)).one_or_none()
+            if row is None:
+                await self._finish_write(session, False)
+                return None
+            toggled = Todo(*row)
+            await self._finish_write(session, True, completed=1 if toggled.completed else -1)
+        return toggled
+
+    async def delete(self, todo_id: int) -> bool:
+        return (await self.delete_many([todo_id]))[0]
+
+    async def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        if not todo_ids:
+            return []
+        async with self._sessions() as session:
+            deleted = await self._delete_many(session, todo_ids)
+            await self._finish_write(session, any(deleted))
+        return deleted
+
+    async def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        if not todo_ids:
+            return []
+        async with self._sessions() as session:
+            toggled = await self._toggle_many(session, todo_ids)
+            await self._finish_write(session, any(todo is not None for todo in toggled))
+        return toggled
+
+    async def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        async with self._sessions() as session:
+            batch = TodoBatch(
+                await self._create_many(session, create),
+                await self._toggle_many(session, toggle),
+                await self._delete_many(session, delete),
+            )
+            await session.commit()
+        return batch
+
+    # The writes below leave the commit to their caller, so a batch can share one.
+    # A write that changed nothing hands its version back rather than rolling back,
+    # which would undo the writes before it in the same transaction.
+
+    async def _create_many(self, session: AsyncSession, todos: list[Todo]) -> list[Todo]:
+        if not todos:
+            return []
+        version = await self._next_version(session)
+        result = await session.execute(
+            insert(TodoModel).returning(*TODO_COLUMNS), new_todo_rows(todos, version)
+        )
+        created = sorted(starmap(Todo, result), key=lambda t: t.id)
+        await session.execute(
+            adjust_counts(total=len(created), completed=sum(t.completed for t in created))
+        )
+        return created
+
+    async def _toggle_many(
+        self, session: AsyncSession, todo_ids: list[int]
+    ) -> list[Todo | None]:
+        if not todo_ids:
+            return []
+        ids = list(dict.fromkeys(todo_ids))
+        stmt = toggle_todos(TodoModel.id.in_(ids), await self._next_version(session))
+        toggled = {todo.id: todo for todo in starmap(Todo, await session.execute(stmt))}
+        completed = sum(1 if todo.completed else -1 for todo in toggled.values())
+        await session.execute(
+            adjust_counts(completed=completed) if toggled else release_version()
+        )
+        return [toggled.get(todo_id) for todo_id in todo_ids]
+
+    async def _delete_many(self, session: AsyncSession, todo_ids: list[int]) -> list[bool]:
+        if not todo_ids:
+            return []
+        version = await self._next_version(session)
+        stmt = (
+            delete(TodoModel)
+            .where(TodoModel.id.in_(todo_ids))
+            .returning(TodoModel.id, TodoModel.completed)
+        )
+        deleted = {todo_id: completed for todo_id, completed in await session.execute(stmt)}
+        if deleted:
+            await session.execute(
+                insert(TodoTombstoneModel),
+                [{"version": version, "todo_id": todo_id} for todo_id in deleted],
+            )
+            await session.execute(
+                adjust_counts(total=-len(deleted), completed=-sum(deleted.values()))
+            )
+        else:
+            await session.execute(release_version())
+        return [todo_id in deleted for todo_id in todo_ids]
+
+    @staticmethod
+    async def _next_version(session: AsyncSession) -> int:
+        version = await session.scalar(next_version())
+        if version is None:
+            await session.execute(insert_summary(version=1))
+            version = 1
+        return version
+
+    @staticmethod
+    async def _finish_write(
+        session: AsyncSession, changed: bool, total: int = 0, completed: int = 0
+    ) -> None:
+        # Counts move in the same transaction as the data; a write that matched
+        # nothing rolls back, returning its reserved version
+        if not changed:
+            await session.rollback()
+            return
+        if total or completed:
+            await session.execute(adjust_counts(total, completed))
+        await session.commit()
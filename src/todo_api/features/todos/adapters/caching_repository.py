@@ -0,0 +1,162 @@
+"""Caching todo repository adapter. Wraps another TodoRepository with a read-through cache that writes invalidate."""
+
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import datetime
+from typing import Any
+
+from todo_api.core.cache import CacheBackend, CacheStats
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.features.todos.repository import TodoRepository
+
+
+class CachingTodoRepository:
+    """TodoRepository decorator caching single todos and list pages.
+
+    Single todos are cached by ID and invalidated individually. List pages are keyed
+    by the store version, which every write bumps in the database itself, so a page
+    is never served once any process has written since, whether or not the
+    processes share a backend, and a cached page always matches the version its
+    ETag is built from. A read racing a write can re-cache a stale single todo; the
+    backend TTL bounds how long it survives. Reads hand out copies of the cached
+    todos, so callers may change them freely.
+    """
+
+    def __init__(self, inner: TodoRepository, backend: CacheBackend):
+        self._inner = inner
+        self._backend = backend
+
+    @property
+    def has_change_feed(self) -> bool:
+        return self._inner.has_change_feed
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._backend.stats
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        # The query is a frozen dataclass, so its repr identifies the listing
+        key = f"todos:list:{self._inner.get_version()}:{limit}:{after!r}:{query!r}"
+        todos = self._backend.get(key)
+        if todos is None:
+            todos = self._inner.get_all(limit=limit, after=after, query=query)
+            self._backend.set(key, todos)
+        return [replace(todo) for todo in todos]
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        # Streams are unbounded by design, so they bypass the cache
+        return self._inner.iter_all(batch_size=batch_size, query=query)
+
+    def get_version(self) -> int:
+        # The version is what clients revalidate against, so it is never cached
+        return self._inner.get_version()
+
+    def get_stats(self) -> TodoStats:
+        # Stats are already a single-row read, so they are not cached either
+        return self._inner.get_stats()
+
+    def count_stats(self) -> TodoStats:
+        return self._inner.count_stats()
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        return self._inner.reconcile_stats()
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        # Each client reads the feed from its own position, so there is little to share
+        return self._inner.get_changes(after, limit)
+
+    def get_pruned_version(self) -> int:
+        return self._inner.get_pruned_version()
+
+    def prune_tombstones(self, before: datetime) -> int:
+        return self._inner.prune_tombstones(before)
+
+    def get_by_id(self, todo_id: int) -> Todo | None:
+        key = self._todo_key(todo_id)
+        todo = self._backend.get(key)
+        if todo is None:
+            todo = self._inner.get_by_id(todo_id)
+            if todo is None:
+                return None
+            self._backend.set(key, todo)
+        return replace(todo)
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        found: list[Todo] = []
+        missing: list[int] = []
+        for todo_id in todo_ids:
+            todo = self._backend.get(self._todo_key(todo_id))
+            if todo is None:
+                missing.append(todo_id)
+            else:
+                found.append(todo)
+        if missing:
+            for todo in self._inner.get_many(missing):
+                self._backend.set(self._todo_key(todo.id), todo)
+                found.append(todo)
+        return [replace(todo) for todo in found]
+
+    def create(self, todo: Todo) -> Todo:
+        # A new todo has no cached entry, and the new version retires the list pages
+        return self._inner.create(todo)
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        return self._inner.create_many(todos)
+
+    def update(self, todo: Todo) -> Todo | None:
+        updated = self._inner.update(todo)
+        self._invalidate(todo.id)
+        return updated
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        updated = self._inner.update_many(todos)
+        self._invalidate(*(todo.id for todo in todos))
+        return updated
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        toggled = self._inner.toggle(todo_id, if_updated_at)
+        self._invalidate(todo_id)
+        return toggled
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        deleted = self._inner.delete(todo_id, if_updated_at)
+        self._invalidate(todo_id)
+        return deleted
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        deleted = self._inner.delete_many(todo_ids)
+        self._invalidate(*todo_ids)
+        return deleted
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        toggled = self._inner.toggle_many(todo_ids)
+        self._invalidate(*todo_ids)
+        return toggled
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        batch = self._inner.apply_batch(create, toggle, delete)
+        self._invalidate(*toggle, *delete)
+        return batch
+
+    def _invalidate(self, *todo_ids: int) -> None:
+        for todo_id in todo_ids:
+            self._backend.delete(self._todo_key(todo_id))
+
+    @staticmethod
+    def _todo_key(todo_id: int) -> str:
+        return f"todos:id:{todo_id}"
@@ -0,0 +1,241 @@
+"""Group commit todo repository adapter. Funnels concurrent todo writes to one writer thread that commits them together, so a burst of writers shares one transaction instead of queueing on the database write lock."""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.sql_repository import (
+    SqlTodoRepository,
+    UncommittedSqlTodoRepository,
+)
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+
+T = TypeVar("T")
+Write = tuple[Callable[[SqlTodoRepository], Any], Future]
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of a write to stop the writer thread
+_STOP = object()
+
+
+class GroupCommitTodoRepository:
+    """TodoRepository committing concurrent writes to one SQL database together.
+
+    Reads run on the caller's session as with SqlTodoRepository. Writes are queued
+    to a writer thread with its own connection, which takes the writes waiting, up to
+    ``max_batch`` and including any arriving within ``window`` seconds of the first,
+    runs them one after another in one transaction and commits once. Each write still
+    takes its own version, so the change feed is unaffected. Callers block until
+    the commit and get their own result back. If any write or the commit fails,
+    the transaction is rolled back and each write is retried in a transaction of
+    its own, so the error reaches only the callers whose writes caused it. Should
+    the rollback fail as well, every write in the batch fails and the writer starts
+    over on a new session. Callers wait at most ``timeout`` seconds for the commit
+    and then raise TimeoutError, though the write may still commit afterwards.
+
+    The writer needs a connection of its own, so the database cannot be an
+    in-memory SQLite one, which every session shares; ValueError is raised for one.
+    """
+
+    has_change_feed = True
+
+    def __init__(
+        self,
+        engine: Engine,
+        session: scoped_session | None = None,
+        window: float = 0.0,
+        max_batch: int = 64,
+        timeout: float | None = 30.0,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if engine.dialect.name == "sqlite" and engine.url.database in (None, "", ":memory:"):
+            raise ValueError("Group commit needs a database file, not an in-memory one")
+        self._session = session if session is not None else db.session
+        self._reader = SqlTodoRepository(self._session)
+        self._writer_sessions = scoped_session(sessionmaker(engine))
+        self._writer = UncommittedSqlTodoRepository(self._writer_sessions)
+        self._window = window
+        self._max_batch = max_batch
+        self._timeout = timeout
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="todo-group-commit", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Commit the writes already queued, then stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        return self._reader.get_all(limit=limit, after=after, query=query)
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        return self._reader.iter_all(batch_size=batch_size, query=query)
+
+    def get_version(self) -> int:
+        return self._reader.get_version()
+
+    def get_stats(self) -> TodoStats:
+        return self._reader.get_stats()
+
+    def count_stats(self) -> TodoStats:
+        return self._reader.count_stats()
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        return self._reader.reconcile_stats()
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        return self._reader.get_changes(after, limit)
+
+    def get_pruned_version(self) -> int:
+        return self._reader.get_pruned_version()
+
+    def prune_tombstones(self, before: datetime) -> int:
+        # Maintenance rather than request traffic, so it commits on its own
+        return self._reader.prune_tombstones(before)
+
+    def get_by_id(self, todo_id: int) -> Todo | None:
+        return self._reader.get_by_id(todo_id)
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        return self._reader.get_many(todo_ids)
+
+    def create(self, todo: Todo) -> Todo:
+        return self._write(lambda repository: repository.create(todo))
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        if not todos:
+            return []
+        return self._write(lambda repository: repository.create_many(todos))
+
+    def update(self, todo: Todo) -> Todo | None:
+        return self._write(lambda repository: repository.update(todo))
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        return self._write(lambda repository: repository.update_many(todos))
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        return self._write(lambda repository: repository.toggle(todo_id, if_updated_at))
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        return self._write(lambda repository: repository.delete(todo_id, if_updated_at))
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        if not todo_ids:
+            return []
+        return self._write(lambda repository: repository.delete_many(todo_ids))
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        if not todo_ids:
+            return []
+        return self._write(lambda repository: repository.toggle_many(todo_ids))
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        # The writes of a batch share the group's transaction, and are retried together
+        return self._write(lambda repository: repository.apply_batch(create, toggle, delete))
+
+    def _write(self, call: Callable[[SqlTodoRepository], T]) -> T:
+        if not self._thread.is_alive():
+            raise RuntimeError("The group commit writer has stopped")
+        future: Future = Future()
+        self._queue.put((call, future))
+        result = future.result(timeout=self._timeout)
+        # End the caller's read transaction, so its next read sees the committed write
+        self._session.commit()
+        return result
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch, stopping = self._gather()
+                if batch:
+                    try:
+                        self._commit(batch)
+                    except Exception as error:
+                        # Only reached when the rollback itself failed, leaving the
+                        # session unusable; the writer must live on for later writes
+                        logger.exception("Group commit rollback failed, starting over")
+                        _fail(batch, error)
+                        self._reset_writer()
+                if stopping:
+                    return
+        finally:
+            self._reset_writer()
+
+    def _reset_writer(self) -> None:
+        # The next write opens a new session and connection
+        try:
+            self._writer_sessions.remove()
+        except Exception:
+            logger.exception("Closing the group commit session failed, dropping it")
+            self._writer_sessions.registry.clear()
+
+    def _gather(self) -> tuple[list[Write], bool]:
+        # Blocks for the first write, then waits out the window for company
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    write = self._queue.get(timeout=remaining)
+                else:
+                    write = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is _STOP:
+                return batch, True
+            batch.append(write)
+        return batch, False
+
+    def _commit(self, batch: list[Write]) -> None:
+        session = self._writer_sessions
+        try:
+            results = [call(self._writer) for call, _ in batch]
+            session.commit()
+        # Any error a write raises is its caller's, handed back through the future
+        except Exception as error:  # noqa: BLE001
+            session.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(error)
+                return
+            for write in batch:
+                self._commit([write])
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def _fail(batch: list[Write], error: Exception) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
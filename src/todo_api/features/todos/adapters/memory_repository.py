@@ -0,0 +1,671 @@
+"""In-memory todo repository adapter. Keeps todos in process memory behind sorted indexes, with an append-only journal and periodic snapshots to disk for crash recovery."""
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import fields
+from datetime import UTC, datetime
+from heapq import merge
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, TextIO
+
+from todo_api.features.todos.domain import (
+    SORT_FIELDS,
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+
+# Todos are held as tuples in Todo's field order, so reads build Todo(*row) as the SQL adapter does
+Row = tuple
+_as_row = attrgetter(*(f.name for f in fields(Todo)))
+_POSITION = {f.name: position for position, f in enumerate(fields(Todo))}
+_ID = _POSITION["id"]
+_TITLE = _POSITION["title"]
+_COMPLETED = _POSITION["completed"]
+_CREATED_AT = _POSITION["created_at"]
+_UPDATED_AT = _POSITION["updated_at"]
+_OWNER = _POSITION["owner"]
+_DATETIMES = tuple(position for position, f in enumerate(fields(Todo)) if f.type is datetime)
+
+# Batches larger than this are added to an index by re-sorting rather than one insort each
+_BULK = 64
+
+SNAPSHOT_FORMAT = 1
+
+# Title words as the SQL adapter's FTS5 unicode61 tokenizer splits them
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+class InMemoryTodoRepository:
+    """TodoRepository holding every todo in process memory, for single-process nodes and tests.
+
+    Todos are stored as immutable row tuples keyed by ID, with sorted (value, id)
+    indexes for each listing order, a creation-order index per completion status,
+    an inverted index of title words for search, and a (version, id) index for the
+    change feed. Listings walk an index from the keyset position, so a page costs
+    its own size rather than the table's. Reads and writes take one lock, apart
+    from the version counters, which are single attribute reads; reads hand out
+    new Todo objects, so callers may change them freely.
+
+    Behaviour matches SqlTodoRepository, including version numbering, freed IDs
+    being reused, and timestamps stored as naive UTC.
+
+    Given a ``snapshot_path``, every write is appended to a journal next to it and
+    flushed to the operating system before the call returns, and ``snapshot``
+    writes the whole store to the path and starts a new journal, every
+    ``snapshot_interval`` seconds if set. A new repository over the same path
+    restores the snapshot and replays the journal, so a crashed process loses no
+    acknowledged write; a crashed machine may lose those not yet written back.
+    """
+
+    has_change_feed = True
+
+    def __init__(
+        self, snapshot_path: str | os.PathLike | None = None, snapshot_interval: float | None = None
+    ):
+        # Reentrant, so a batch can hold it across the writes it is made of
+        self._lock = threading.RLock()
+        self._rows: dict[int, Row] = {}
+        self._versions: dict[int, int] = {}
+        self._version = 0
+        self._pruned_version = 0
+        # Sorted (version, todo_id, deleted_at) records of deleted todos
+        self._tombstones: list[tuple[int, int, datetime]] = []
+        self._last_id = 0
+        self._path = Path(snapshot_path) if snapshot_path is not None else None
+        self._journal: TextIO | None = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_version: int | None = None
+        self._stop = threading.Event()
+        self._snapshotter: threading.Thread | None = None
+
+        if self._path is not None:
+            self._restore()
+        else:
+            self._rebuild()
+        if self._path is not None and snapshot_interval:
+            self._snapshotter = threading.Thread(
+                target=self._snapshot_every,
+                args=(snapshot_interval,),
+                name="todo-snapshots",
+                daemon=True,
+            )
+            self._snapshotter.start()
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        with self._lock:
+            rows = islice(self._select(query or TodoQuery(), after), limit)
+            return [Todo(*row) for row in rows]
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        # Read in keyset batches, so writers are only held up for one batch at a time
+        query = query or TodoQuery()
+        after = None
+        while True:
+            batch = self.get_all(limit=batch_size, after=after, query=query)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after = (getattr(batch[-1], query.sort), batch[-1].id)
+
+    def get_version(self) -> int:
+        return self._version
+
+    def get_stats(self) -> TodoStats:
+        with self._lock:
+            return TodoStats(self._total, self._completed)
+
+    def count_stats(self) -> TodoStats:
+        with self._lock:
+            return self._count()
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        with self._lock:
+            recorded, counted = TodoStats(self._total, self._completed), self._count()
+            self._total, self._completed = counted.total, counted.completed
+            return recorded, counted
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        with self._lock:
+            start = bisect_right(self._by_version, after)
+            written = (
+                TodoChange(version, todo_id, Todo(*self._rows[todo_id]))
+                for version, todo_id in islice(self._by_version, start, start + limit)
+            )
+            start = bisect_right(self._tombstones, after, key=lambda t: t[:2])
+            deleted = (
+                TodoChange(version, todo_id)
+                for version, todo_id, _ in islice(self._tombstones, start, None)
+                # Skips deletions of IDs that a later create reused, as the todo exists again
+                if todo_id not in self._rows
+            )
+            merged = merge(written, deleted, key=lambda change: (change.version, change.todo_id))
+            return list(islice(merged, limit))
+
+    def get_pruned_version(self) -> int:
+        return self._pruned_version
+
+    def prune_tombstones(self, before: datetime) -> int:
+        before = _naive_utc(before)
+        with self._lock:
+            horizon = max(
+                (version for version, _, deleted_at in self._tombstones if deleted_at < before),
+                default=None,
+            )
+            if horizon is None:
+                return 0
+            pruned = self._prune(horizon)
+            self._log({"prune": horizon})
+            return pruned
+
+    def get_by_id(self, todo_id: int) -> Todo | None:
+        with self._lock:
+            row = self._rows.get(todo_id)
+        return Todo(*row) if row is not None else None
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        with self._lock:
+            rows = [self._rows[i] for i in dict.fromkeys(todo_ids) if i in self._rows]
+        return [Todo(*row) for row in rows]
+
+    def create(self, todo: Todo) -> Todo:
+        return self.create_many([todo])[0]
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        if not todos:
+            return []
+        now = _now()
+        with self._lock:
+            version = self._version + 1
+            first = self._next_id()
+            rows = [
+                _as_row(
+                    Todo(
+                        title=todo.title,
+                        completed=todo.completed,
+                        id=first + offset,
+                        created_at=now,
+                        updated_at=now,
+                        owner=todo.owner,
+                    )
+                )
+                for offset, todo in enumerate(todos)
+            ]
+            self._write(rows, version)
+            self._last_id = rows[-1][_ID]
+            return [Todo(*row) for row in rows]
+
+    def update(self, todo: Todo) -> Todo | None:
+        return self.update_many([todo])[0]
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        now = _now()
+        with self._lock:
+            changes = {
+                todo.id: (todo.title, todo.completed) for todo in todos if todo.id in self._rows
+            }
+            rows = [
+                _replace(self._rows[todo_id], title=title, completed=completed, updated_at=now)
+                for todo_id, (title, completed) in changes.items()
+            ]
+            if rows:
+                self._write(rows, self._version + 1)
+            return [
+                Todo(*self._rows[todo.id]) if todo.id in changes else None for todo in todos
+            ]
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        now = _now()
+        with self._lock:
+            row = self._rows.get(todo_id)
+            if row is None or if_updated_at not in (None, row[_UPDATED_AT]):
+                return None
+            row = _replace(row, completed=not row[_COMPLETED], updated_at=now)
+            self._write([row], self._version + 1)
+            return Todo(*row)
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        now = _now()
+        with self._lock:
+            rows = [
+                _replace(self._rows[i], completed=not self._rows[i][_COMPLETED], updated_at=now)
+                for i in dict.fromkeys(todo_ids)
+                if i in self._rows
+            ]
+            if rows:
+                self._write(rows, self._version + 1)
+        toggled = {row[_ID]: Todo(*row) for row in rows}
+        return [toggled.get(todo_id) for todo_id in todo_ids]
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        # Held throughout, so listings and other writers see the batch whole. Each
+        # write is journalled on its own, so a crash part-way recovers those before it
+        with self._lock:
+            return TodoBatch(
+                self.create_many(create), self.toggle_many(toggle), self.delete_many(delete)
+            )
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        return self._delete([todo_id], if_updated_at)[0]
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        return self._delete(todo_ids)
+
+    def _delete(self, todo_ids: list[int], if_updated_at: datetime | None = None) -> list[bool]:
+        if not todo_ids:
+            return []
+        now = _now()
+        with self._lock:
+            doomed = sorted(
+                {
+                    todo_id
+                    for todo_id in todo_ids
+                    if todo_id in self._rows
+                    and if_updated_at in (None, self._rows[todo_id][_UPDATED_AT])
+                }
+            )
+            if doomed:
+                version = self._version + 1
+                tombstones = [(version, todo_id, now) for todo_id in doomed]
+                self._log({"delete": [_encode_tombstone(t) for t in tombstones]})
+                for todo_id in doomed:
+                    self._unindex(self._rows.pop(todo_id), self._versions.pop(todo_id))
+                self._tombstones.extend(tombstones)
+                self._version = version
+                if self._last_id not in self._rows:
+                    # Deleting the highest ID frees it for reuse, as in SQLite
+                    self._last_id = max(self._rows, default=0)
+            return [todo_id in doomed for todo_id in todo_ids]
+
+    def snapshot(self) -> bool:
+        """Write the whole store to the snapshot file and start a new journal.
+
+        The state is copied under the lock and written out after releasing it, so
+        writers only wait for the copy. Returns False if nothing changed since the
+        last snapshot. Raises ValueError if the repository has no snapshot path.
+        """
+        if self._path is None:
+            raise ValueError("This repository was created without a snapshot path")
+        with self._snapshot_lock:
+            with self._lock:
+                if self._version == self._snapshot_version:
+                    return False
+                rows, versions = self._rows.copy(), self._versions.copy()
+                tombstones = list(self._tombstones)
+                header = {
+                    "format": SNAPSHOT_FORMAT,
+                    "version": self._version,
+                    "pruned_version": self._pruned_version,
+                }
+                # Writes from now on go to a new journal; the old one is kept until
+                # the snapshot holding its writes is safely in place
+                self._journal.close()
+                os.replace(self._journal_path, self._pending_path)
+                self._journal = self._open_journal()
+            _write_snapshot(self._path, header, rows, versions, tombstones)
+            self._pending_path.unlink()
+            self._snapshot_version = header["version"]
+            return True
+
+    def close(self) -> None:
+        """Stop periodic snapshots, taking a final one, and close the journal."""
+        self._stop.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        if self._path is not None and self._journal is not None:
+            try:
+                self.snapshot()
+            finally:
+                self._journal.close()
+                self._journal = None
+
+    # Listing
+
+    def _select(self, query: TodoQuery, after: tuple[Any, int] | None) -> Iterator[Row]:
+        rows = self._rows
+        position = _POSITION[query.sort]
+        if query.search is not None:
+            candidates = sorted(
+                (rows[todo_id][position], todo_id) for todo_id in self._search(query.search)
+            )
+            keys = _walk(candidates, after, query.descending)
+        elif query.sort == "created_at" and query.completed is not None:
+            keys = _walk(self._by_completed[query.completed], after, query.descending)
+        else:
+            keys = _walk(self._indexes[query.sort], after, query.descending)
+        matches = _filter(query)
+        for _, todo_id in keys:
+            row = rows[todo_id]
+            if matches(row):
+                yield row
+
+    def _search(self, search: str) -> set[int]:
+        # Every word must appear in the title, the last one as a word prefix
+        words = _TOKEN.findall(_fold(search))
+        if not words:
+            return set()
+        *whole, prefix = words
+        prefixed: set[int] = set()
+        vocabulary = self._vocabulary
+        index = bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            prefixed |= self._postings[vocabulary[index]]
+            index += 1
+        # Rarest first, so common words only cost a lookup per remaining candidate
+        postings = sorted(
+            [self._postings.get(word, set()) for word in whole] + [prefixed], key=len
+        )
+        found = set(postings[0])
+        for posting in postings[1:]:
+            if not found:
+                break
+            found &= posting
+        return found
+
+    # Writes; callers hold the lock
+
+    def _write(self, rows: list[Row], version: int) -> None:
+        # Logged first, so a write that fails to reach the journal changes nothing
+        self._log({"put": [_encode_row(row, version) for row in rows]})
+        replaced = [
+            (self._rows[row[_ID]], self._versions[row[_ID]])
+            for row in rows
+            if row[_ID] in self._rows
+        ]
+        for old, old_version in replaced:
+            self._unindex(old, old_version)
+        for row in rows:
+            self._rows[row[_ID]] = row
+            self._versions[row[_ID]] = version
+        self._index(rows, version)
+        self._version = version
+
+    def _next_id(self) -> int:
+        # As SQLite does without AUTOINCREMENT, the highest ID in use plus one
+        return self._last_id + 1
+
+    def _prune(self, horizon: int) -> int:
+        cut = bisect_right(self._tombstones, horizon, key=lambda t: t[0])
+        del self._tombstones[:cut]
+        self._pruned_version = max(self._pruned_version, horizon)
+        return cut
+
+    def _log(self, entry: dict) -> None:
+        if self._journal is not None:
+            self._journal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._journal.flush()
+
+    # Indexes
+
+    def _rebuild(self) -> None:
+        self._indexes: dict[str, list[tuple[Any, int]]] = {name: [] for name in SORT_FIELDS}
+        self._by_completed: dict[bool, list[tuple[datetime, int]]] = {False: [], True: []}
+        self._by_version: list[tuple[int, int]] = []
+        self._postings: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._total = self._completed = 0
+        by_version: dict[int, list[Row]] = {}
+        for todo_id, row in self._rows.items():
+            by_version.setdefault(self._versions[todo_id], []).append(row)
+        for version in sorted(by_version):
+            self._index(by_version[version], version)
+        self._last_id = max(self._rows, default=0)
+
+    def _index(self, rows: list[Row], version: int) -> None:
+        for name, index in self._indexes.items():
+            position = _POSITION[name]
+            _add(index, [(row[position], row[_ID]) for row in rows])
+        for completed, index in self._by_completed.items():
+            keys = [(row[_CREATED_AT], row[_ID]) for row in rows if row[_COMPLETED] == completed]
+            _add(index, keys)
+        # Versions only grow, so the write's entries go at the end in ID order
+        self._by_version.extend((version, row[_ID]) for row in sorted(rows, key=lambda r: r[_ID]))
+        new_words = []
+        for row in rows:
+            for word in set(_TOKEN.findall(_fold(row[_TITLE]))):
+                posting = self._postings.get(word)
+                if posting is None:
+                    posting = self._postings[word] = set()
+                    new_words.append(word)
+                posting.add(row[_ID])
+        _add(self._vocabulary, new_words)
+        self._total += len(rows)
+        self._completed += sum(1 for row in rows if row[_COMPLETED])
+
+    def _unindex(self, row: Row, version: int) -> None:
+        todo_id = row[_ID]
+        for name, index in self._indexes.items():
+            _discard(index, (row[_POSITION[name]], todo_id))
+        _discard(self._by_completed[row[_COMPLETED]], (row[_CREATED_AT], todo_id))
+        _discard(self._by_version, (version, todo_id))
+        for word in set(_TOKEN.findall(_fold(row[_TITLE]))):
+            posting = self._postings[word]
+            posting.discard(todo_id)
+            if not posting:
+                del self._postings[word]
+                _discard(self._vocabulary, word)
+        self._total -= 1
+        self._completed -= 1 if row[_COMPLETED] else 0
+
+    def _count(self) -> TodoStats:
+        rows = self._rows.values()
+        return TodoStats(len(rows), sum(1 for row in rows if row[_COMPLETED]))
+
+    # Persistence
+
+    @property
+    def _journal_path(self) -> Path:
+        return self._path.with_name(self._path.name + ".journal")
+
+    @property
+    def _pending_path(self) -> Path:
+        # The journal a snapshot in progress is replacing
+        return self._path.with_name(self._path.name + ".journal.pending")
+
+    def _restore(self) -> None:
+        if self._path.exists():
+            header = _read_snapshot(self._path, self._rows, self._versions, self._tombstones)
+            self._version = header["version"]
+            self._pruned_version = header["pruned_version"]
+        for journal in (self._pending_path, self._journal_path):
+            if journal.exists():
+                self._replay(journal)
+        self._rebuild()
+        self._journal = self._open_journal()
+        # Fold the replayed journals into a fresh snapshot, so the next restore starts from it
+        try:
+            self.snapshot()
+        except BaseException:
+            # The repository is never handed out, so no close() will release the journal
+            self._journal.close()
+            raise
+        self._snapshot_version = self._version
+
+    def _open_journal(self) -> TextIO:
+        # Held open for appends until close(), or the next snapshot swaps it for a new one
+        return open(self._journal_path, "a", encoding="utf-8")
+
+    def _replay(self, journal: Path) -> None:
+        snapshot_version = self._version
+        with open(journal, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The process died partway through its last write, which was not acknowledged
+                    break
+                if "prune" in entry:
+                    if entry["prune"] > self._pruned_version:
+                        self._prune(entry["prune"])
+                    continue
+                if "put" in entry:
+                    for values in entry["put"]:
+                        row, version = _decode_row(values)
+                        if version > snapshot_version:
+                            self._rows[row[_ID]] = row
+                            self._versions[row[_ID]] = version
+                            self._version = max(self._version, version)
+                for values in entry.get("delete", ()):
+                    version, todo_id, deleted_at = _decode_tombstone(values)
+                    if version > snapshot_version:
+                        self._rows.pop(todo_id, None)
+                        self._versions.pop(todo_id, None)
+                        self._tombstones.append((version, todo_id, deleted_at))
+                        self._version = max(self._version, version)
+        self._tombstones.sort()
+
+    def _snapshot_every(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.snapshot()
+
+
+def _walk(
+    index: list[tuple[Any, int]], after: tuple[Any, int] | None, descending: bool
+) -> Iterator[tuple[Any, int]]:
+    # Yields the keys past the keyset position, reading the list in place
+    if descending:
+        stop = bisect_left(index, after) if after is not None else len(index)
+        for position in range(stop - 1, -1, -1):
+            yield index[position]
+    else:
+        start = bisect_right(index, after) if after is not None else 0
+        for position in range(start, len(index)):
+            yield index[position]
+
+
+def _filter(query: TodoQuery):
+    checks = []
+    if query.owner is not None:
+        checks.append(lambda row: row[_OWNER] == query.owner)
+    if query.completed is not None:
+        checks.append(lambda row: row[_COMPLETED] == query.completed)
+    if query.created_after is not None:
+        checks.append(lambda row: row[_CREATED_AT] > query.created_after)
+    if query.created_before is not None:
+        checks.append(lambda row: row[_CREATED_AT] < query.created_before)
+    if query.updated_after is not None:
+        checks.append(lambda row: row[_UPDATED_AT] > query.updated_after)
+    if query.updated_before is not None:
+        checks.append(lambda row: row[_UPDATED_AT] < query.updated_before)
+    return lambda row: all(check(row) for check in checks)
+
+
+def _add(index: list, keys: list) -> None:
+    if len(keys) > _BULK:
+        index.extend(keys)
+        index.sort()
+    else:
+        for key in keys:
+            insort(index, key)
+
+
+def _discard(index: list, key: Any) -> None:
+    position = bisect_left(index, key)
+    if position < len(index) and index[position] == key:
+        del index[position]
+
+
+def _replace(row: Row, **changes: Any) -> Row:
+    values = list(row)
+    for name, value in changes.items():
+        values[_POSITION[name]] = value
+    return tuple(values)
+
+
+def _fold(text: str) -> str:
+    # Case and diacritics are ignored, as by the tokenizer's remove_diacritics option
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _now() -> datetime:
+    # Timestamps are kept as naive UTC, as the SQL adapter stores them
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _encode_row(row: Row, version: int) -> list:
+    values = list(row)
+    for position in _DATETIMES:
+        values[position] = values[position].isoformat()
+    values.append(version)
+    return values
+
+
+def _decode_row(values: list) -> tuple[Row, int]:
+    *values, version = values
+    for position in _DATETIMES:
+        values[position] = datetime.fromisoformat(values[position])
+    return tuple(values), version
+
+
+def _encode_tombstone(tombstone: tuple[int, int, datetime]) -> list:
+    version, todo_id, deleted_at = tombstone
+    return [version, todo_id, deleted_at.isoformat()]
+
+
+def _decode_tombstone(values: list) -> tuple[int, int, datetime]:
+    version, todo_id, deleted_at = values
+    return version, todo_id, datetime.fromisoformat(deleted_at)
+
+
+def _write_snapshot(
+    path: Path,
+    header: dict,
+    rows: dict[int, Row],
+    versions: dict[int, int],
+    tombstones: Iterable[tuple[int, int, datetime]],
+) -> None:
+    # Written beside the old snapshot and renamed over it, so a crash leaves one or the other
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(json.dumps({**header, "todos": len(rows)}) + "\n")
+        file.writelines(
+            json.dumps(_encode_row(row, versions[todo_id])) + "\n"
+            for todo_id, row in rows.items()
+        )
+        file.writelines(json.dumps(_encode_tombstone(t)) + "\n" for t in tombstones)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _read_snapshot(
+    path: Path,
+    rows: dict[int, Row],
+    versions: dict[int, int],
+    tombstones: list[tuple[int, int, datetime]],
+) -> dict:
+    with open(path, encoding="utf-8") as file:
+        header = json.loads(next(file))
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported todo snapshot format in {path}")
+        for line in islice(file, header["todos"]):
+            row, version = _decode_row(json.loads(line))
+            rows[row[_ID]] = row
+            versions[row[_ID]] = version
+        tombstones.extend(_decode_tombstone(json.loads(line)) for line in file)
+    return header
@@ -0,0 +1,190 @@
+"""Replicated todo repository adapter. Sends todo reads to read-only replica databases in turn and writes to the primary, keeping recent writers on the primary so they read their own writes."""
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import cycle
+from typing import Any, TypeVar
+
+from flask import g, has_request_context
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from todo_api.core.routing import ReadStickiness
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.features.todos.repository import TodoRepository
+from todo_api.infrastructure.database import configure_sqlite
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class Replica:
+    """A read-only copy of the todo database."""
+
+    uri: str
+    engine: Engine
+    sessions: scoped_session
+    repository: SqlTodoRepository = field(init=False)
+
+    def __post_init__(self):
+        self.repository = SqlTodoRepository(self.sessions)
+
+
+def connect_replica(
+    uri: str, engine_options: dict | None = None, pragmas: dict | None = None
+) -> Replica:
+    """Connect to one replica database, applying the engine options and SQLite pragmas given."""
+    engine = create_engine(uri, **(engine_options or {}))
+    configure_sqlite(engine, pragmas)
+    return Replica(uri, engine, scoped_session(sessionmaker(engine)))
+
+
+class ReplicatedTodoRepository:
+    """TodoRepository reading from replicas of the primary database and writing to the primary.
+
+    Reads of todos, versions, stats and the change feed go to the replicas in turn,
+    one replica per request, so a version and the listing it tags come from the
+    same copy. Each read runs on a session ended as soon as the read is, so later
+    reads see the replica's latest state. Writes and maintenance go to ``primary``, and mark the
+    client with ``stickiness``; reads for clients it reports as pinned go to the
+    primary too, so they are not served a replica that has yet to catch up with
+    their own writes. Without a stickiness, reads always go to the replicas.
+    """
+
+    def __init__(
+        self,
+        primary: TodoRepository,
+        replicas: list[Replica],
+        stickiness: ReadStickiness | None = None,
+    ):
+        if not replicas:
+            raise ValueError("A replicated repository needs at least one replica")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._stickiness = stickiness
+        self._turns = cycle(self.replicas)
+        self._lock = threading.Lock()
+
+    @property
+    def has_change_feed(self) -> bool:
+        return self.primary.has_change_feed
+
+    def close(self) -> None:
+        for replica in self.replicas:
+            replica.sessions.remove()
+            replica.engine.dispose()
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        return self._read(lambda repository: repository.get_all(limit, after, query))
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        if self._pinned():
+            yield from self.primary.iter_all(batch_size=batch_size, query=query)
+            return
+        replica = self._next_replica()
+        try:
+            yield from replica.repository.iter_all(batch_size=batch_size, query=query)
+        finally:
+            replica.sessions.remove()
+
+    def get_version(self) -> int:
+        return self._read(lambda repository: repository.get_version())
+
+    def get_stats(self) -> TodoStats:
+        return self._read(lambda repository: repository.get_stats())
+
+    def count_stats(self) -> TodoStats:
+        return self.primary.count_stats()
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        return self.primary.reconcile_stats()
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        return self._read(lambda repository: repository.get_changes(after, limit))
+
+    def get_pruned_version(self) -> int:
+        return self._read(lambda repository: repository.get_pruned_version())
+
+    def prune_tombstones(self, before: datetime) -> int:
+        return self.primary.prune_tombstones(before)
+
+    def get_by_id(self, todo_id: int) -> Todo | None:
+        return self._read(lambda repository: repository.get_by_id(todo_id))
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        return self._read(lambda repository: repository.get_many(todo_ids))
+
+    def create(self, todo: Todo) -> Todo:
+        return self._write(self.primary.create(todo))
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        return self._write(self.primary.create_many(todos))
+
+    def update(self, todo: Todo) -> Todo | None:
+        return self._write(self.primary.update(todo))
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        return self._write(self.primary.update_many(todos))
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        return self._write(self.primary.toggle(todo_id, if_updated_at))
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        return self._write(self.primary.delete(todo_id, if_updated_at))
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        return self._write(self.primary.delete_many(todo_ids))
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        return self._write(self.primary.toggle_many(todo_ids))
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        return self._write(self.primary.apply_batch(create, toggle, delete))
+
+    def _read(self, call: Callable[[TodoRepository], T]) -> T:
+        if self._pinned():
+            return call(self.primary)
+        replica = self._next_replica()
+        try:
+            return call(replica.repository)
+        finally:
+            replica.sessions.remove()
+
+    def _write(self, result: T) -> T:
+        # Marked even when nothing matched, as the client cannot tell until it reads
+        if self._stickiness is not None:
+            self._stickiness.wrote()
+        return result
+
+    def _pinned(self) -> bool:
+        return self._stickiness is not None and self._stickiness.pinned()
+
+    def _next_replica(self) -> Replica:
+        if not has_request_context():
+            return self._take_turn()
+        chosen = g.setdefault("todo_replicas", {})
+        if self not in chosen:
+            chosen[self] = self._take_turn()
+        return chosen[self]
+
+    def _take_turn(self) -> Replica:
+        with self._lock:
+            return next(self._turns)
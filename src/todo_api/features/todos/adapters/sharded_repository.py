@@ -0,0 +1,390 @@
+"""Sharded todo repository adapter. Spreads tenants over several SQL databases by consistent hashing of the todo owner, fanning reads across tenants out to every shard in parallel."""
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from heapq import merge
+from itertools import islice
+from operator import attrgetter
+from typing import Any, TypeVar
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from todo_api.core.exceptions import UnsupportedError
+from todo_api.core.sharding import HashRing
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.infrastructure.database import configure_sqlite
+
+T = TypeVar("T")
+Call = Callable[[SqlTodoRepository], T]
+
+# IDs each shard allocates from; the shard at position n takes those from n * ID_SPAN
+ID_SPAN = 2**40
+
+# Todos copied per transaction when moving a tenant
+MOVE_BATCH_SIZE = 200
+
+
+@dataclass(eq=False)
+class Shard:
+    """One database of a sharded todo store. Its position fixes the ID range it allocates from."""
+
+    name: str
+    position: int
+    engine: Engine
+    sessions: scoped_session
+    repository: SqlTodoRepository = field(init=False)
+
+    def __post_init__(self):
+        low = max(self.position * ID_SPAN, 1)
+        self.repository = SqlTodoRepository(
+            self.sessions, id_range=(low, (self.position + 1) * ID_SPAN - 1)
+        )
+
+
+def create_shard(
+    name: str,
+    position: int,
+    uri: str,
+    engine_options: dict | None = None,
+    pragmas: dict | None = None,
+) -> Shard:
+    """Connect to one shard database, applying the engine options and SQLite pragmas given."""
+    options = dict(engine_options or {})
+    if make_url(uri).database in (None, "", ":memory:"):
+        # Share one connection so every session sees the same in-memory database
+        options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    engine = create_engine(uri, **options)
+    configure_sqlite(engine, pragmas)
+    return Shard(name, position, engine, scoped_session(sessionmaker(engine)))
+
+
+class ShardedTodoRepository:
+    """TodoRepository spreading tenants over several SQL databases.
+
+    A todo lives on the shard its owner hashes to on a HashRing of shard names, so
+    all of a tenant's todos share one database. Listings restricted to an owner
+    read that shard, plus any shard the tenant still has todos on from before
+    shards were added; those are found on the first such listing and forgotten
+    once this repository rebalances. Other listings query every shard at once on a thread
+    pool and merge the sorted pages on the listing's (sort value, id) key. Each
+    shard allocates IDs from its own range, so IDs stay unique across shards and
+    lookups by ID start at the shard whose range holds the ID, falling back to the
+    others for todos whose tenant has since moved. Stats and versions are summed.
+
+    The change feed orders writes by the version of a single database, which the
+    shards do not share, so it is not served: ``get_changes`` raises UnsupportedError.
+    Nor is there a transaction spanning shards, so ``apply_batch`` commits its
+    creates, toggles and deletes one after another rather than together.
+    """
+
+    has_change_feed = False
+
+    def __init__(self, shards: list[Shard], max_workers: int | None = None):
+        if not shards:
+            raise ValueError("A sharded repository needs at least one shard")
+        self.shards = list(shards)
+        self.ring = HashRing(shard.name for shard in self.shards)
+        if len(self.ring.nodes) != len(self.shards):
+            raise ValueError("Shard names must be unique")
+        self._by_name = {shard.name: shard for shard in self.shards}
+        self._by_position = {shard.position: shard for shard in self.shards}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.shards), thread_name_prefix="todo-shards"
+        )
+        self._strays: dict[str, list[Shard]] | None = None
+        self._strays_lock = threading.Lock()
+
+    def shard_for(self, owner: str) -> Shard:
+        """Return the shard the tenant's todos belong on."""
+        return self._by_name[self.ring.node_for(owner)]
+
+    def create_all(self) -> None:
+        """Create any missing tables and search indexes on every shard."""
+        for shard in self.shards:
+            db.metadata.create_all(shard.engine)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        for shard in self.shards:
+            shard.sessions.remove()
+            shard.engine.dispose()
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        pages = self._each(
+            lambda repository: repository.get_all(limit=limit, after=after, query=query),
+            self._shards_for(query),
+        )
+        return list(islice(_merge(pages, query), limit))
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        streams = [self._stream(shard, batch_size, query) for shard in self._shards_for(query)]
+        yield from _merge(streams, query)
+
+    def get_version(self) -> int:
+        # Every write moves one shard's version on, so the sum moves on with it
+        return sum(self._each(lambda repository: repository.get_version()))
+
+    def get_stats(self) -> TodoStats:
+        return _sum_stats(self._each(lambda repository: repository.get_stats()))
+
+    def count_stats(self) -> TodoStats:
+        return _sum_stats(self._each(lambda repository: repository.count_stats()))
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        results = self._each(lambda repository: repository.reconcile_stats())
+        return (
+            _sum_stats(recorded for recorded, _ in results),
+            _sum_stats(counted for _, counted in results),
+        )
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        raise UnsupportedError("The change feed is not available on a sharded todo store")
+
+    def get_pruned_version(self) -> int:
+        return max(self._each(lambda repository: repository.get_pruned_version()))
+
+    def prune_tombstones(self, before: datetime) -> int:
+        return sum(self._each(lambda repository: repository.prune_tombstones(before)))
+
+    def get_by_id(self, todo_id: int) -> Todo | None:
+        return self._route([todo_id], _found_todos).get(todo_id)
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        return list(self._route(todo_ids, _found_todos).values())
+
+    def create(self, todo: Todo) -> Todo:
+        return self.create_many([todo])[0]
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        positions: dict[Shard, list[int]] = defaultdict(list)
+        for position, todo in enumerate(todos):
+            positions[self.shard_for(todo.owner)].append(position)
+        calls = [
+            (shard, partial(SqlTodoRepository.create_many, todos=[todos[p] for p in chosen]))
+            for shard, chosen in positions.items()
+        ]
+        # Each shard returns its todos in the order given, which are put back in place
+        created: list[Todo | None] = [None] * len(todos)
+        for chosen, written in zip(positions.values(), self._map(calls)):
+            for position, todo in zip(chosen, written):
+                created[position] = todo
+        return created
+
+    def update(self, todo: Todo) -> Todo | None:
+        return self.update_many([todo])[0]
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        by_id = {todo.id: todo for todo in todos}
+
+        def update(repository: SqlTodoRepository, ids: list[int]) -> dict[int, Todo]:
+            updated = repository.update_many([by_id[todo_id] for todo_id in ids])
+            return {todo.id: todo for todo in updated if todo is not None}
+
+        updated = self._route(list(by_id), update)
+        return [updated.get(todo.id) for todo in todos]
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        def toggle(repository: SqlTodoRepository, ids: list[int]) -> dict[int, Todo]:
+            toggled = repository.toggle(todo_id, if_updated_at)
+            return {todo_id: toggled} if toggled is not None else {}
+
+        return self._route([todo_id], toggle).get(todo_id)
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        def delete(repository: SqlTodoRepository, ids: list[int]) -> dict[int, bool]:
+            return {todo_id: True} if repository.delete(todo_id, if_updated_at) else {}
+
+        return self._route([todo_id], delete).get(todo_id, False)
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        def delete(repository: SqlTodoRepository, ids: list[int]) -> dict[int, bool]:
+            return {i: True for i, deleted in zip(ids, repository.delete_many(ids)) if deleted}
+
+        deleted = self._route(todo_ids, delete)
+        return [todo_id in deleted for todo_id in todo_ids]
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        def toggle(repository: SqlTodoRepository, ids: list[int]) -> dict[int, Todo]:
+            return {todo.id: todo for todo in repository.toggle_many(ids) if todo is not None}
+
+        toggled = self._route(todo_ids, toggle)
+        return [toggled.get(todo_id) for todo_id in todo_ids]
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        return TodoBatch(
+            self.create_many(create), self.toggle_many(toggle), self.delete_many(delete)
+        )
+
+    def misplaced(self, owner: str | None = None) -> list[tuple[str, Shard, Shard]]:
+        """Return the (tenant, shard, ring shard) of every tenant with todos off its ring shard."""
+        owners = self._each(lambda repository: repository.get_owners())
+        return [
+            (tenant, shard, self.shard_for(tenant))
+            for shard, tenants in zip(self.shards, owners)
+            for tenant in tenants
+            if (owner is None or tenant == owner) and self.shard_for(tenant) is not shard
+        ]
+
+    def move_tenant(self, owner: str, source: Shard) -> int:
+        """Move the tenant's todos from ``source`` onto its ring shard. Returns how many moved.
+
+        Todos are copied in batches under their own IDs, then deleted from the
+        source unless written there since, in which case the next batch copies them
+        again. Moves are safe to repeat after an interruption. New todos already go
+        to the ring shard, and lookups by ID find moved todos on either shard.
+        """
+        target = self.shard_for(owner)
+        if target is source:
+            return 0
+        query = TodoQuery(owner=owner)
+        moved = 0
+        while True:
+            batch = self._run(
+                source, lambda repository: repository.get_all(limit=MOVE_BATCH_SIZE, query=query)
+            )
+            if not batch:
+                self._strays = None
+                return moved
+            self._run(target, lambda repository, batch=batch: repository.import_many(batch))
+            moved += self._run(
+                source, lambda repository, batch=batch: repository.remove_moved(batch)
+            )
+
+    def rebalance(self, owner: str | None = None) -> dict[str, int]:
+        """Move every misplaced tenant, or only ``owner``, onto its ring shard.
+
+        Run after adding shards. Returns the number of todos moved per tenant.
+        """
+        moved: dict[str, int] = defaultdict(int)
+        for tenant, source, _ in self.misplaced(owner):
+            moved[tenant] += self.move_tenant(tenant, source)
+        return dict(moved)
+
+    def _shards_for(self, query: TodoQuery | None) -> list[Shard]:
+        if query is not None and query.owner is not None:
+            return [self.shard_for(query.owner), *self._stray_shards().get(query.owner, [])]
+        return self.shards
+
+    def _stray_shards(self) -> dict[str, list[Shard]]:
+        # Tenants only land off their ring shard when shards are added, which takes a
+        # restart, so one scan serves until a rebalance here moves them. A rebalance
+        # run elsewhere leaves the scanned shards empty for the tenant, costing a read.
+        with self._strays_lock:
+            if self._strays is None:
+                strays: dict[str, list[Shard]] = defaultdict(list)
+                for tenant, shard, _ in self.misplaced():
+                    strays[tenant].append(shard)
+                self._strays = dict(strays)
+            return self._strays
+
+    def _home(self, todo_id: int) -> Shard | None:
+        return self._by_position.get(todo_id // ID_SPAN)
+
+    def _route(
+        self, todo_ids: list[int], call: Callable[[SqlTodoRepository, list[int]], dict[int, T]]
+    ) -> dict[int, T]:
+        """Run ``call(repository, ids)`` on each shard's share of the IDs, merging the results by ID.
+
+        ``call`` returns the IDs it found with their results. IDs go to the shard
+        whose range holds them, and those not found there to every other shard.
+        """
+        ids = list(dict.fromkeys(todo_ids))
+        homes: dict[Shard | None, list[int]] = defaultdict(list)
+        for todo_id in ids:
+            homes[self._home(todo_id)].append(todo_id)
+        found: dict[int, T] = {}
+        for result in self._map(_bind(call, homes.items())):
+            found.update(result)
+        missing = [todo_id for todo_id in ids if todo_id not in found]
+        if missing:
+            elsewhere = {
+                shard: [i for i in missing if self._home(i) is not shard] for shard in self.shards
+            }
+            for result in self._map(_bind(call, elsewhere.items())):
+                found.update(result)
+        return found
+
+    def _each(self, call: Call, shards: list[Shard] | None = None) -> list[T]:
+        return self._map([(shard, call) for shard in shards or self.shards])
+
+    def _map(self, calls: list[tuple[Shard, Call]]) -> list[T]:
+        # A single shard is read on the calling thread, skipping the pool hand-off
+        if len(calls) == 1:
+            return [self._run(*calls[0])]
+        return list(self._executor.map(lambda shard_call: self._run(*shard_call), calls))
+
+    @staticmethod
+    def _run(shard: Shard, call: Call) -> T:
+        # Each call runs in a fresh session, so no transaction outlives it
+        try:
+            return call(shard.repository)
+        finally:
+            shard.sessions.remove()
+
+    @staticmethod
+    def _stream(shard: Shard, batch_size: int, query: TodoQuery | None) -> Iterator[Todo]:
+        try:
+            yield from shard.repository.iter_all(batch_size=batch_size, query=query)
+        finally:
+            shard.sessions.remove()
+
+
+def _bind(
+    call: Callable[[SqlTodoRepository, list[int]], Any],
+    groups: Iterable[tuple[Shard | None, list[int]]],
+) -> list[tuple[Shard, Call]]:
+    return [
+        (shard, lambda repository, ids=ids: call(repository, ids))
+        for shard, ids in groups
+        if shard is not None and ids
+    ]
+
+
+def _found_todos(repository: SqlTodoRepository, ids: list[int]) -> dict[int, Todo]:
+    return {todo.id: todo for todo in repository.get_many(ids)}
+
+
+def _merge(streams: Iterable[Iterable[Todo]], query: TodoQuery | None) -> Iterator[Todo]:
+    # Each stream is already in the listing's order, so a k-way merge keeps that order
+    query = query or TodoQuery()
+    key = attrgetter(query.sort, "id")
+    merged = merge(*streams, key=key, reverse=query.descending)
+    last_id = None
+    for todo in merged:
+        # A todo read mid-move is on both shards; its copies are identical and adjacent
+        if todo.id != last_id:
+            yield todo
+        last_id = todo.id
+
+
+def _sum_stats(stats: Iterable[TodoStats]) -> TodoStats:
+    total = completed = 0
+    for item in stats:
+        total += item.total
+        completed += item.completed
+    return TodoStats(total=total, completed=completed)
@@ -1,52 +1,368 @@
 """SQL-based todo repository adapter. Implements the todo repository port using SQLAlchemy for relational database persistence."""
 
+from collections.abc import Iterator
+from datetime import datetime
+from heapq import merge
+from itertools import islice, starmap
+from typing import Any
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import scoped_session
+
 from todo_api.extensions import db
-from todo_api.features.todos.domain import Todo
-from todo_api.features.todos.models import TodoModel
+from todo_api.features.todos.adapters.sql_statements import (
+    SUMMARY_ID,
+    adjust_counts,
+    count_todos,
+    insert_summary,
+    new_todo_rows,
+    next_version,
+    prune_tombstones,
+    raise_pruned_version,
+    release_version,
+    select_changed_todos,
+    select_prune_horizon,
+    select_pruned_version,
+    select_stats,
+    select_stats_drift,
+    select_todos,
+    select_tombstones,
+    toggle_todos,
+    update_todos,
+)
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.features.todos.models import (
+    TODO_COLUMNS,
+    TodoModel,
+    TodoSummaryModel,
+    TodoTombstoneModel,
+)
 
 
 class SqlTodoRepository:
-    """SQLAlchemy implementation of the TodoRepository port."""
+    """SQLAlchemy implementation of the TodoRepository port.
+
+    Reads and RETURNING clauses select plain columns and build Todo objects straight
+    from the row tuples, so no ORM instances are created or tracked by the session.
+    Every write first takes the next summary version, stamps the rows it touches
+    (or the tombstones of those it deletes) with it, and adjusts the todo counts in
+    the summary row, all in one transaction. Stats are therefore read from one row
+    and the change feed from the rows written after a version.
+
+    Statements run on ``session``, the application's Flask-SQLAlchemy session by
+    default. With an ``id_range`` of inclusive bounds, new todos take the next IDs
+    within it, so databases given disjoint ranges never hand out the same ID.
+    """
+
+    has_change_feed = True
+
+    def __init__(
+        self,
+        session: scoped_session | None = None,
+        id_range: tuple[int, int] | None = None,
+    ):
+        self._session = session if session is not None else db.session
+        self._id_range = id_range
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]:
+        stmt = select_todos(query, limit=limit, after=after)
+        return list(starmap(Todo, self._session.execute(stmt)))
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]:
+        stmt = select_todos(query).execution_options(yield_per=batch_size)
+        yield from starmap(Todo, self._session.execute(stmt))
+
+    def get_version(self) -> int:
+        stmt = select(TodoSummaryModel.version).where(TodoSummaryModel.id == SUMMARY_ID)
+        return self._session.scalar(stmt) or 0
+
+    def get_stats(self) -> TodoStats:
+        row = self._session.execute(select_stats()).one_or_none()
+        # Until the first write creates the summary row, count instead
+        return TodoStats(*row) if row is not None else self.count_stats()
+
+    def count_stats(self) -> TodoStats:
+        return TodoStats(*self._session.execute(count_todos()).one())
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        row = self._session.execute(select_stats_drift()).one_or_none()
+        if row is None:
+            self._session.execute(insert_summary(version=0))
+            self._session.commit()
+            counted = self.count_stats()
+            return counted, counted
+        recorded, counted = TodoStats(*row[:2]), TodoStats(*row[2:])
+        if recorded != counted:
+            self._session.execute(
+                adjust_counts(
+                    total=counted.total - recorded.total,
+                    completed=counted.completed - recorded.completed,
+                )
+            )
+        self._session.commit()
+        return recorded, counted
 
-    def get_all(self) -> list[Todo]:
-        models = db.session.query(TodoModel).order_by(TodoModel.created_at).all()
-        return [self._to_domain(m) for m in models]
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]:
+        written = (
+            TodoChange(version, todo_id, Todo(*columns))
+            for version, todo_id, *columns in self._session.execute(
+                select_changed_todos(after, limit)
+            )
+        )
+        deleted = starmap(TodoChange, self._session.execute(select_tombstones(after, limit)))
+        # Both inputs are in (version, id) order, and an ID is never in both
+        merged = merge(written, deleted, key=lambda change: (change.version, change.todo_id))
+        return list(islice(merged, limit))
+
+    def get_pruned_version(self) -> int:
+        return self._session.scalar(select_pruned_version()) or 0
+
+    def prune_tombstones(self, before: datetime) -> int:
+        horizon = self._session.scalar(select_prune_horizon(before))
+        if horizon is None:
+            return 0
+        pruned = self._session.execute(prune_tombstones(horizon)).rowcount
+        self._session.execute(raise_pruned_version(horizon))
+        self._session.commit()
+        return pruned
 
     def get_by_id(self, todo_id: int) -> Todo | None:
-        model = db.session.get(TodoModel, todo_id)
-        if model is None:
-            return None
-        return self._to_domain(model)
+        row = self._session.execute(
+            select(*TODO_COLUMNS).where(TodoModel.id == todo_id)
+        ).one_or_none()
+        return Todo(*row) if row is not None else None
+
+    def get_many(self, todo_ids: list[int]) -> list[Todo]:
+        if not todo_ids:
+            return []
+        stmt = select(*TODO_COLUMNS).where(TodoModel.id.in_(todo_ids))
+        return list(starmap(Todo, self._session.execute(stmt)))
 
     def create(self, todo: Todo) -> Todo:
-        model = TodoModel(title=todo.title, completed=todo.completed)
-        db.session.add(model)
-        db.session.commit()
-        return self._to_domain(model)
+        return self.create_many([todo])[0]
+
+    def create_many(self, todos: list[Todo]) -> list[Todo]:
+        if not todos:
+            return []
+        version = self._next_version()
+        rows = new_todo_rows(todos, version)
+        if self._id_range is not None:
+            for row, todo_id in zip(rows, self._allocate_ids(len(rows))):
+                row["id"] = todo_id
+        # One multi-row INSERT ... RETURNING; ids are assigned in parameter order
+        result = self._session.execute(insert(TodoModel).returning(*TODO_COLUMNS), rows)
+        created = sorted(starmap(Todo, result), key=lambda t: t.id)
+        self._finish_write(
+            True, total=len(created), completed=sum(t.completed for t in created)
+        )
+        return created
 
     def update(self, todo: Todo) -> Todo | None:
-        model = db.session.get(TodoModel, todo.id)
-        if model is None:
+        return self.update_many([todo])[0]
+
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]:
+        # Rows sharing the same new values are written by a single UPDATE ... WHERE id IN
+        groups: dict[tuple[str, bool], list[int]] = {}
+        for todo in todos:
+            groups.setdefault((todo.title, todo.completed), []).append(todo.id)
+
+        version = self._next_version()
+        updated: dict[int, Todo] = {}
+        completed_delta = 0
+        for (title, completed), ids in groups.items():
+            for flipping in (True, False):
+                stmt = update_todos(ids, title, completed, version, flipping)
+                for todo in starmap(Todo, self._session.execute(stmt)):
+                    updated[todo.id] = todo
+                    if flipping:
+                        completed_delta += 1 if completed else -1
+        self._finish_write(bool(updated), completed=completed_delta)
+        return [updated.get(todo.id) for todo in todos]
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None:
+        stmt = toggle_todos(_matching(todo_id, if_updated_at), self._next_version())
+        row = self._session.execute(stmt).one_or_none()
+        if row is None:
+            self._finish_write(False)
             return None
-        model.title = todo.title
-        model.completed = todo.completed
-        db.session.commit()
-        return self._to_domain(model)
-
-    def delete(self, todo_id: int) -> bool:
-        model = db.session.get(TodoModel, todo_id)
-        if model is None:
-            return False
-        db.session.delete(model)
-        db.session.commit()
-        return True
-
-    @staticmethod
-    def _to_domain(model: TodoModel) -> Todo:
-        return Todo(
-            id=model.id,
-            title=model.title,
-            completed=model.completed,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
+        toggled = Todo(*row)
+        self._finish_write(True, completed=1 if toggled.completed else -1)
+        return toggled
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]:
+        if not todo_ids:
+            return []
+        ids = list(dict.fromkeys(todo_ids))
+        stmt = toggle_todos(TodoModel.id.in_(ids), self._next_version())
+        toggled = {todo.id: todo for todo in starmap(Todo, self._session.execute(stmt))}
+        self._finish_write(
+            bool(toggled), completed=sum(1 if t.completed else -1 for t in toggled.values())
         )
+        return [toggled.get(todo_id) for todo_id in todo_ids]
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool:
+        return todo_id in self._delete(_matching(todo_id, if_updated_at))
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]:
+        if not todo_ids:
+            return []
+        deleted = self._delete(TodoModel.id.in_(todo_ids))
+        return [todo_id in deleted for todo_id in todo_ids]
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        batch = UncommittedSqlTodoRepository(self._session, self._id_range)
+        try:
+            result = batch.apply_batch(create, toggle, delete)
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        return result
+
+    def get_owners(self) -> list[str]:
+        """Return the tenants owning at least one todo."""
+        return list(self._session.scalars(select(TodoModel.owner).distinct()))
+
+    def import_many(self, todos: list[Todo]) -> int:
+        """Write todos copied from another database under their own IDs, replacing any earlier copies.
+
+        Returns how many were written. Used to move a tenant between shards.
+        """
+        if not todos:
+            return 0
+        version = self._next_version()
+        ids = [todo.id for todo in todos]
+        replaced = self._session.execute(
+            delete(TodoModel).where(TodoModel.id.in_(ids)).returning(TodoModel.completed)
+        ).scalars().all()
+        rows = new_todo_rows(todos, version)
+        for row, todo in zip(rows, todos):
+            row.update(id=todo.id, created_at=todo.created_at, updated_at=todo.updated_at)
+        self._session.execute(insert(TodoModel), rows)
+        self._finish_write(
+            True,
+            total=len(todos) - len(replaced),
+            completed=sum(t.completed for t in todos) - sum(replaced),
+        )
+        return len(todos)
+
+    def remove_moved(self, todos: list[Todo]) -> int:
+        """Delete the todos copied elsewhere, skipping any written since they were read.
+
+        Returns how many were deleted; the rest are still here and need copying again.
+        No tombstones are written, as the todos live on rather than being deleted.
+        """
+        if not todos:
+            return 0
+        self._next_version()
+        unchanged = or_(
+            *(
+                and_(
+                    TodoModel.id == todo.id,
+                    TodoModel.title == todo.title,
+                    TodoModel.completed == todo.completed,
+                    TodoModel.updated_at == todo.updated_at,
+                )
+                for todo in todos
+            )
+        )
+        removed = self._session.execute(
+            delete(TodoModel).where(unchanged).returning(TodoModel.completed)
+        ).scalars().all()
+        self._finish_write(bool(removed), total=-len(removed), completed=-sum(removed))
+        return len(removed)
+
+    def _delete(self, condition) -> set[int]:
+        # Deletes the matching todos under one version, leaving a tombstone for each
+        version = self._next_version()
+        stmt = delete(TodoModel).where(condition).returning(TodoModel.id, TodoModel.completed)
+        deleted = {todo_id: completed for todo_id, completed in self._session.execute(stmt)}
+        if deleted:
+            self._session.execute(
+                insert(TodoTombstoneModel),
+                [{"version": version, "todo_id": todo_id} for todo_id in deleted],
+            )
+        self._finish_write(
+            bool(deleted), total=-len(deleted), completed=-sum(deleted.values())
+        )
+        return set(deleted)
+
+    def _next_version(self) -> int:
+        # Taken before touching any todo; the rows written are stamped with it
+        version = self._session.scalar(next_version())
+        if version is None:
+            # The first write creates the row, counting the table as it stands before it
+            self._session.execute(insert_summary(version=1))
+            version = 1
+        return version
+
+    def _allocate_ids(self, count: int) -> range:
+        # Runs after _next_version, whose lock on the summary row serializes allocations
+        low, high = self._id_range
+        highest_row = select(func.max(TodoModel.id)).where(TodoModel.id.between(low, high))
+        recorded, highest = self._session.execute(
+            select(TodoSummaryModel.last_id, highest_row.scalar_subquery()).where(
+                TodoSummaryModel.id == SUMMARY_ID
+            )
+        ).one()
+        start = max(low - 1, recorded, highest or 0) + 1
+        end = start + count - 1
+        if end > high:
+            raise RuntimeError(f"Todo ID range {low}-{high} is exhausted")
+        self._session.execute(
+            update(TodoSummaryModel).where(TodoSummaryModel.id == SUMMARY_ID).values(last_id=end)
+        )
+        return range(start, end + 1)
+
+    def _finish_write(self, changed: bool, total: int = 0, completed: int = 0) -> None:
+        # Counts move in the same transaction as the data; a write that matched
+        # nothing rolls back, returning its reserved version
+        if not changed:
+            self._session.rollback()
+            return
+        if total or completed:
+            self._session.execute(adjust_counts(total, completed))
+        self._session.commit()
+
+
+class UncommittedSqlTodoRepository(SqlTodoRepository):
+    """SqlTodoRepository leaving the commit to the caller, which runs several writes in one transaction.
+
+    A write that changed nothing hands its version back rather than rolling back,
+    which would undo the writes before it in the same transaction.
+    """
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch:
+        return TodoBatch(
+            self.create_many(create), self.toggle_many(toggle), self.delete_many(delete)
+        )
+
+    def _finish_write(self, changed: bool, total: int = 0, completed: int = 0) -> None:
+        if not changed:
+            self._session.execute(release_version())
+        elif total or completed:
+            self._session.execute(adjust_counts(total, completed))
+
+
+def _matching(todo_id: int, if_updated_at: datetime | None):
+    # A conditional write only matches the todo as it was when last read
+    if if_updated_at is None:
+        return TodoModel.id == todo_id
+    return and_(TodoModel.id == todo_id, TodoModel.updated_at == if_updated_at)
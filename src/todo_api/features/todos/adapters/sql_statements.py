@@ -0,0 +1,264 @@
+"""SQL statements shared by the todo adapters. Builds the filtered, ordered and keyset-paginated listing query, the summary counter statements and the change feed queries for the sync and async SQL repositories."""
+
+import re
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Delete,
+    Insert,
+    Select,
+    Update,
+    case,
+    column,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    update,
+)
+
+from todo_api.features.todos.domain import Todo, TodoQuery
+from todo_api.features.todos.models import (
+    TODO_COLUMNS,
+    TODOS_FTS_TABLE,
+    TodoModel,
+    TodoSummaryModel,
+    TodoTombstoneModel,
+)
+
+SORT_COLUMNS = {
+    "created_at": TodoModel.created_at,
+    "updated_at": TodoModel.updated_at,
+    "title": TodoModel.title,
+}
+
+SUMMARY_ID = 1
+
+_todos_fts = table(TODOS_FTS_TABLE, column("rowid"))
+_WORD = re.compile(r"\w+")
+
+
+def select_todos(
+    query: TodoQuery | None = None,
+    limit: int | None = None,
+    after: tuple[Any, int] | None = None,
+) -> Select:
+    """Return a SELECT of TODO_COLUMNS matching the query, in its order, after a keyset position.
+
+    ``after`` is the (sort value, id) pair of the last row already seen.
+    """
+    query = query or TodoQuery()
+    sort_column = SORT_COLUMNS[query.sort]
+    stmt = select(*TODO_COLUMNS)
+
+    if query.owner is not None:
+        stmt = stmt.where(TodoModel.owner == query.owner)
+    if query.completed is not None:
+        stmt = stmt.where(TodoModel.completed == query.completed)
+    if query.created_after is not None:
+        stmt = stmt.where(TodoModel.created_at > query.created_after)
+    if query.created_before is not None:
+        stmt = stmt.where(TodoModel.created_at < query.created_before)
+    if query.updated_after is not None:
+        stmt = stmt.where(TodoModel.updated_at > query.updated_after)
+    if query.updated_before is not None:
+        stmt = stmt.where(TodoModel.updated_at < query.updated_before)
+    if query.search is not None:
+        stmt = stmt.where(_matches(query.search))
+
+    key = tuple_(sort_column, TodoModel.id)
+    if after is not None:
+        position = tuple_(*after)
+        stmt = stmt.where(key < position if query.descending else key > position)
+    if query.descending:
+        stmt = stmt.order_by(sort_column.desc(), TodoModel.id.desc())
+    else:
+        stmt = stmt.order_by(sort_column, TodoModel.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _matches(search: str):
+    # Quote every word so user input can never be parsed as FTS5 query syntax
+    words = _WORD.findall(search)
+    if not words:
+        return false()
+    expression = " ".join(f'"{word}"' for word in words) + "*"
+    match = literal_column(TODOS_FTS_TABLE).op("MATCH")(expression)
+    return TodoModel.id.in_(select(_todos_fts.c.rowid).where(match))
+
+
+def update_todos(
+    ids: list[int], title: str, completed: bool, version: int, flipping: bool
+) -> Update:
+    """Return an UPDATE ... RETURNING writing title, completed and version to the given todos.
+
+    Only rows whose completion status the write flips, or only the others, are
+    matched, so callers can tell from the returned rows how the counts change.
+    """
+    flips = TodoModel.completed != completed
+    return (
+        update(TodoModel)
+        .where(TodoModel.id.in_(ids), flips if flipping else ~flips)
+        .values(title=title, completed=completed, version=version)
+        .returning(*TODO_COLUMNS)
+    )
+
+
+def toggle_todos(condition, version: int) -> Update:
+    """Return an UPDATE ... RETURNING flipping the completion status of the todos matching a condition.
+
+    The flip happens in the database, so concurrent toggles cannot lose an update.
+    """
+    return (
+        update(TodoModel)
+        .where(condition)
+        .values(completed=~TodoModel.completed, version=version)
+        .returning(*TODO_COLUMNS)
+    )
+
+
+def new_todo_rows(todos: list[Todo], version: int) -> list[dict[str, Any]]:
+    """Return the INSERT parameters of new todos, stamped with the version of the write."""
+    return [
+        {"title": t.title, "completed": t.completed, "owner": t.owner, "version": version}
+        for t in todos
+    ]
+
+
+def count_todos() -> Select:
+    """Return a SELECT of the (total, completed) todo counts, scanning the table."""
+    return select(func.count(), func.count().filter(TodoModel.completed))
+
+
+def select_stats() -> Select:
+    """Return a SELECT of the (total, completed) counts recorded in the summary row."""
+    return select(TodoSummaryModel.total, TodoSummaryModel.completed).where(
+        TodoSummaryModel.id == SUMMARY_ID
+    )
+
+
+def select_stats_drift() -> Select:
+    """Return a SELECT of the recorded counts followed by the counted ones, read together."""
+    return select(
+        TodoSummaryModel.total,
+        TodoSummaryModel.completed,
+        select(func.count()).select_from(TodoModel).scalar_subquery(),
+        select(func.count()).where(TodoModel.completed).scalar_subquery(),
+    ).where(TodoSummaryModel.id == SUMMARY_ID)
+
+
+def next_version() -> Update:
+    """Return an UPDATE ... RETURNING moving the summary version on by one.
+
+    Writers run it first, so the summary row stays locked until they commit and
+    versions are handed out in commit order.
+    """
+    return (
+        update(TodoSummaryModel)
+        .where(TodoSummaryModel.id == SUMMARY_ID)
+        .values(version=TodoSummaryModel.version + 1)
+        .returning(TodoSummaryModel.version)
+    )
+
+
+def release_version() -> Update:
+    """Return an UPDATE handing back the version taken by a write that changed nothing.
+
+    For writes sharing a transaction with others, where a rollback would undo theirs too.
+    """
+    return (
+        update(TodoSummaryModel)
+        .where(TodoSummaryModel.id == SUMMARY_ID)
+        .values(version=TodoSummaryModel.version - 1)
+    )
+
+
+def adjust_counts(total: int = 0, completed: int = 0) -> Update:
+    """Return an UPDATE adding the given deltas to the summary counts.
+
+    Adjusting by deltas rather than assigning keeps concurrent writes from
+    overwriting each other's counts.
+    """
+    return (
+        update(TodoSummaryModel)
+        .where(TodoSummaryModel.id == SUMMARY_ID)
+        .values(
+            total=TodoSummaryModel.total + total,
+            completed=TodoSummaryModel.completed + completed,
+        )
+    )
+
+
+def insert_summary(version: int) -> Insert:
+    """Return an INSERT creating the summary row with the given version and counts taken from the table."""
+    total, completed = count_todos().subquery().c
+    return insert(TodoSummaryModel).from_select(
+        ["id", "version", "total", "completed"],
+        select(literal(SUMMARY_ID), literal(version), total, completed),
+    )
+
+
+def select_changed_todos(after: tuple[int, int], limit: int) -> Select:
+    """Return a SELECT of (version, id, *TODO_COLUMNS) for todos written after a (version, id) position."""
+    return (
+        select(TodoModel.version, TodoModel.id, *TODO_COLUMNS)
+        .where(tuple_(TodoModel.version, TodoModel.id) > tuple_(*after))
+        .order_by(TodoModel.version, TodoModel.id)
+        .limit(limit)
+    )
+
+
+def select_tombstones(after: tuple[int, int], limit: int) -> Select:
+    """Return a SELECT of (version, todo_id) for deletions after a (version, id) position.
+
+    Tombstones of IDs that a later insert reused are skipped, as the todo exists again.
+    """
+    reused = select(TodoModel.id).where(TodoModel.id == TodoTombstoneModel.todo_id).exists()
+    return (
+        select(TodoTombstoneModel.version, TodoTombstoneModel.todo_id)
+        .where(
+            tuple_(TodoTombstoneModel.version, TodoTombstoneModel.todo_id) > tuple_(*after),
+            ~reused,
+        )
+        .order_by(TodoTombstoneModel.version, TodoTombstoneModel.todo_id)
+        .limit(limit)
+    )
+
+
+def select_pruned_version() -> Select:
+    """Return a SELECT of the highest version whose tombstones may have been pruned."""
+    return select(TodoSummaryModel.pruned_version).where(TodoSummaryModel.id == SUMMARY_ID)
+
+
+def select_prune_horizon(before: datetime) -> Select:
+    """Return a SELECT of the highest version among tombstones recorded before the given time."""
+    return select(func.max(TodoTombstoneModel.version)).where(
+        TodoTombstoneModel.deleted_at < before
+    )
+
+
+def prune_tombstones(horizon: int) -> Delete:
+    """Return a DELETE of the tombstones up to and including the given version."""
+    return delete(TodoTombstoneModel).where(TodoTombstoneModel.version <= horizon)
+
+
+def raise_pruned_version(horizon: int) -> Update:
+    """Return an UPDATE moving the summary's pruned version up to the given version."""
+    return (
+        update(TodoSummaryModel)
+        .where(TodoSummaryModel.id == SUMMARY_ID)
+        .values(
+            pruned_version=case(
+                (TodoSummaryModel.pruned_version < horizon, horizon),
+                else_=TodoSummaryModel.pruned_version,
+            )
+        )
+    )
@@ -0,0 +1,77 @@
+"""Todo CLI commands. Registers maintenance jobs under the ``flask todos`` command group."""
+
+from datetime import timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from todo_api.features.todos.adapters.sharded_repository import ShardedTodoRepository
+from todo_api.features.todos.dependencies import get_todo_service, get_todo_shards
+
+todos_cli = AppGroup("todos", help="Todo maintenance commands.")
+
+
+@todos_cli.command("reconcile-stats")
+def reconcile_stats():
+    """Check the maintained todo counts against COUNT(*) and correct any drift.
+
+    Exits with status 1 when a correction was needed, so schedulers can alert on it.
+    """
+    recorded, counted = get_todo_service().reconcile_stats()
+    if recorded == counted:
+        click.echo(f"Todo stats consistent: total={counted.total} completed={counted.completed}")
+        return
+    click.echo(
+        f"Todo stats corrected: total {recorded.total} -> {counted.total}, "
+        f"completed {recorded.completed} -> {counted.completed}",
+        err=True,
+    )
+    raise SystemExit(1)
+
+
+@todos_cli.command("prune-tombstones")
+@click.option("--days", type=float, help="Retention in days; defaults to TODOS_TOMBSTONE_RETENTION_DAYS.")
+def prune_tombstones(days):
+    """Drop change feed deletion records older than the retention period.
+
+    Clients whose change cursor predates the dropped records must reload the full listing.
+    """
+    if days is None:
+        days = current_app.config["TODOS_TOMBSTONE_RETENTION_DAYS"]
+    pruned = get_todo_service().prune_tombstones(timedelta(days=days))
+    click.echo(f"Pruned {pruned} todo tombstones older than {days:g} days")
+
+
+def _shards() -> ShardedTodoRepository:
+    shards = get_todo_shards()
+    if shards is None:
+        raise click.UsageError("TODOS_SHARDS is not configured")
+    return shards
+
+
+@todos_cli.command("create-shards")
+def create_shards():
+    """Create any missing tables and search indexes on every tenant shard."""
+    shards = _shards()
+    shards.create_all()
+    click.echo(f"Created tables on {len(shards.shards)} shards")
+
+
+@todos_cli.command("rebalance")
+@click.option("--tenant", help="Move only this tenant.")
+@click.option("--dry-run", is_flag=True, help="List the tenants to move without moving them.")
+def rebalance(tenant, dry_run):
+    """Move tenants whose todos are not on the shard the hash ring places them on.
+
+    Run after appending shards to TODOS_SHARDS. Moves are safe to interrupt and repeat.
+    """
+    shards = _shards()
+    if dry_run:
+        for owner, source, target in shards.misplaced(tenant):
+            click.echo(f"{owner}: {source.name} -> {target.name}")
+        return
+    moved = shards.rebalance(tenant)
+    for owner, count in moved.items():
+        click.echo(f"Moved {count} todos of {owner} to {shards.shard_for(owner).name}")
+    click.echo(f"Rebalanced {len(moved)} tenants")
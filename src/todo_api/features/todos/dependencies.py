@@ -0,0 +1,140 @@
+"""Todo dependency wiring. Builds the repository adapter stack, sharded, in memory, group committing or reading from replicas when configured, and event broker for an application and hands out services bound to them."""
+
+from flask import Flask, current_app
+
+from todo_api.core.cache import LRUCache
+from todo_api.core.events import EventBroker
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.caching_repository import CachingTodoRepository
+from todo_api.features.todos.adapters.group_commit_repository import (
+    GroupCommitTodoRepository,
+)
+from todo_api.features.todos.adapters.memory_repository import InMemoryTodoRepository
+from todo_api.features.todos.adapters.replicated_repository import (
+    ReplicatedTodoRepository,
+    connect_replica,
+)
+from todo_api.features.todos.adapters.sharded_repository import (
+    ShardedTodoRepository,
+    create_shard,
+)
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.repository import TodoRepository
+from todo_api.features.todos.service import TodoService
+from todo_api.infrastructure.read_your_writes import CookieStickiness
+
+EXTENSION_KEY = "todos.repository"
+EVENTS_KEY = "todos.events"
+SHARDS_KEY = "todos.shards"
+
+# Values of TODOS_STORE
+TODO_STORES = ("sql", "memory")
+
+
+def init_app(app: Flask) -> None:
+    """Build the todo repository and event broker for this application from its configuration."""
+    repository: TodoRepository
+    store = app.config["TODOS_STORE"]
+    if store not in TODO_STORES:
+        raise ValueError(f"TODOS_STORE must be one of {', '.join(TODO_STORES)}, got {store!r}")
+    shard_uris = parse_shards(app.config["TODOS_SHARDS"])
+    if store == "memory":
+        repository = InMemoryTodoRepository(
+            app.config["TODOS_MEMORY_SNAPSHOT_PATH"],
+            app.config["TODOS_MEMORY_SNAPSHOT_INTERVAL"],
+        )
+    elif shard_uris:
+        sharded = ShardedTodoRepository([
+            create_shard(
+                name,
+                position,
+                uri,
+                app.config.get("SQLALCHEMY_ENGINE_OPTIONS"),
+                app.config.get("SQLITE_PRAGMAS"),
+            )
+            for position, (name, uri) in enumerate(shard_uris.items())
+        ])
+        if app.config["DATABASE_CREATE_ALL"]:
+            sharded.create_all()
+        app.extensions[SHARDS_KEY] = repository = sharded
+    elif app.config["TODOS_GROUP_COMMIT"]:
+        with app.app_context():
+            engine = db.engine
+        repository = GroupCommitTodoRepository(
+            engine,
+            window=app.config["TODOS_GROUP_COMMIT_WINDOW_MS"] / 1000,
+            max_batch=app.config["TODOS_GROUP_COMMIT_MAX_BATCH"],
+            timeout=app.config["TODOS_GROUP_COMMIT_TIMEOUT_SECONDS"],
+        )
+    else:
+        repository = SqlTodoRepository()
+    replica_uris = parse_replicas(app.config["TODOS_READ_REPLICAS"])
+    if replica_uris and store == "sql" and not shard_uris:
+        stickiness = CookieStickiness(app.config["TODOS_READ_STICKY_SECONDS"])
+        stickiness.init_app(app)
+        repository = ReplicatedTodoRepository(
+            repository,
+            [
+                connect_replica(
+                    uri,
+                    app.config.get("SQLALCHEMY_ENGINE_OPTIONS"),
+                    app.config.get("SQLITE_PRAGMAS"),
+                )
+                for uri in replica_uris
+            ],
+            stickiness,
+        )
+    if app.config["TODOS_CACHE_ENABLED"]:
+        backend = LRUCache(
+            max_entries=app.config["TODOS_CACHE_MAX_ENTRIES"],
+            ttl=app.config["TODOS_CACHE_TTL"],
+        )
+        repository = CachingTodoRepository(repository, backend)
+    app.extensions[EXTENSION_KEY] = repository
+    app.extensions[EVENTS_KEY] = EventBroker(
+        app.config["TODOS_EVENTS_BACKEND"], max_queue=app.config["TODOS_EVENTS_QUEUE_SIZE"]
+    )
+
+
+def parse_shards(value: str | dict[str, str] | None) -> dict[str, str]:
+    """Return the shard database URLs by name from TODOS_SHARDS, a mapping or name=url pairs."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return dict(value)
+    shards = {}
+    for item in value.split(","):
+        name, _, uri = (part.strip() for part in item.partition("="))
+        if not name or not uri:
+            raise ValueError(f"TODOS_SHARDS entries must be name=url pairs, got {item!r}")
+        shards[name] = uri
+    return shards
+
+
+def parse_replicas(value: str | list[str] | None) -> list[str]:
+    """Return the replica database URLs from TODOS_READ_REPLICAS, a list or comma-separated URLs."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return list(value)
+    return [uri.strip() for uri in value.split(",") if uri.strip()]
+
+
+def get_todo_repository() -> TodoRepository:
+    """Return the todo repository wired for the current application."""
+    return current_app.extensions[EXTENSION_KEY]
+
+
+def get_todo_shards() -> ShardedTodoRepository | None:
+    """Return the sharded todo store of the current application, or None if it has one database."""
+    return current_app.extensions.get(SHARDS_KEY)
+
+
+def get_todo_events() -> EventBroker:
+    """Return the todo event broker of the current application."""
+    return current_app.extensions[EVENTS_KEY]
+
+
+def get_todo_service() -> TodoService:
+    """Return a TodoService bound to the current application's repository and event broker."""
+    return TodoService(repository=get_todo_repository(), events=get_todo_events())
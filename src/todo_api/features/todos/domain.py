@@ -3,13 +3,89 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+# Tenant owning todos created without one
+DEFAULT_OWNER = "default"
 
-@dataclass
+
+@dataclass(slots=True)
 class Todo:
-    """A todo item."""
+    """A todo item owned by a tenant. Slotted, as listings hold many thousands of these at once."""
 
     title: str
     completed: bool = False
     id: int | None = None
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    owner: str = DEFAULT_OWNER
+
+
+@dataclass(frozen=True, slots=True)
+class TodoStats:
+    """Counts of todos by completion status."""
+
+    total: int = 0
+    completed: int = 0
+
+    @property
+    def open(self) -> int:
+        return self.total - self.completed
+
+
+@dataclass(frozen=True, slots=True)
+class TodoChange:
+    """A change feed entry: the todo as last written, or its deletion when ``todo`` is None.
+
+    Entries are ordered by (version, todo_id); the version is that of the write.
+    """
+
+    version: int
+    todo_id: int
+    todo: Todo | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TodoBatch:
+    """The results of a batch write: one entry per todo created, toggled and deleted, in request order.
+
+    ``toggled`` holds None and ``deleted`` False where the todo did not exist.
+    """
+
+    created: list[Todo]
+    toggled: list[Todo | None]
+    deleted: list[bool]
+
+
+# Kinds of write announced to todo event subscribers
+TODO_EVENT_TYPES = ("created", "toggled", "deleted")
+
+
+@dataclass(frozen=True, slots=True)
+class TodoEvent:
+    """A todo write announced to subscribers once committed. ``todo`` is None for deletions."""
+
+    type: str
+    todo_id: int
+    todo: Todo | None = None
+
+
+# Fields a todo listing can be ordered by
+SORT_FIELDS = ("created_at", "updated_at", "title")
+
+
+@dataclass(frozen=True, slots=True)
+class TodoQuery:
+    """Filters and ordering for a todo listing. The defaults select every todo, oldest first.
+
+    Timestamp bounds are exclusive. ``search`` matches words in the title, the last
+    one as a prefix. ``owner`` restricts the listing to one tenant's todos.
+    """
+
+    owner: str | None = None
+    completed: bool | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+    search: str | None = None
+    sort: str = "created_at"
+    descending: bool = False
@@ -1,5 +1,25 @@
-"""GraphQL interface for the todos feature. Exports queries, mutations, and types for the todos feature slice."""
+"""GraphQL interface for the todos feature. Exports queries, mutations, subscriptions, and types for the todos feature slice."""
 
+from todo_api.features.todos.graphql.async_resolvers import (
+    async_mutation,
+    async_query,
+    async_subscription,
+    todo_event,
+    todo_event_type,
+)
+from todo_api.features.todos.graphql.loaders import prime_todo_loader
 from todo_api.features.todos.graphql.mutations import mutation
 from todo_api.features.todos.graphql.queries import query
 from todo_api.features.todos.graphql.types import type_defs
+
+__all__ = [
+    "async_mutation",
+    "async_query",
+    "async_subscription",
+    "mutation",
+    "prime_todo_loader",
+    "query",
+    "todo_event",
+    "todo_event_type",
+    "type_defs",
+]
@@ -0,0 +1,102 @@
+"""Todo GraphQL async resolvers. Defines query, mutation and subscription resolvers that await the async service and event broker, for the ASGI GraphQL executor."""
+
+from ariadne import EnumType, MutationType, ObjectType, QueryType, SubscriptionType
+
+from todo_api.features.todos.domain import TODO_EVENT_TYPES
+from todo_api.features.todos.graphql.filters import todo_query
+from todo_api.features.todos.service import AsyncTodoService
+
+SERVICE_KEY = "todo_service"
+EVENTS_KEY = "todo_events"
+
+async_query = QueryType()
+async_mutation = MutationType()
+async_subscription = SubscriptionType()
+todo_event = ObjectType("TodoEvent")
+todo_event_type = EnumType("TodoEventType", {t.upper(): t for t in TODO_EVENT_TYPES})
+
+
+def _get_service(info) -> AsyncTodoService:
+    return info.context[SERVICE_KEY]
+
+
+@async_query.field("todos")
+async def resolve_todos(_, info, **arguments):
+    return await _get_service(info).list_todos(todo_query(**arguments))
+
+
+@async_query.field("todosConnection")
+async def resolve_todos_connection(_, info, first=None, after=None, **arguments):
+    service = _get_service(info)
+    listing = todo_query(**arguments)
+    page = await service.list_todos_page(limit=first, after=after, query=listing)
+    return {
+        "edges": [
+            {"cursor": service.cursor_for(todo, listing), "node": todo}
+            for todo in page.items
+        ],
+        "page_info": {"has_next_page": page.has_next, "end_cursor": page.end_cursor},
+    }
+
+
+@async_query.field("todo")
+async def resolve_todo(_, info, id):
+    return await _get_service(info).get_todo(int(id))
+
+
+@async_query.field("todoStats")
+async def resolve_todo_stats(_, info):
+    return await _get_service(info).get_stats()
+
+
+@async_mutation.field("createTodo")
+async def resolve_create_todo(_, info, title, owner):
+    return await _get_service(info).create_todo(title, owner)
+
+
+@async_mutation.field("createTodos")
+async def resolve_create_todos(_, info, titles, owner):
+    return await _get_service(info).create_todos(titles, owner)
+
+
+@async_mutation.field("toggleTodo")
+async def resolve_toggle_todo(_, info, id):
+    return await _get_service(info).toggle_completed(int(id))
+
+
+@async_mutation.field("toggleTodos")
+async def resolve_toggle_todos(_, info, ids):
+    return await _get_service(info).toggle_todos([int(i) for i in ids])
+
+
+@async_mutation.field("deleteTodo")
+async def resolve_delete_todo(_, info, id):
+    await _get_service(info).delete_todo(int(id))
+    return {"success": True}
+
+
+@async_mutation.field("deleteTodos")
+async def resolve_delete_todos(_, info, ids):
+    results = await _get_service(info).delete_todos([int(i) for i in ids])
+    return [{"success": ok} for ok in results]
+
+
+@async_subscription.source("todoEvents")
+async def todo_events_source(_, info):
+    subscription = info.context[EVENTS_KEY].subscribe_async()
+    try:
+        # Ends once the subscription is closed, e.g. after falling behind
+        while (event := await subscription.get()) is not None:
+            yield event
+    finally:
+        subscription.close()
+
+
+@async_subscription.field("todoEvents")
+def resolve_todo_event(event, info):
+    return event
+
+
+@todo_event.field("id")
+def resolve_todo_event_id(event, info):
+    return event.todo_id
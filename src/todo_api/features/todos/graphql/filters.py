@@ -0,0 +1,38 @@
+"""Todo GraphQL listing arguments. Converts the filter, sort and order arguments of the todo list fields into a TodoQuery."""
+
+from datetime import datetime
+
+from todo_api.core.exceptions import ValidationError
+from todo_api.features.todos.domain import TodoQuery
+
+# TodoFilter input fields holding ISO 8601 timestamps, by TodoQuery attribute
+_TIMESTAMP_FIELDS = {
+    "created_after": "createdAfter",
+    "created_before": "createdBefore",
+    "updated_after": "updatedAfter",
+    "updated_before": "updatedBefore",
+}
+
+
+def todo_query(
+    filter: dict | None = None, sort: str = "CREATED_AT", descending: bool = False
+) -> TodoQuery:
+    """Build a TodoQuery from resolver arguments. Raises ValidationError for malformed timestamps."""
+    filter = filter or {}
+    timestamps = {}
+    for attribute, name in _TIMESTAMP_FIELDS.items():
+        value = filter.get(name)
+        if value is None:
+            continue
+        try:
+            timestamps[attribute] = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValidationError(f"{name} must be an ISO 8601 timestamp") from None
+    return TodoQuery(
+        owner=filter.get("owner"),
+        completed=filter.get("completed"),
+        search=filter.get("search"),
+        sort=sort.lower(),
+        descending=descending,
+        **timestamps,
+    )
@@ -0,0 +1,106 @@
+"""Todo GraphQL data loaders. Coalesces todo lookups made while executing GraphQL operations into a single repository call."""
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationType,
+    SelectionSetNode,
+    value_from_ast_untyped,
+)
+from graphql.utilities import get_operation_ast
+
+from todo_api.features.todos.dependencies import get_todo_service
+from todo_api.features.todos.domain import Todo
+from todo_api.features.todos.service import TodoService
+
+LOADER_KEY = "todo_loader"
+
+
+class TodoLoader:
+    """Per-request todo cache that fetches every queued ID the first time any is needed."""
+
+    def __init__(self, service: TodoService):
+        self._service = service
+        self._cache: dict[int, Todo | None] = {}
+        self._pending: set[int] = set()
+
+    def want(self, todo_ids: list[int]) -> None:
+        """Queue IDs to be fetched together with the next load."""
+        self._pending.update(i for i in todo_ids if i not in self._cache)
+
+    def load(self, todo_id: int) -> Todo | None:
+        """Return the todo with this ID, or None if it does not exist."""
+        if todo_id not in self._cache:
+            self._pending.add(todo_id)
+            self._flush()
+        return self._cache[todo_id]
+
+    def _flush(self) -> None:
+        todo_ids = sorted(self._pending)
+        self._pending.clear()
+        found = {todo.id: todo for todo in self._service.get_todos(todo_ids)}
+        for todo_id in todo_ids:
+            self._cache[todo_id] = found.get(todo_id)
+
+
+def get_todo_loader(context: dict) -> TodoLoader:
+    """Return the loader stored in the GraphQL context, creating it on first use."""
+    loader = context.get(LOADER_KEY)
+    if loader is None:
+        loader = context[LOADER_KEY] = TodoLoader(get_todo_service())
+    return loader
+
+
+def prime_todo_loader(
+    context: dict,
+    document: DocumentNode,
+    operation_name: str | None,
+    variables: dict | None,
+) -> None:
+    """Queue every todo(id:) lookup in a query operation on the context's loader."""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    todo_ids: list[int] = []
+    if not isinstance(variables, dict):
+        variables = {}
+    _collect_todo_ids(operation.selection_set, fragments, variables, todo_ids, set())
+    if todo_ids:
+        get_todo_loader(context).want(todo_ids)
+
+
+def _collect_todo_ids(
+    selection_set: SelectionSetNode,
+    fragments: dict[str, FragmentDefinitionNode],
+    variables: dict,
+    todo_ids: list[int],
+    visited: set[str],
+) -> None:
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if selection.name.value != "todo":
+                continue
+            for argument in selection.arguments:
+                if argument.name.value == "id":
+                    value = value_from_ast_untyped(argument.value, variables)
+                    try:
+                        todo_ids.append(int(value))
+                    except (TypeError, ValueError):
+                        pass  # Invalid IDs surface as errors when the field resolves
+        elif isinstance(selection, InlineFragmentNode):
+            _collect_todo_ids(selection.selection_set, fragments, variables, todo_ids, visited)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in fragments and name not in visited:
+                visited.add(name)
+                _collect_todo_ids(
+                    fragments[name].selection_set, fragments, variables, todo_ids, visited
+                )
@@ -2,20 +2,26 @@
 
 from ariadne import MutationType
 
-from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.dependencies import get_todo_service
 from todo_api.features.todos.service import TodoService
 
 mutation = MutationType()
 
 
 def _get_service() -> TodoService:
-    return TodoService(repository=SqlTodoRepository())
+    return get_todo_service()
 
 
 @mutation.field("createTodo")
-def resolve_create_todo(*_, title):
+def resolve_create_todo(*_, title, owner):
     service = _get_service()
-    return service.create_todo(title)
+    return service.create_todo(title, owner)
+
+
+@mutation.field("createTodos")
+def resolve_create_todos(*_, titles, owner):
+    service = _get_service()
+    return service.create_todos(titles, owner)
 
 
 @mutation.field("toggleTodo")
@@ -24,8 +30,20 @@ def resolve_toggle_todo(*_, id):
     return service.toggle_completed(int(id))
 
 
+@mutation.field("toggleTodos")
+def resolve_toggle_todos(*_, ids):
+    service = _get_service()
+    return service.toggle_todos([int(i) for i in ids])
+
+
 @mutation.field("deleteTodo")
 def resolve_delete_todo(*_, id):
     service = _get_service()
     service.delete_todo(int(id))
     return {"success": True}
+
+
+@mutation.field("deleteTodos")
+def resolve_delete_todos(*_, ids):
+    service = _get_service()
+    return [{"success": ok} for ok in service.delete_todos([int(i) for i in ids])]
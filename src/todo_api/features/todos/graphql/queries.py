@@ -2,23 +2,48 @@
 
 from ariadne import QueryType
 
-from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.core.exceptions import NotFoundError
+from todo_api.features.todos.dependencies import get_todo_service
+from todo_api.features.todos.graphql.filters import todo_query
+from todo_api.features.todos.graphql.loaders import get_todo_loader
 from todo_api.features.todos.service import TodoService
 
 query = QueryType()
 
 
 def _get_service() -> TodoService:
-    return TodoService(repository=SqlTodoRepository())
+    return get_todo_service()
 
 
 @query.field("todos")
-def resolve_todos(*_):
+def resolve_todos(*_, **arguments):
     service = _get_service()
-    return service.list_todos()
+    return service.list_todos(todo_query(**arguments))
 
 
-@query.field("todo")
-def resolve_todo(*_, id):
+@query.field("todosConnection")
+def resolve_todos_connection(*_, first=None, after=None, **arguments):
     service = _get_service()
-    return service.get_todo(int(id))
+    listing = todo_query(**arguments)
+    page = service.list_todos_page(limit=first, after=after, query=listing)
+    return {
+        "edges": [
+            {"cursor": service.cursor_for(todo, listing), "node": todo}
+            for todo in page.items
+        ],
+        "page_info": {"has_next_page": page.has_next, "end_cursor": page.end_cursor},
+    }
+
+
+@query.field("todo")
+def resolve_todo(_, info, id):
+    todo_id = int(id)
+    todo = get_todo_loader(info.context).load(todo_id)
+    if todo is None:
+        raise NotFoundError("Todo", todo_id)
+    return todo
+
+
+@query.field("todoStats")
+def resolve_todo_stats(*_):
+    return _get_service().get_stats()
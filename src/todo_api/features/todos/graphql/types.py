@@ -7,6 +7,59 @@ type_defs = """
         completed: Boolean!
         createdAt: String!
         updatedAt: String!
+        owner: String!
+    }
+
+    type TodoEdge {
+        cursor: String!
+        node: Todo!
+    }
+
+    type PageInfo {
+        hasNextPage: Boolean!
+        endCursor: String
+    }
+
+    type TodoConnection {
+        edges: [TodoEdge!]!
+        pageInfo: PageInfo!
+    }
+
+    type TodoStats {
+        total: Int!
+        completed: Int!
+        open: Int!
+    }
+
+    enum TodoSortField {
+        CREATED_AT
+        UPDATED_AT
+        TITLE
+    }
+
+    "Restricts a todo listing. Timestamps are ISO 8601 and exclusive bounds."
+    input TodoFilter {
+        owner: String
+        completed: Boolean
+        createdAfter: String
+        createdBefore: String
+        updatedAfter: String
+        updatedBefore: String
+        "Words to find in the title; the last word also matches as a prefix."
+        search: String
+    }
+
+    enum TodoEventType {
+        CREATED
+        TOGGLED
+        DELETED
+    }
+
+    "A todo write. todo is null for deletions."
+    type TodoEvent {
+        type: TodoEventType!
+        id: ID!
+        todo: Todo
     }
 
     type DeleteResult {
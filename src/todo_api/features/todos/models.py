@@ -1,27 +1,131 @@
 """SQLAlchemy model for the Todo entity. Maps the domain Todo to a database table."""
 
-from datetime import datetime, timezone
+from dataclasses import fields
+from datetime import UTC, datetime
+
+from sqlalchemy import event
 
 from todo_api.extensions import db
+from todo_api.features.todos.domain import DEFAULT_OWNER, Todo
 
 
 class TodoModel(db.Model):
     """SQLAlchemy model for the todos table."""
 
     __tablename__ = "todos"
+    __table_args__ = (
+        # Serves the default listing order and keyset pagination
+        db.Index("ix_todos_created_at_id", "created_at", "id"),
+        # Serves listings filtered by completion status in creation order
+        db.Index("ix_todos_completed_created_at", "completed", "created_at"),
+        # Serve the alternative listing orders and their keyset pagination
+        db.Index("ix_todos_updated_at_id", "updated_at", "id"),
+        db.Index("ix_todos_title_id", "title", "id"),
+        # Serves the change feed, which reads rows in write order
+        db.Index("ix_todos_version_id", "version", "id"),
+        # Serves a tenant's listing in creation order, and moving a tenant between shards
+        db.Index("ix_todos_owner_created_at_id", "owner", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     completed = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(
-        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        db.DateTime, default=lambda: datetime.now(UTC), nullable=False
     )
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
         nullable=False,
     )
+    # Summary version of the last write to the row; rows older than the change feed keep 0
+    version = db.Column(db.Integer, default=0, nullable=False)
+    owner = db.Column(db.String(64), default=DEFAULT_OWNER, nullable=False)
 
     def __repr__(self):
         return f"<TodoModel id={self.id} title={self.title!r}>"
+
+
+# The todos columns in Todo's field order, so a selected row unpacks straight into Todo(*row)
+TODO_COLUMNS = tuple(TodoModel.__table__.c[f.name] for f in fields(Todo))
+
+
+class TodoSummaryModel(db.Model):
+    """Single-row table holding a version counter and todo counts, updated by every todo write."""
+
+    __tablename__ = "todo_summary"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    total = db.Column(db.Integer, default=0, nullable=False)
+    completed = db.Column(db.Integer, default=0, nullable=False)
+    # Highest version whose tombstones may have been pruned from the change feed
+    pruned_version = db.Column(db.Integer, default=0, nullable=False)
+    # Highest ID handed out from a shard's ID range, kept so IDs of todos moved away are not reused
+    last_id = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<TodoSummaryModel version={self.version}>"
+
+
+class TodoTombstoneModel(db.Model):
+    """Record of a deleted todo, kept so the change feed can report the deletion."""
+
+    __tablename__ = "todo_tombstones"
+
+    # Keyed in feed order; an ID can be deleted again after SQLite reuses it
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    todo_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    deleted_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(UTC), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<TodoTombstoneModel todo_id={self.todo_id} version={self.version}>"
+
+
+# External-content FTS5 index over todo titles. Triggers keep it in step with the todos
+# table; toggling completion leaves it untouched.
+TODOS_FTS_TABLE = "todos_fts"
+_TODOS_FTS_DDL = (
+    f"""CREATE VIRTUAL TABLE {TODOS_FTS_TABLE} USING fts5(
+        title, content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO {TODOS_FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END""",
+    f"""CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO {TODOS_FTS_TABLE}({TODOS_FTS_TABLE}, rowid, title)
+        VALUES ('delete', old.id, old.title);
+    END""",
+    f"""CREATE TRIGGER todos_fts_update AFTER UPDATE OF title ON todos BEGIN
+        INSERT INTO {TODOS_FTS_TABLE}({TODOS_FTS_TABLE}, rowid, title)
+        VALUES ('delete', old.id, old.title);
+        INSERT INTO {TODOS_FTS_TABLE}(rowid, title) VALUES (new.id, new.title);
+    END""",
+)
+
+
+@event.listens_for(TodoModel.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    """Create the title search index on SQLite, backfilling it when todos already exist."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TODOS_FTS_TABLE,)
+    ).first()
+    if exists:
+        return
+    for statement in _TODOS_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(
+        f"INSERT INTO {TODOS_FTS_TABLE}({TODOS_FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+@event.listens_for(TodoModel.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {TODOS_FTS_TABLE}")
@@ -1,19 +1,128 @@
 """Todo repository port. Defines the Protocol (interface) for todo persistence operations, independent of any specific storage implementation."""
 
-from typing import Protocol
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
+from typing import Any, Protocol
 
-from todo_api.features.todos.domain import Todo
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoQuery,
+    TodoStats,
+)
 
 
 class TodoRepository(Protocol):
-    """Port for todo persistence operations."""
+    """Port for todo persistence operations.
 
-    def get_all(self) -> list[Todo]: ...
+    ``toggle`` and ``delete`` given ``if_updated_at`` only write a todo last
+    written at that time, matching nothing otherwise. ``toggle_many`` toggles
+    repeated IDs once. ``apply_batch`` creates, toggles and deletes in one
+    transaction. Stores with ``has_change_feed`` false raise UnsupportedError from
+    ``get_changes``.
+    """
+
+    has_change_feed: bool
+
+    def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]: ...
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> Iterator[Todo]: ...
+
+    def get_version(self) -> int: ...
+
+    def get_stats(self) -> TodoStats: ...
+
+    def count_stats(self) -> TodoStats: ...
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]: ...
+
+    def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]: ...
+
+    def get_pruned_version(self) -> int: ...
+
+    def prune_tombstones(self, before: datetime) -> int: ...
 
     def get_by_id(self, todo_id: int) -> Todo | None: ...
 
+    def get_many(self, todo_ids: list[int]) -> list[Todo]: ...
+
     def create(self, todo: Todo) -> Todo: ...
 
+    def create_many(self, todos: list[Todo]) -> list[Todo]: ...
+
     def update(self, todo: Todo) -> Todo | None: ...
 
-    def delete(self, todo_id: int) -> bool: ...
+    def update_many(self, todos: list[Todo]) -> list[Todo | None]: ...
+
+    def toggle(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo | None: ...
+
+    def delete(self, todo_id: int, if_updated_at: datetime | None = None) -> bool: ...
+
+    def delete_many(self, todo_ids: list[int]) -> list[bool]: ...
+
+    def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]: ...
+
+    def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch: ...
+
+
+class AsyncTodoRepository(Protocol):
+    """Port for todo persistence operations on an asyncio event loop."""
+
+    async def get_all(
+        self,
+        limit: int | None = None,
+        after: tuple[Any, int] | None = None,
+        query: TodoQuery | None = None,
+    ) -> list[Todo]: ...
+
+    def iter_all(
+        self, batch_size: int = 1000, query: TodoQuery | None = None
+    ) -> AsyncIterator[Todo]: ...
+
+    async def get_version(self) -> int: ...
+
+    async def get_stats(self) -> TodoStats: ...
+
+    async def count_stats(self) -> TodoStats: ...
+
+    async def reconcile_stats(self) -> tuple[TodoStats, TodoStats]: ...
+
+    async def get_changes(self, after: tuple[int, int], limit: int) -> list[TodoChange]: ...
+
+    async def get_pruned_version(self) -> int: ...
+
+    async def prune_tombstones(self, before: datetime) -> int: ...
+
+    async def get_by_id(self, todo_id: int) -> Todo | None: ...
+
+    async def get_many(self, todo_ids: list[int]) -> list[Todo]: ...
+
+    async def create(self, todo: Todo) -> Todo: ...
+
+    async def create_many(self, todos: list[Todo]) -> list[Todo]: ...
+
+    async def update(self, todo: Todo) -> Todo | None: ...
+
+    async def update_many(self, todos: list[Todo]) -> list[Todo | None]: ...
+
+    async def toggle(self, todo_id: int) -> Todo | None: ...
+
+    async def delete(self, todo_id: int) -> bool: ...
+
+    async def delete_many(self, todo_ids: list[int]) -> list[bool]: ...
+
+    async def toggle_many(self, todo_ids: list[int]) -> list[Todo | None]: ...
+
+    async def apply_batch(
+        self, create: list[Todo], toggle: list[int], delete: list[int]
+    ) -> TodoBatch: ...
@@ -0,0 +1,201 @@
+"""Todo ASGI route definitions. Serves the todo REST endpoints through Starlette on top of the async service."""
+
+import json
+from urllib.parse import urlencode
+
+from marshmallow import ValidationError as SchemaValidationError
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from todo_api.core.exceptions import ExpiredCursorError, NotFoundError, ValidationError
+from todo_api.features.todos.domain import DEFAULT_OWNER
+from todo_api.features.todos.rest.schemas import (
+    batch_todo_schema,
+    create_todo_schema,
+    todo_list_query_schema,
+    todo_stats_schema,
+)
+from todo_api.features.todos.rest.serializers import (
+    CHANGES_CURSOR_HEADER,
+    dump_changes,
+    todo_serializer,
+)
+from todo_api.features.todos.rest.sse import (
+    SSE_HEADERS,
+    SSE_MIMETYPE,
+    async_event_stream,
+)
+from todo_api.features.todos.service import AsyncTodoService
+
+
+def _service(request: Request) -> AsyncTodoService:
+    return request.app.state.todo_service
+
+
+async def _json_body(request: Request):
+    try:
+        return await request.json()
+    except json.JSONDecodeError:
+        return None
+
+
+async def list_todos(request: Request) -> Response:
+    """List todos. Paginates by cursor when 'limit' or 'after' is given.
+
+    Other query parameters filter, search and sort the listing; see TodoListQuerySchema.
+    """
+    service = _service(request)
+    params = request.query_params
+    try:
+        todo_query = todo_list_query_schema.load(params)
+    except SchemaValidationError as error:
+        return JSONResponse({"error": error.messages}, 400)
+    # Read before the data so the feed from this cursor covers anything the listing missed
+    headers = {CHANGES_CURSOR_HEADER: service.changes_cursor(await service.get_version())}
+    if "limit" not in params and "after" not in params:
+        todos = await service.list_todos(todo_query)
+        return JSONResponse(todo_serializer.dump_many(todos), headers=headers)
+
+    try:
+        limit = int(params["limit"]) if "limit" in params else None
+    except ValueError:
+        raise ValidationError("Limit must be an integer") from None
+    page = await service.list_todos_page(
+        limit=limit, after=params.get("after"), query=todo_query
+    )
+    if page.has_next:
+        query = urlencode({**params, "limit": len(page.items), "after": page.end_cursor})
+        headers["Link"] = f'<{request.url.path}?{query}>; rel="next"'
+    return JSONResponse(todo_serializer.dump_many(page.items), headers=headers)
+
+
+async def list_changes(request: Request) -> Response:
+    """List the todos written and deleted since a change cursor, for incremental sync."""
+    since = request.query_params.get("since")
+    if not since:
+        return JSONResponse({"error": "Query parameter 'since' is required"}, 400)
+    try:
+        limit = int(request.query_params["limit"]) if "limit" in request.query_params else None
+    except ValueError:
+        raise ValidationError("Limit must be an integer") from None
+    page = await _service(request).list_changes(since, limit=limit)
+    return JSONResponse(dump_changes(page))
+
+
+def _dumps(obj) -> str:
+    # Same encoding as JSONResponse bodies
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+async def todo_events(request: Request) -> Response:
+    """Stream todo creations, toggles and deletions as Server-Sent Events."""
+    subscription = request.app.state.todo_events.subscribe_async()
+    stream = async_event_stream(subscription, request.app.state.todo_events_keepalive, _dumps)
+    return StreamingResponse(stream, media_type=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+
+async def todo_stats(request: Request) -> Response:
+    """Get the total, completed and open todo counts."""
+    stats = await _service(request).get_stats()
+    return JSONResponse(todo_stats_schema.dump(stats))
+
+
+async def get_todo(request: Request) -> Response:
+    """Get a single todo by ID."""
+    todo = await _service(request).get_todo(request.path_params["todo_id"])
+    return JSONResponse(todo_serializer.dump(todo))
+
+
+async def create_todo(request: Request) -> Response:
+    """Create a new todo."""
+    data = await _json_body(request)
+    if not isinstance(data, dict) or "title" not in data:
+        return JSONResponse(
+            {"error": "Request must include a JSON body with a 'title' field"}, 400
+        )
+    errors = create_todo_schema.validate(data)
+    if errors:
+        return JSONResponse({"error": errors}, 400)
+
+    todo = await _service(request).create_todo(data["title"], data.get("owner", DEFAULT_OWNER))
+    return JSONResponse(todo_serializer.dump(todo), 201)
+
+
+async def batch_todos(request: Request) -> Response:
+    """Create, toggle and delete many todos in one request and transaction, with a result per item."""
+    data = await _json_body(request)
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "Request must include a JSON object body"}, 400)
+    errors = batch_todo_schema.validate(data)
+    if errors:
+        return JSONResponse({"error": errors}, 400)
+
+    service = _service(request)
+    titles = [item["title"] for item in data.get("create", [])]
+    owner = data.get("owner", DEFAULT_OWNER)
+    toggle_ids = data.get("toggle", [])
+    delete_ids = data.get("delete", [])
+
+    batch = await service.write_batch(titles, toggle_ids, delete_ids, owner)
+
+    return JSONResponse({
+        "created": todo_serializer.dump_many(batch.created),
+        "toggled": [
+            {"id": todo_id, "status": 200, "todo": todo_serializer.dump(todo)}
+            if todo is not None
+            else _missing_item(todo_id)
+            for todo_id, todo in zip(toggle_ids, batch.toggled)
+        ],
+        "deleted": [
+            {"id": todo_id, "status": 204} if ok else _missing_item(todo_id)
+            for todo_id, ok in zip(delete_ids, batch.deleted)
+        ],
+    })
+
+
+def _missing_item(todo_id: int) -> dict:
+    return {"id": todo_id, "status": 404, "error": str(NotFoundError("Todo", todo_id))}
+
+
+async def toggle_todo(request: Request) -> Response:
+    """Toggle the completed status of a todo."""
+    todo = await _service(request).toggle_completed(request.path_params["todo_id"])
+    return JSONResponse(todo_serializer.dump(todo))
+
+
+async def delete_todo(request: Request) -> Response:
+    """Delete a todo."""
+    await _service(request).delete_todo(request.path_params["todo_id"])
+    return Response(status_code=204)
+
+
+async def handle_not_found(request: Request, error: NotFoundError) -> Response:
+    return JSONResponse({"error": str(error)}, 404)
+
+
+async def handle_validation(request: Request, error: ValidationError) -> Response:
+    return JSONResponse({"error": str(error)}, 400)
+
+
+async def handle_expired_cursor(request: Request, error: ExpiredCursorError) -> Response:
+    return JSONResponse({"error": str(error)}, 410)
+
+
+routes = [
+    Route("/api/todos", list_todos, methods=["GET"]),
+    Route("/api/todos", create_todo, methods=["POST"]),
+    Route("/api/todos/batch", batch_todos, methods=["POST"]),
+    Route("/api/todos/changes", list_changes, methods=["GET"]),
+    Route("/api/todos/events", todo_events, methods=["GET"]),
+    Route("/api/todos/stats", todo_stats, methods=["GET"]),
+    Route("/api/todos/{todo_id:int}", get_todo, methods=["GET"]),
+    Route("/api/todos/{todo_id:int}", toggle_todo, methods=["PATCH"]),
+    Route("/api/todos/{todo_id:int}", delete_todo, methods=["DELETE"]),
+]
+
+exception_handlers = {
+    NotFoundError: handle_not_found,
+    ValidationError: handle_validation,
+    ExpiredCursorError: handle_expired_cursor,
+}
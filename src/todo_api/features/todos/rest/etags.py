@@ -0,0 +1,41 @@
+"""Todo REST entity tags. Computes strong ETags for todo resources and listings without serializing response bodies."""
+
+import hashlib
+from datetime import UTC
+
+from flask import current_app, request
+
+from todo_api.features.todos.domain import Todo
+
+
+def todo_etag(todo: Todo) -> str:
+    """Return the ETag for a single todo, derived from its ID and last write."""
+    updated_at = todo.updated_at
+    if updated_at.tzinfo is not None:
+        # Stored timestamps come back naive UTC; normalize freshly written ones to match
+        updated_at = updated_at.astimezone(UTC).replace(tzinfo=None)
+    raw = f"{todo.id}|{todo.completed}|{todo.title}|{updated_at.isoformat()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def list_etag(version: int, representation: str) -> str:
+    """Return the ETag for a listing at the given table version, query and media type."""
+    raw = f"{version}|{representation}|{request.query_string.decode()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def is_fresh(etag: str) -> bool:
+    """Return True if the client's If-None-Match already names this ETag."""
+    return request.if_none_match.contains(etag)
+
+
+def precondition_failed(etag: str) -> bool:
+    """Return True if the request carries an If-Match header that this ETag fails."""
+    return bool(request.if_match) and not request.if_match.contains(etag)
+
+
+def not_modified(etag: str):
+    """Build an empty 304 response carrying the ETag."""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
@@ -1,21 +1,50 @@
 """Todo REST route definitions. Defines Flask routes for CRUD operations on todos, handling HTTP request/response concerns."""
 
-from flask import Blueprint, request
+from datetime import datetime
+from functools import partial
 
-from todo_api.core.exceptions import NotFoundError, ValidationError
-from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from flask import Blueprint, current_app, request, stream_with_context, url_for
+from marshmallow import ValidationError as SchemaValidationError
+from werkzeug.http import quote_etag
+
+from todo_api.core.exceptions import (
+    ExpiredCursorError,
+    NotFoundError,
+    PreconditionFailedError,
+    UnsupportedError,
+    ValidationError,
+)
+from todo_api.features.todos.dependencies import get_todo_events, get_todo_service
+from todo_api.features.todos.domain import DEFAULT_OWNER
+from todo_api.features.todos.rest.etags import (
+    is_fresh,
+    list_etag,
+    not_modified,
+    precondition_failed,
+    todo_etag,
+)
 from todo_api.features.todos.rest.schemas import (
+    batch_todo_schema,
     create_todo_schema,
-    todo_schema,
-    todos_schema,
+    todo_list_query_schema,
+    todo_stats_schema,
 )
+from todo_api.features.todos.rest.serializers import (
+    CHANGES_CURSOR_HEADER,
+    dump_changes,
+    todo_serializer,
+)
+from todo_api.features.todos.rest.sse import SSE_HEADERS, SSE_MIMETYPE, event_stream
 from todo_api.features.todos.service import TodoService
+from todo_api.infrastructure.middleware import timed_serialization
 
 bp = Blueprint("todos", __name__, url_prefix="/api/todos")
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+
 
 def _get_service() -> TodoService:
-    return TodoService(repository=SqlTodoRepository())
+    return get_todo_service()
 
 
 @bp.errorhandler(NotFoundError)
@@ -28,12 +57,133 @@ def handle_validation(error):
     return {"error": str(error)}, 400
 
 
+@bp.errorhandler(PreconditionFailedError)
+def handle_precondition_failed(error):
+    return {"error": str(error)}, 412
+
+
+@bp.errorhandler(ExpiredCursorError)
+def handle_expired_cursor(error):
+    return {"error": str(error)}, 410
+
+
+@bp.errorhandler(UnsupportedError)
+def handle_unsupported(error):
+    return {"error": str(error)}, 501
+
+
+def _wants_ndjson() -> bool:
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def _ndjson_lines(todos):
+    # Serialize one row at a time so memory stays flat regardless of table size
+    for todo in todos:
+        line = current_app.json.dumps(todo_serializer.dump(todo), separators=(",", ":"))
+        yield line + "\n"
+
+
+def _parse_limit(value: str | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError("Limit must be an integer") from None
+
+
 @bp.route("", methods=["GET"])
 def list_todos():
-    """List all todos."""
+    """List todos. Paginates by cursor when 'limit' or 'after' is given.
+
+    Other query parameters filter, search and sort the listing; see
+    TodoListQuerySchema. Clients sending ``Accept: application/x-ndjson`` receive the full listing as a
+    stream of newline-delimited JSON objects instead.
+    """
+    try:
+        query = todo_list_query_schema.load(request.args)
+    except SchemaValidationError as error:
+        return {"error": error.messages}, 400
+
     service = _get_service()
-    todos = service.list_todos()
-    return todos_schema.dump(todos), 200
+    ndjson = _wants_ndjson()
+    # Read the version before the data so a concurrent write can only make the ETag stale, never ahead
+    version = service.get_version()
+    etag = list_etag(version, NDJSON_MIMETYPE if ndjson else "json")
+    if is_fresh(etag):
+        return not_modified(etag)
+    headers = {"ETag": quote_etag(etag)}
+    # For the same reason, changes from this cursor on cover every write the listing missed
+    changes_cursor = service.changes_cursor(version)
+    if changes_cursor is not None:
+        headers[CHANGES_CURSOR_HEADER] = changes_cursor
+
+    if ndjson:
+        lines = _ndjson_lines(service.stream_todos(query))
+        return current_app.response_class(
+            stream_with_context(lines), mimetype=NDJSON_MIMETYPE, headers=headers
+        )
+    if "limit" not in request.args and "after" not in request.args:
+        todos = service.list_todos(query)
+        with timed_serialization():
+            body = current_app.json.response(todo_serializer.dump_many(todos))
+        return body, 200, headers
+
+    page = service.list_todos_page(
+        limit=_parse_limit(request.args.get("limit")),
+        after=request.args.get("after"),
+        query=query,
+    )
+    if page.has_next:
+        next_url = url_for(
+            "todos.list_todos",
+            **{**request.args.to_dict(), "limit": len(page.items), "after": page.end_cursor},
+        )
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    with timed_serialization():
+        body = current_app.json.response(todo_serializer.dump_many(page.items))
+    return body, 200, headers
+
+
+@bp.route("/changes", methods=["GET"])
+def list_changes():
+    """List the todos written and deleted since a change cursor, for incremental sync.
+
+    Clients take their first cursor from the X-Changes-Cursor header of a listing and
+    continue from the cursor of each response.
+    """
+    since = request.args.get("since")
+    if not since:
+        return {"error": "Query parameter 'since' is required"}, 400
+    page = _get_service().list_changes(since, limit=_parse_limit(request.args.get("limit")))
+    with timed_serialization():
+        body = current_app.json.response(dump_changes(page))
+    return body
+
+
+@bp.route("/events", methods=["GET"])
+def todo_events():
+    """Stream todo creations, toggles and deletions as Server-Sent Events.
+
+    A client that falls behind receives an ``overflow`` event and the stream ends;
+    it should reconnect and catch up from the change feed. Each open stream holds a
+    worker thread, so large numbers of listeners belong on the ASGI app.
+    """
+    # Subscribe before the response starts so no write after this request is missed
+    subscription = get_todo_events().subscribe()
+    dumps = partial(current_app.json.dumps, separators=(",", ":"))
+    stream = event_stream(subscription, current_app.config["TODOS_EVENTS_KEEPALIVE"], dumps)
+    return current_app.response_class(
+        stream_with_context(stream), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS
+    )
+
+
+@bp.route("/stats", methods=["GET"])
+def todo_stats():
+    """Get the total, completed and open todo counts."""
+    stats = _get_service().get_stats()
+    return todo_stats_schema.dump(stats)
 
 
 @bp.route("/<int:todo_id>", methods=["GET"])
@@ -41,7 +191,12 @@ def get_todo(todo_id):
     """Get a single todo by ID."""
     service = _get_service()
     todo = service.get_todo(todo_id)
-    return todo_schema.dump(todo), 200
+    etag = todo_etag(todo)
+    if is_fresh(etag):
+        return not_modified(etag)
+    with timed_serialization():
+        body = current_app.json.response(todo_serializer.dump(todo))
+    return body, 200, {"ETag": quote_etag(etag)}
 
 
 @bp.route("", methods=["POST"])
@@ -56,21 +211,77 @@ def create_todo():
         return {"error": errors}, 400
 
     service = _get_service()
-    todo = service.create_todo(data["title"])
-    return todo_schema.dump(todo), 201
+    todo = service.create_todo(data["title"], data.get("owner", DEFAULT_OWNER))
+    with timed_serialization():
+        body = current_app.json.response(todo_serializer.dump(todo))
+    return body, 201, {"ETag": quote_etag(todo_etag(todo))}
+
+
+@bp.route("/batch", methods=["POST"])
+def batch_todos():
+    """Create, toggle and delete many todos in one request and transaction, with a result per item."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return {"error": "Request must include a JSON object body"}, 400
+
+    errors = batch_todo_schema.validate(data)
+    if errors:
+        return {"error": errors}, 400
+
+    service = _get_service()
+    titles = [item["title"] for item in data.get("create", [])]
+    owner = data.get("owner", DEFAULT_OWNER)
+    toggle_ids = data.get("toggle", [])
+    delete_ids = data.get("delete", [])
+
+    batch = service.write_batch(titles, toggle_ids, delete_ids, owner)
+
+    with timed_serialization():
+        result = {
+            "created": todo_serializer.dump_many(batch.created),
+            "toggled": [
+                {"id": todo_id, "status": 200, "todo": todo_serializer.dump(todo)}
+                if todo is not None
+                else _missing_item(todo_id)
+                for todo_id, todo in zip(toggle_ids, batch.toggled)
+            ],
+            "deleted": [
+                {"id": todo_id, "status": 204} if ok else _missing_item(todo_id)
+                for todo_id, ok in zip(delete_ids, batch.deleted)
+            ],
+        }
+        body = current_app.json.response(result)
+    return body, 200
+
+
+def _missing_item(todo_id: int) -> dict:
+    return {"id": todo_id, "status": 404, "error": str(NotFoundError("Todo", todo_id))}
 
 
 @bp.route("/<int:todo_id>", methods=["PATCH"])
 def toggle_todo(todo_id):
     """Toggle the completed status of a todo."""
     service = _get_service()
-    todo = service.toggle_completed(todo_id)
-    return todo_schema.dump(todo), 200
+    todo = service.toggle_completed(todo_id, _if_match(service, todo_id))
+    with timed_serialization():
+        body = current_app.json.response(todo_serializer.dump(todo))
+    return body, 200, {"ETag": quote_etag(todo_etag(todo))}
 
 
 @bp.route("/<int:todo_id>", methods=["DELETE"])
 def delete_todo(todo_id):
     """Delete a todo."""
     service = _get_service()
-    service.delete_todo(todo_id)
+    service.delete_todo(todo_id, _if_match(service, todo_id))
     return "", 204
+
+
+def _if_match(service: TodoService, todo_id: int) -> datetime | None:
+    # Returns when the todo matching If-Match was last written; the write then only
+    # applies if it still was, so one landing after this read is caught as well
+    if not request.if_match:
+        return None
+    todo = service.get_todo(todo_id)
+    if precondition_failed(todo_etag(todo)):
+        raise PreconditionFailedError("Todo", todo_id)
+    return todo.updated_at
@@ -1,8 +1,14 @@
 """Todo REST serialization schemas. Defines Marshmallow schemas for request validation and response serialization."""
 
-from marshmallow import fields
+from marshmallow import EXCLUDE, fields, post_load, validate
 
 from todo_api.extensions import ma
+from todo_api.features.todos.domain import SORT_FIELDS, TodoQuery
+from todo_api.features.todos.service import (
+    MAX_BATCH_SIZE,
+    MAX_OWNER_LENGTH,
+    MAX_SEARCH_LENGTH,
+)
 
 
 class TodoSchema(ma.Schema):
@@ -13,14 +19,83 @@ class TodoSchema(ma.Schema):
     completed = fields.Boolean(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
+    owner = fields.String(dump_only=True)
+
+
+class TodoStatsSchema(ma.Schema):
+    """Schema for serializing todo count responses."""
+
+    total = fields.Integer(dump_only=True)
+    completed = fields.Integer(dump_only=True)
+    open = fields.Integer(dump_only=True)
 
 
 class CreateTodoSchema(ma.Schema):
     """Schema for validating create todo requests."""
 
     title = fields.String(required=True)
+    owner = fields.String(validate=validate.Length(min=1, max=MAX_OWNER_LENGTH))
+
+
+class BatchCreateItemSchema(ma.Schema):
+    """Schema for validating one todo to create in a batch request."""
+
+    title = fields.String(required=True)
+
+
+class BatchTodoSchema(ma.Schema):
+    """Schema for validating batch create/toggle/delete requests.
+
+    Todos in ``create`` are all created for ``owner``.
+    """
+
+    owner = fields.String(validate=validate.Length(min=1, max=MAX_OWNER_LENGTH))
+    create = fields.List(
+        fields.Nested(BatchCreateItemSchema), validate=validate.Length(max=MAX_BATCH_SIZE)
+    )
+    toggle = fields.List(
+        fields.Integer(strict=True), validate=validate.Length(max=MAX_BATCH_SIZE)
+    )
+    delete = fields.List(
+        fields.Integer(strict=True), validate=validate.Length(max=MAX_BATCH_SIZE)
+    )
+
+
+class TodoListQuerySchema(ma.Schema):
+    """Schema for parsing listing filters and ordering from the query string into a TodoQuery.
+
+    ``sort`` names a field, prefixed with ``-`` for descending order. Other query
+    parameters, such as pagination, are ignored.
+    """
+
+    class Meta:
+        unknown = EXCLUDE
+
+    owner = fields.String(validate=validate.Length(min=1, max=MAX_OWNER_LENGTH))
+    completed = fields.Boolean()
+    created_after = fields.DateTime()
+    created_before = fields.DateTime()
+    updated_after = fields.DateTime()
+    updated_before = fields.DateTime()
+    q = fields.String(validate=validate.Length(max=MAX_SEARCH_LENGTH))
+    sort = fields.String(
+        validate=validate.OneOf([*SORT_FIELDS, *(f"-{name}" for name in SORT_FIELDS)])
+    )
+
+    @post_load
+    def make_query(self, data, **kwargs) -> TodoQuery:
+        sort = data.pop("sort", SORT_FIELDS[0])
+        return TodoQuery(
+            search=data.pop("q", None),
+            sort=sort.removeprefix("-"),
+            descending=sort.startswith("-"),
+            **data,
+        )
 
 
 todo_schema = TodoSchema()
 todos_schema = TodoSchema(many=True)
+todo_stats_schema = TodoStatsSchema()
 create_todo_schema = CreateTodoSchema()
+batch_todo_schema = BatchTodoSchema()
+todo_list_query_schema = TodoListQuerySchema()
@@ -0,0 +1,80 @@
+"""Todo REST response serializers. Precompiled dumpers producing the same output as the marshmallow response schemas at a fraction of the cost."""
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from operator import attrgetter
+from typing import Any
+
+from marshmallow import Schema, fields
+
+from todo_api.core.pagination import Page
+from todo_api.features.todos.domain import TodoChange, TodoEvent
+from todo_api.features.todos.rest.schemas import TodoSchema
+
+Encoder = Callable[[Any], Any]
+
+# Listing response header naming the change feed cursor to sync on from
+CHANGES_CURSOR_HEADER = "X-Changes-Cursor"
+
+
+class FastSerializer:
+    """Dumps objects exactly as a marshmallow schema would, with per-field encoders resolved once.
+
+    Plain Integer, String and Boolean fields read the attribute directly and ISO
+    DateTime fields call isoformat; any other field falls back to its own serialize
+    method. Objects must expose every field as an attribute, as domain types do,
+    since marshmallow's skipping of missing attributes is not reproduced.
+    """
+
+    def __init__(self, schema: Schema):
+        self._encoders = tuple(
+            (name, _compile(name, field)) for name, field in schema.dump_fields.items()
+        )
+
+    def dump(self, obj: Any) -> dict:
+        return {name: encode(obj) for name, encode in self._encoders}
+
+    def dump_many(self, objs: Iterable[Any]) -> list[dict]:
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+
+def _compile(name: str, field: fields.Field) -> Encoder:
+    attribute = field.attribute or name
+    get = attrgetter(attribute)
+    if type(field) in (fields.Integer, fields.String, fields.Boolean) and not getattr(
+        field, "as_string", False
+    ):
+        return get
+    if type(field) is fields.DateTime and field.format in (None, "iso"):
+
+        def encode_datetime(obj: Any) -> str | None:
+            value: datetime | None = get(obj)
+            return None if value is None else value.isoformat()
+
+        return encode_datetime
+
+    def encode_field(obj: Any) -> Any:
+        return field.serialize(attribute, obj)
+
+    return encode_field
+
+
+todo_serializer = FastSerializer(TodoSchema())
+
+
+def dump_changes(page: Page[TodoChange]) -> dict:
+    """Build the change feed body: written todos, deleted IDs and the cursor to resume from."""
+    return {
+        "todos": [todo_serializer.dump(c.todo) for c in page.items if c.todo is not None],
+        "deleted": [c.todo_id for c in page.items if c.todo is None],
+        "cursor": page.end_cursor,
+        "has_more": page.has_next,
+    }
+
+
+def dump_event(event: TodoEvent) -> dict:
+    """Build the payload of a todo event: the todo as written, or just its ID once deleted."""
+    if event.todo is None:
+        return {"id": event.todo_id}
+    return todo_serializer.dump(event.todo)
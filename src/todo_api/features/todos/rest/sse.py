@@ -0,0 +1,67 @@
+"""Todo Server-Sent Events streams. Formats events from a broker subscription as a text/event-stream body for the Flask and ASGI routes."""
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+from todo_api.core.events import AsyncSubscription, Subscription
+from todo_api.features.todos.domain import TodoEvent
+from todo_api.features.todos.rest.serializers import dump_event
+
+SSE_MIMETYPE = "text/event-stream"
+# Keep proxies from caching or buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Reconnection delay suggested to clients, in milliseconds
+RETRY_MS = 3000
+
+_KEEPALIVE = ": keepalive\n\n"
+# Sent before ending the stream of a subscriber that fell behind
+_OVERFLOW = "event: overflow\ndata: {}\n\n"
+
+
+def _format(event: TodoEvent, dumps: Callable[[Any], str]) -> str:
+    return f"event: {event.type}\ndata: {dumps(dump_event(event))}\n\n"
+
+
+def event_stream(
+    subscription: Subscription, keepalive: float, dumps: Callable[[Any], str]
+) -> Iterator[str]:
+    """Yield the subscription's events as SSE messages, with a comment whenever it idles for ``keepalive`` seconds.
+
+    The stream ends once the subscription is closed, and closes it when the
+    consumer stops iterating.
+    """
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            event = subscription.get(timeout=keepalive)
+            if event is not None:
+                yield _format(event, dumps)
+            elif subscription.closed:
+                if subscription.overflowed:
+                    yield _OVERFLOW
+                return
+            else:
+                yield _KEEPALIVE
+    finally:
+        subscription.close()
+
+
+async def async_event_stream(
+    subscription: AsyncSubscription, keepalive: float, dumps: Callable[[Any], str]
+) -> AsyncIterator[str]:
+    """Async counterpart of event_stream for an AsyncSubscription."""
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            event = await subscription.get(timeout=keepalive)
+            if event is not None:
+                yield _format(event, dumps)
+            elif subscription.closed:
+                if subscription.overflowed:
+                    yield _OVERFLOW
+                return
+            else:
+                yield _KEEPALIVE
+    finally:
+        subscription.close()
@@ -1,19 +1,121 @@
 """Todo service layer. Implements use cases for todo operations, orchestrating domain logic and repository interactions."""
 
-from todo_api.core.exceptions import NotFoundError, ValidationError
-from todo_api.features.todos.domain import Todo
-from todo_api.features.todos.repository import TodoRepository
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from todo_api.core.events import EventPublisher
+from todo_api.core.exceptions import (
+    ExpiredCursorError,
+    NotFoundError,
+    PreconditionFailedError,
+    ValidationError,
+)
+from todo_api.core.pagination import Page, decode_cursor, encode_cursor
+from todo_api.features.todos.domain import (
+    DEFAULT_OWNER,
+    SORT_FIELDS,
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoEvent,
+    TodoQuery,
+    TodoStats,
+)
+from todo_api.features.todos.repository import AsyncTodoRepository, TodoRepository
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 500
+MAX_SEARCH_LENGTH = 200
+MAX_OWNER_LENGTH = 64
 
 
 class TodoService:
-    """Use cases for todo operations."""
+    """Use cases for todo operations. Committed writes are announced to the event publisher, if any."""
 
-    def __init__(self, repository: TodoRepository):
+    def __init__(self, repository: TodoRepository, events: EventPublisher | None = None):
         self._repository = repository
+        self._events = events
+
+    def list_todos(self, query: TodoQuery | None = None) -> list[Todo]:
+        """Return all todos matching the query. Raises ValidationError for an invalid query."""
+        return self._repository.get_all(query=_check_query(query))
+
+    def stream_todos(self, query: TodoQuery | None = None) -> Iterator[Todo]:
+        """Yield every matching todo in order without materializing the full list."""
+        return self._repository.iter_all(query=_check_query(query))
+
+    def list_todos_page(
+        self,
+        limit: int | None = None,
+        after: str | None = None,
+        query: TodoQuery | None = None,
+    ) -> Page[Todo]:
+        """Return one page of matching todos in the query's order, starting after the given cursor.
+
+        Raises ValidationError if the limit is out of range, the cursor is malformed
+        or the query is invalid.
+        """
+        limit = _page_limit(limit)
+        query = _check_query(query)
+        position = _position(after, query)
+        # Fetch one extra row to learn whether another page follows
+        todos = self._repository.get_all(limit=limit + 1, after=position, query=query)
+        return _build_page(todos, limit, after, query)
+
+    @staticmethod
+    def cursor_for(todo: Todo, query: TodoQuery | None = None) -> str:
+        """Return the opaque pagination cursor pointing at the given todo in the query's order."""
+        return _cursor(todo, query or TodoQuery())
+
+    def get_version(self) -> int:
+        """Return a counter that changes whenever any todo is written."""
+        return self._repository.get_version()
+
+    def get_stats(self) -> TodoStats:
+        """Return the total, completed and open todo counts without counting the table."""
+        return self._repository.get_stats()
+
+    def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        """Recount the todos and correct the maintained counts where they drifted.
+
+        Returns the counts as they were recorded and as recounted; they differ
+        when a correction was made.
+        """
+        return self._repository.reconcile_stats()
+
+    def changes_cursor(self, version: int) -> str | None:
+        """Return the change feed cursor for data read at the given version from get_version.
 
-    def list_todos(self) -> list[Todo]:
-        """Return all todos."""
-        return self._repository.get_all()
+        Returns None if the store keeps no change feed.
+        """
+        if not self._repository.has_change_feed:
+            return None
+        # Writes stamped with the version itself had committed, so the data includes them
+        return encode_cursor(version + 1, 0)
+
+    def list_changes(self, since: str, limit: int | None = None) -> Page[TodoChange]:
+        """Return the todos written and deleted after a change cursor, oldest write first.
+
+        Raises ValidationError if the limit is out of range or the cursor is malformed,
+        ExpiredCursorError if deletions after the cursor have been pruned, and
+        UnsupportedError if the store keeps no change feed.
+        """
+        limit = _page_limit(limit)
+        after = _change_position(since)
+        changes = self._repository.get_changes(after, limit + 1)
+        # Checked after reading so a prune racing the read cannot go unnoticed
+        _check_not_pruned(after, self._repository.get_pruned_version())
+        return _build_changes_page(changes, limit, since)
+
+    def prune_tombstones(self, older_than: timedelta) -> int:
+        """Drop deletion records older than the given age. Returns how many were dropped.
+
+        Change cursors from before the newest dropped deletion expire.
+        """
+        return self._repository.prune_tombstones(datetime.now(UTC) - older_than)
 
     def get_todo(self, todo_id: int) -> Todo:
         """Return a single todo by ID. Raises NotFoundError if not found."""
@@ -22,24 +124,366 @@ class TodoService:
             raise NotFoundError("Todo", todo_id)
         return todo
 
-    def create_todo(self, title: str) -> Todo:
-        """Create a new todo. Raises ValidationError if title is blank."""
-        if not title or not title.strip():
-            raise ValidationError("Title must not be blank")
-        return self._repository.create(Todo(title=title.strip()))
+    def get_todos(self, todo_ids: list[int]) -> list[Todo]:
+        """Return the todos with the given IDs in one lookup, skipping any that do not exist."""
+        return self._repository.get_many(todo_ids)
 
-    def toggle_completed(self, todo_id: int) -> Todo:
-        """Toggle the completed status of a todo. Raises NotFoundError if not found."""
-        todo = self._repository.get_by_id(todo_id)
+    def create_todo(self, title: str, owner: str = DEFAULT_OWNER) -> Todo:
+        """Create a new todo for a tenant. Raises ValidationError if title or owner is invalid."""
+        todo = Todo(title=_clean_title(title), owner=_check_owner(owner))
+        created = self._repository.create(todo)
+        _publish(self._events, "created", [created])
+        return created
+
+    def create_todos(self, titles: list[str], owner: str = DEFAULT_OWNER) -> list[Todo]:
+        """Create several todos for a tenant in one batch. Raises ValidationError if any is bad."""
+        _check_batch_size(titles)
+        created = self._repository.create_many(_new_todos(titles, owner))
+        _publish(self._events, "created", created)
+        return created
+
+    def toggle_completed(self, todo_id: int, if_updated_at: datetime | None = None) -> Todo:
+        """Toggle the completed status of a todo. Raises NotFoundError if not found.
+
+        Given ``if_updated_at``, raises PreconditionFailedError instead of toggling
+        if the todo has been written since that time.
+        """
+        toggled = self._repository.toggle(todo_id, if_updated_at)
+        if toggled is None:
+            raise self._unmatched(todo_id, if_updated_at)
+        _publish(self._events, "toggled", [toggled])
+        return toggled
+
+    def toggle_todos(self, todo_ids: list[int]) -> list[Todo | None]:
+        """Toggle several todos in one batch.
+
+        Returns one entry per requested ID, None where the todo does not exist.
+        Repeated IDs are toggled once.
+        """
+        _check_batch_size(todo_ids)
+        toggled = self._repository.toggle_many(todo_ids)
+        _publish_toggled(self._events, toggled)
+        return toggled
+
+    def delete_todo(self, todo_id: int, if_updated_at: datetime | None = None) -> None:
+        """Delete a todo. Raises NotFoundError if not found.
+
+        Given ``if_updated_at``, raises PreconditionFailedError instead of deleting
+        if the todo has been written since that time.
+        """
+        if not self._repository.delete(todo_id, if_updated_at):
+            raise self._unmatched(todo_id, if_updated_at)
+        _publish_deleted(self._events, [todo_id], [True])
+
+    def delete_todos(self, todo_ids: list[int]) -> list[bool]:
+        """Delete several todos in one batch. Returns whether each requested ID was deleted."""
+        _check_batch_size(todo_ids)
+        deleted = self._repository.delete_many(todo_ids)
+        _publish_deleted(self._events, todo_ids, deleted)
+        return deleted
+
+    def write_batch(
+        self,
+        titles: list[str],
+        toggle_ids: list[int],
+        delete_ids: list[int],
+        owner: str = DEFAULT_OWNER,
+    ) -> TodoBatch:
+        """Create, toggle and delete todos in one transaction, with results as from the single-kind batches.
+
+        Raises ValidationError, writing nothing, if any part is bad.
+        """
+        for items in (titles, toggle_ids, delete_ids):
+            _check_batch_size(items)
+        todos = _new_todos(titles, owner)
+        batch = self._repository.apply_batch(todos, toggle_ids, delete_ids)
+        _publish(self._events, "created", batch.created)
+        _publish_toggled(self._events, batch.toggled)
+        _publish_deleted(self._events, delete_ids, batch.deleted)
+        return batch
+
+    def _unmatched(self, todo_id: int, if_updated_at: datetime | None) -> Exception:
+        # A conditional write matching nothing either lost a race or found no todo
+        if if_updated_at is not None and self._repository.get_by_id(todo_id) is not None:
+            return PreconditionFailedError("Todo", todo_id)
+        return NotFoundError("Todo", todo_id)
+
+
+class AsyncTodoService:
+    """Use cases for todo operations, awaiting an async repository."""
+
+    def __init__(self, repository: AsyncTodoRepository, events: EventPublisher | None = None):
+        self._repository = repository
+        self._events = events
+
+    async def list_todos(self, query: TodoQuery | None = None) -> list[Todo]:
+        """Return all todos matching the query. Raises ValidationError for an invalid query."""
+        return await self._repository.get_all(query=_check_query(query))
+
+    def stream_todos(self, query: TodoQuery | None = None) -> AsyncIterator[Todo]:
+        """Yield every matching todo in order without materializing the full list."""
+        return self._repository.iter_all(query=_check_query(query))
+
+    async def list_todos_page(
+        self,
+        limit: int | None = None,
+        after: str | None = None,
+        query: TodoQuery | None = None,
+    ) -> Page[Todo]:
+        """Return one page of matching todos in the query's order, starting after the given cursor.
+
+        Raises ValidationError if the limit is out of range, the cursor is malformed
+        or the query is invalid.
+        """
+        limit = _page_limit(limit)
+        query = _check_query(query)
+        position = _position(after, query)
+        todos = await self._repository.get_all(limit=limit + 1, after=position, query=query)
+        return _build_page(todos, limit, after, query)
+
+    @staticmethod
+    def cursor_for(todo: Todo, query: TodoQuery | None = None) -> str:
+        """Return the opaque pagination cursor pointing at the given todo in the query's order."""
+        return _cursor(todo, query or TodoQuery())
+
+    async def get_version(self) -> int:
+        """Return a counter that changes whenever any todo is written."""
+        return await self._repository.get_version()
+
+    async def get_stats(self) -> TodoStats:
+        """Return the total, completed and open todo counts without counting the table."""
+        return await self._repository.get_stats()
+
+    async def reconcile_stats(self) -> tuple[TodoStats, TodoStats]:
+        """Recount the todos and correct the maintained counts where they drifted.
+
+        Returns the counts as they were recorded and as recounted; they differ
+        when a correction was made.
+        """
+        return await self._repository.reconcile_stats()
+
+    @staticmethod
+    def changes_cursor(version: int) -> str:
+        """Return the change feed cursor for data read at the given version from get_version."""
+        # Writes stamped with the version itself had committed, so the data includes them
+        return encode_cursor(version + 1, 0)
+
+    async def list_changes(self, since: str, limit: int | None = None) -> Page[TodoChange]:
+        """Return the todos written and deleted after a change cursor, oldest write first.
+
+        Raises ValidationError if the limit is out of range or the cursor is malformed,
+        and ExpiredCursorError if deletions after the cursor have been pruned.
+        """
+        limit = _page_limit(limit)
+        after = _change_position(since)
+        changes = await self._repository.get_changes(after, limit + 1)
+        _check_not_pruned(after, await self._repository.get_pruned_version())
+        return _build_changes_page(changes, limit, since)
+
+    async def prune_tombstones(self, older_than: timedelta) -> int:
+        """Drop deletion records older than the given age. Returns how many were dropped.
+
+        Change cursors from before the newest dropped deletion expire.
+        """
+        return await self._repository.prune_tombstones(
+            datetime.now(UTC) - older_than
+        )
+
+    async def get_todo(self, todo_id: int) -> Todo:
+        """Return a single todo by ID. Raises NotFoundError if not found."""
+        todo = await self._repository.get_by_id(todo_id)
         if todo is None:
             raise NotFoundError("Todo", todo_id)
-        todo.completed = not todo.completed
-        updated = self._repository.update(todo)
-        if updated is None:
+        return todo
+
+    async def get_todos(self, todo_ids: list[int]) -> list[Todo]:
+        """Return the todos with the given IDs in one lookup, skipping any that do not exist."""
+        return await self._repository.get_many(todo_ids)
+
+    async def create_todo(self, title: str, owner: str = DEFAULT_OWNER) -> Todo:
+        """Create a new todo for a tenant. Raises ValidationError if title or owner is invalid."""
+        todo = Todo(title=_clean_title(title), owner=_check_owner(owner))
+        created = await self._repository.create(todo)
+        _publish(self._events, "created", [created])
+        return created
+
+    async def create_todos(self, titles: list[str], owner: str = DEFAULT_OWNER) -> list[Todo]:
+        """Create several todos for a tenant in one batch. Raises ValidationError if any is bad."""
+        _check_batch_size(titles)
+        created = await self._repository.create_many(_new_todos(titles, owner))
+        _publish(self._events, "created", created)
+        return created
+
+    async def toggle_completed(self, todo_id: int) -> Todo:
+        """Toggle the completed status of a todo. Raises NotFoundError if not found."""
+        toggled = await self._repository.toggle(todo_id)
+        if toggled is None:
             raise NotFoundError("Todo", todo_id)
-        return updated
+        _publish(self._events, "toggled", [toggled])
+        return toggled
+
+    async def toggle_todos(self, todo_ids: list[int]) -> list[Todo | None]:
+        """Toggle several todos in one batch.
 
-    def delete_todo(self, todo_id: int) -> None:
+        Returns one entry per requested ID, None where the todo does not exist.
+        Repeated IDs are toggled once.
+        """
+        _check_batch_size(todo_ids)
+        toggled = await self._repository.toggle_many(todo_ids)
+        _publish_toggled(self._events, toggled)
+        return toggled
+
+    async def delete_todo(self, todo_id: int) -> None:
         """Delete a todo. Raises NotFoundError if not found."""
-        if not self._repository.delete(todo_id):
+        if not await self._repository.delete(todo_id):
             raise NotFoundError("Todo", todo_id)
+        _publish_deleted(self._events, [todo_id], [True])
+
+    async def delete_todos(self, todo_ids: list[int]) -> list[bool]:
+        """Delete several todos in one batch. Returns whether each requested ID was deleted."""
+        _check_batch_size(todo_ids)
+        deleted = await self._repository.delete_many(todo_ids)
+        _publish_deleted(self._events, todo_ids, deleted)
+        return deleted
+
+    async def write_batch(
+        self,
+        titles: list[str],
+        toggle_ids: list[int],
+        delete_ids: list[int],
+        owner: str = DEFAULT_OWNER,
+    ) -> TodoBatch:
+        """Create, toggle and delete todos in one transaction, with results as from the single-kind batches.
+
+        Raises ValidationError, writing nothing, if any part is bad.
+        """
+        for items in (titles, toggle_ids, delete_ids):
+            _check_batch_size(items)
+        todos = _new_todos(titles, owner)
+        batch = await self._repository.apply_batch(todos, toggle_ids, delete_ids)
+        _publish(self._events, "created", batch.created)
+        _publish_toggled(self._events, batch.toggled)
+        _publish_deleted(self._events, delete_ids, batch.deleted)
+        return batch
+
+
+def _clean_title(title: str) -> str:
+    if not title or not title.strip():
+        raise ValidationError("Title must not be blank")
+    return title.strip()
+
+
+def _check_owner(owner: str) -> str:
+    if not owner or len(owner) > MAX_OWNER_LENGTH:
+        raise ValidationError(f"Owner must be 1 to {MAX_OWNER_LENGTH} characters")
+    return owner
+
+
+def _new_todos(titles: list[str], owner: str) -> list[Todo]:
+    owner = _check_owner(owner)
+    return [Todo(title=_clean_title(title), owner=owner) for title in titles]
+
+
+def _publish(events: EventPublisher | None, event_type: str, todos: Iterable[Todo]) -> None:
+    if events is not None:
+        for todo in todos:
+            events.publish(TodoEvent(event_type, todo.id, todo))
+
+
+def _publish_toggled(events: EventPublisher | None, toggled: list[Todo | None]) -> None:
+    # Repeated IDs in a batch are announced once
+    _publish(events, "toggled", {t.id: t for t in toggled if t is not None}.values())
+
+
+def _publish_deleted(
+    events: EventPublisher | None, todo_ids: list[int], deleted: list[bool]
+) -> None:
+    if events is not None:
+        # Repeated IDs in a batch are announced once
+        for todo_id in dict.fromkeys(i for i, ok in zip(todo_ids, deleted) if ok):
+            events.publish(TodoEvent("deleted", todo_id))
+
+
+def _check_batch_size(items: list) -> None:
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValidationError(f"Batch must not contain more than {MAX_BATCH_SIZE} items")
+
+
+def _page_limit(limit: int | None) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValidationError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def _check_query(query: TodoQuery | None) -> TodoQuery:
+    query = query or TodoQuery()
+    if query.sort not in SORT_FIELDS:
+        raise ValidationError(f"Sort must be one of: {', '.join(SORT_FIELDS)}")
+    search = query.search.strip() if query.search else None
+    if search and len(search) > MAX_SEARCH_LENGTH:
+        raise ValidationError(f"Search must not be longer than {MAX_SEARCH_LENGTH} characters")
+    # Timestamps are stored as naive UTC, so bounds are compared the same way
+    return replace(
+        query,
+        search=search or None,
+        created_after=_naive_utc(query.created_after),
+        created_before=_naive_utc(query.created_before),
+        updated_after=_naive_utc(query.updated_after),
+        updated_before=_naive_utc(query.updated_before),
+    )
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _position(after: str | None, query: TodoQuery) -> tuple[Any, int] | None:
+    if not after:
+        return None
+    key, item_id = decode_cursor(after, scope=_ordering(query))
+    if not isinstance(key, str if query.sort == "title" else datetime):
+        raise ValidationError("Pagination cursor does not match the sort order")
+    return key, item_id
+
+
+def _ordering(query: TodoQuery) -> str:
+    # Scopes listing cursors, so one cannot resume a listing in another order
+    return f"{query.sort}:{'desc' if query.descending else 'asc'}"
+
+
+def _change_position(since: str) -> tuple[int, int]:
+    version, item_id = decode_cursor(since)
+    if not isinstance(version, int):
+        raise ValidationError("Invalid change cursor")
+    return version, item_id
+
+
+def _check_not_pruned(after: tuple[int, int], pruned_version: int) -> None:
+    # Deletions at the cursor's own version may be among those pruned
+    if after[0] <= pruned_version:
+        raise ExpiredCursorError("Change cursor has expired; reload the full listing")
+
+
+def _cursor(todo: Todo, query: TodoQuery) -> str:
+    return encode_cursor(getattr(todo, query.sort), todo.id, scope=_ordering(query))
+
+
+def _build_page(
+    todos: list[Todo], limit: int, after: str | None, query: TodoQuery
+) -> Page[Todo]:
+    has_next = len(todos) > limit
+    items = todos[:limit]
+    end_cursor = _cursor(items[-1], query) if items else after
+    return Page(items=items, end_cursor=end_cursor, has_next=has_next)
+
+
+def _build_changes_page(
+    changes: list[TodoChange], limit: int, since: str
+) -> Page[TodoChange]:
+    items = changes[:limit]
+    end_cursor = encode_cursor(items[-1].version, items[-1].todo_id) if items else since
+    return Page(items=items, end_cursor=end_cursor, has_next=len(changes) > limit)
@@ -1,3 +1,4 @@
-"""Application-level GraphQL package. Assembles feature-level GraphQL types, queries, and mutations into a unified schema."""
+"""Application-level GraphQL package. Assembles feature-level GraphQL types, queries, and mutations into a unified schema.
 
-from todo_api.graphql.schema import schema
+Submodules are imported on demand: importing ``todo_api.graphql.schema`` builds the schema.
+"""
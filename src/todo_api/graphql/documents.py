@@ -0,0 +1,99 @@
+"""GraphQL document cache. Stores parsed and validated query documents keyed by their SHA-256 hash and resolves Automatic Persisted Queries."""
+
+import hashlib
+from dataclasses import dataclass
+
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, validate
+
+from todo_api.core.cache import CacheStats, LRUCache
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_HASH_MISMATCH = "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+class PersistedQueryError(Exception):
+    """Raised when an Automatic Persisted Query cannot be resolved."""
+
+    def __init__(self, message: str, code: str):
+        self.code = code
+        super().__init__(message)
+
+    def to_dict(self) -> dict:
+        return {"message": str(self), "extensions": {"code": self.code}}
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    """A query string with its parsed AST and validation outcome against the schema."""
+
+    query: str
+    document: DocumentNode
+    errors: list[GraphQLError]
+
+    def validate(self, *_args, **_kwargs) -> list[GraphQLError]:
+        """QueryValidator for ariadne that returns the cached outcome instead of revalidating."""
+        return self.errors
+
+
+class DocumentCache:
+    """LRU of validated documents for one schema, doubling as the persisted query store."""
+
+    def __init__(self, schema: GraphQLSchema, max_entries: int = 256):
+        self._schema = schema
+        self._entries = LRUCache(max_entries=max_entries, ttl=None)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._entries.stats
+
+    def resolve(self, data: dict) -> CachedDocument | None:
+        """Return the cached document for a GraphQL request payload.
+
+        Returns None when the payload carries no usable query string, leaving ariadne
+        to report the problem. Raises PersistedQueryError for unknown or mismatched
+        persisted query hashes.
+        """
+        query = data.get("query")
+        persisted_hash = _persisted_query_hash(data)
+
+        if persisted_hash is not None:
+            if not query:
+                cached = self._entries.get(persisted_hash)
+                if cached is None:
+                    raise PersistedQueryError(
+                        "PersistedQueryNotFound", PERSISTED_QUERY_NOT_FOUND
+                    )
+                return cached
+            if isinstance(query, str) and _sha256(query) != persisted_hash:
+                raise PersistedQueryError(
+                    "provided sha does not match query", PERSISTED_QUERY_HASH_MISMATCH
+                )
+
+        if not query or not isinstance(query, str):
+            return None
+        key = persisted_hash or _sha256(query)
+        cached = self._entries.get(key)
+        if cached is None:
+            try:
+                document = parse(query)
+            except GraphQLError:
+                # Let ariadne reparse and format the syntax error; bad input is not cached
+                return None
+            cached = CachedDocument(query, document, validate(self._schema, document))
+            self._entries.set(key, cached)
+        return cached
+
+
+def _persisted_query_hash(data: dict) -> str | None:
+    extensions = data.get("extensions")
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get("persistedQuery")
+    if not isinstance(persisted, dict):
+        return None
+    sha = persisted.get("sha256Hash")
+    return sha if isinstance(sha, str) else None
+
+
+def _sha256(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
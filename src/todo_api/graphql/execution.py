@@ -0,0 +1,111 @@
+"""GraphQL operation execution. Resolves request payloads against the document cache and runs them through ariadne, sharing todo loaders across batched queries."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from ariadne import graphql_sync
+from flask import request
+from graphql import OperationType
+from graphql.utilities import get_operation_ast
+
+from todo_api.graphql.documents import (
+    CachedDocument,
+    DocumentCache,
+    PersistedQueryError,
+)
+from todo_api.graphql.schema import loader_primers, schema
+
+
+@dataclass
+class Operation:
+    """One operation from the request body, resolved against the document cache."""
+
+    data: Any
+    cached: CachedDocument | None = None
+    error: PersistedQueryError | None = None
+
+    @property
+    def is_query(self) -> bool:
+        if self.cached is None:
+            return False
+        operation = get_operation_ast(self.cached.document, self.data.get("operationName"))
+        return operation is not None and operation.operation == OperationType.QUERY
+
+
+def prepare(documents: DocumentCache, data: Any) -> Operation:
+    """Resolve one operation payload against the document cache."""
+    if not isinstance(data, dict):
+        return Operation(data)
+    try:
+        return Operation(data, cached=documents.resolve(data))
+    except PersistedQueryError as error:
+        return Operation(data, error=error)
+
+
+def execute_one(operation: Operation) -> tuple[bool, dict]:
+    """Run a single operation with loaders primed for it."""
+    context = _new_context()
+    _prime(context, [operation])
+    return _execute(operation, context)
+
+
+def execute_batch(operations: list[Operation]) -> list[dict]:
+    """Run operations in order, sharing loaders across each run of consecutive queries.
+
+    Every run of queries is primed as a whole, so todo lookups across all of its
+    operations are fetched together. Mutations get a fresh context and end the
+    current run, so later queries never read data cached before the write.
+    """
+    results = []
+    context = None
+    for index, operation in enumerate(operations):
+        if operation.error is not None:
+            results.append({"errors": [operation.error.to_dict()]})
+            continue
+        if context is None or not operation.is_query:
+            context = _new_context()
+            if operation.is_query:
+                run = []
+                for candidate in operations[index:]:
+                    if candidate.error is None and not candidate.is_query:
+                        break
+                    run.append(candidate)
+                _prime(context, run)
+        _, result = _execute(operation, context)
+        results.append(result)
+        if not operation.is_query:
+            context = None
+    return results
+
+
+def new_document_cache(max_entries: int) -> DocumentCache:
+    """Build the document cache for the schema, which this builds on first import."""
+    return DocumentCache(schema, max_entries=max_entries)
+
+
+def _new_context() -> dict:
+    return {"request": request}
+
+
+def _prime(context: dict, operations: list[Operation]) -> None:
+    for operation in operations:
+        if operation.cached is None or operation.cached.errors:
+            continue
+        for primer in loader_primers:
+            primer(
+                context,
+                operation.cached.document,
+                operation.data.get("operationName"),
+                operation.data.get("variables"),
+            )
+
+
+def _execute(operation: Operation, context: dict) -> tuple[bool, dict]:
+    data, options = operation.data, {}
+    if operation.cached is not None:
+        data = {**data, "query": operation.cached.query}
+        options = {
+            "query_document": operation.cached.document,
+            "query_validator": operation.cached.validate,
+        }
+    return graphql_sync(schema, data, context_value=context, **options)
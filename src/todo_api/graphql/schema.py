@@ -1,20 +1,53 @@
-"""Unified GraphQL schema assembly. Composes feature-level queries and mutations into a single executable GraphQL schema."""
+"""Unified GraphQL schema assembly. Composes feature-level queries, mutations and subscriptions into a single executable GraphQL schema."""
 
 from ariadne import make_executable_schema, snake_case_fallback_resolvers
 
-from todo_api.features.todos.graphql import mutation, query, type_defs
+from todo_api.features.todos.graphql import (
+    async_mutation,
+    async_query,
+    async_subscription,
+    mutation,
+    prime_todo_loader,
+    query,
+    todo_event,
+    todo_event_type,
+    type_defs,
+)
 
 # Root type definitions that compose the feature types
 root_type_defs = """
     type Query {
-        todos: [Todo!]!
+        todos(
+            filter: TodoFilter
+            sort: TodoSortField = CREATED_AT
+            descending: Boolean = false
+        ): [Todo!]!
+        todosConnection(
+            first: Int
+            after: String
+            filter: TodoFilter
+            sort: TodoSortField = CREATED_AT
+            descending: Boolean = false
+        ): TodoConnection!
         todo(id: ID!): Todo!
+        todoStats: TodoStats!
     }
 
     type Mutation {
-        createTodo(title: String!): Todo!
+        createTodo(title: String!, owner: String! = "default"): Todo!
+        createTodos(titles: [String!]!, owner: String! = "default"): [Todo!]!
         toggleTodo(id: ID!): Todo!
+        toggleTodos(ids: [ID!]!): [Todo]!
         deleteTodo(id: ID!): DeleteResult!
+        deleteTodos(ids: [ID!]!): [DeleteResult!]!
+    }
+"""
+
+# Subscriptions need a websocket transport, so only the ASGI schema has them
+subscription_type_defs = """
+    type Subscription {
+        "Todo writes as they are committed. Completes if the subscriber falls behind."
+        todoEvents: TodoEvent!
     }
 """
 
@@ -24,3 +57,19 @@ schema = make_executable_schema(
     mutation,
     snake_case_fallback_resolvers,
 )
+
+# Called before executing an operation to queue lookups its resolvers will need
+loader_primers = [prime_todo_loader]
+
+
+def make_async_schema():
+    """Build the schema variant whose resolvers await the async service, for the ASGI app."""
+    return make_executable_schema(
+        [root_type_defs, subscription_type_defs, type_defs],
+        async_query,
+        async_mutation,
+        async_subscription,
+        todo_event,
+        todo_event_type,
+        snake_case_fallback_resolvers,
+    )
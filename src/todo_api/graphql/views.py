@@ -0,0 +1,59 @@
+"""GraphQL HTTP endpoint. Serves the unified schema at /graphql, accepting a single operation or a JSON array of operations per request.
+
+The GraphQL libraries, schema and document cache are loaded by the first request
+rather than at startup, keeping them out of cold starts.
+"""
+
+import threading
+
+from flask import Flask, jsonify, request
+
+from todo_api.infrastructure.middleware import timed_serialization
+
+DOCUMENTS_KEY = "graphql.documents"
+
+_load_lock = threading.Lock()
+
+
+def init_app(app: Flask) -> None:
+    """Register the /graphql endpoint on the application."""
+    max_batch_size = app.config["GRAPHQL_MAX_BATCH_SIZE"]
+
+    @app.route("/graphql", methods=["POST"])
+    def graphql_endpoint():
+        from todo_api.graphql import execution
+        from todo_api.graphql.documents import PERSISTED_QUERY_NOT_FOUND
+
+        documents = _get_documents(app)
+        data = request.get_json()
+        if not isinstance(data, list):
+            operation = execution.prepare(documents, data)
+            if operation.error is not None:
+                # Not-found is the normal APQ handshake asking the client to resend the full query
+                status = 200 if operation.error.code == PERSISTED_QUERY_NOT_FOUND else 400
+                return jsonify({"errors": [operation.error.to_dict()]}), status
+            success, result = execution.execute_one(operation)
+            with timed_serialization():
+                return jsonify(result), 200 if success else 400
+
+        if not data or len(data) > max_batch_size:
+            message = f"Batch must contain between 1 and {max_batch_size} operations"
+            return jsonify({"errors": [{"message": message}]}), 400
+        operations = [execution.prepare(documents, item) for item in data]
+        results = execution.execute_batch(operations)
+        with timed_serialization():
+            return jsonify(results), 200
+
+
+def _get_documents(app: Flask):
+    """Return the application's document cache, building the schema and cache on first use."""
+    documents = app.extensions.get(DOCUMENTS_KEY)
+    if documents is None:
+        with _load_lock:
+            documents = app.extensions.get(DOCUMENTS_KEY)
+            if documents is None:
+                from todo_api.graphql.execution import new_document_cache
+
+                documents = new_document_cache(app.config["GRAPHQL_DOCUMENT_CACHE_SIZE"])
+                app.extensions[DOCUMENTS_KEY] = documents
+    return documents
@@ -0,0 +1,90 @@
+"""Async database engine and session setup. Builds a SQLAlchemy asyncio engine from the application configuration for the ASGI entry point."""
+
+import os
+
+from flask import Config
+from flask.sansio.scaffold import find_package
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+
+from todo_api.extensions import db
+from todo_api.infrastructure.database import configure_sqlite
+
+# Asyncio drivers substituted for the sync drivers in SQLALCHEMY_DATABASE_URI
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def default_instance_path(import_name: str = "todo_api") -> str:
+    """Return the instance folder Flask picks for an app created from the given package."""
+    prefix, package_path = find_package(import_name)
+    if prefix is None:
+        return os.path.join(package_path, "instance")
+    return os.path.join(prefix, "var", f"{import_name}-instance")
+
+
+def async_database_uri(config: Config, instance_path: str | None = None) -> str:
+    """Return the asyncio database URL, derived from the sync one unless set explicitly.
+
+    A relative SQLite path is resolved against the instance folder, as Flask-SQLAlchemy
+    does for the sync engine, so both engines open the same database file.
+    """
+    explicit = config.get("SQLALCHEMY_ASYNC_DATABASE_URI")
+    if explicit:
+        url = make_url(explicit)
+    else:
+        url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No asyncio driver configured for database backend {backend!r}")
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    url = _in_instance_path(url, instance_path or default_instance_path())
+    return url.render_as_string(hide_password=False)
+
+
+def create_async_sessions(
+    config: Config, instance_path: str | None = None
+) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    """Create the asyncio engine and a session factory bound to it.
+
+    The engine takes SQLALCHEMY_ENGINE_OPTIONS like the sync one.
+    """
+    uri = async_database_uri(config, instance_path)
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if _is_in_memory(make_url(uri)):
+        # Share one connection so every session sees the same in-memory database
+        options["poolclass"] = StaticPool
+        options["connect_args"] = {
+            **options.get("connect_args", {}),
+            "check_same_thread": False,
+        }
+    engine = create_async_engine(uri, **options)
+    configure_sqlite(engine.sync_engine, config.get("SQLITE_PRAGMAS"))
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _is_in_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _in_instance_path(url: URL, instance_path: str) -> URL:
+    if url.get_backend_name() != "sqlite" or _is_in_memory(url):
+        return url
+    if url.database.startswith("file:") or os.path.isabs(url.database):
+        return url
+    os.makedirs(instance_path, exist_ok=True)
+    return url.set(database=os.path.join(instance_path, url.database))
+
+
+async def init_async_db(engine: AsyncEngine) -> None:
+    """Create all database tables through the asyncio engine."""
+    async with engine.begin() as conn:
+        await conn.run_sync(db.metadata.create_all)
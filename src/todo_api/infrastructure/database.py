@@ -1,9 +1,44 @@
 """Database configuration and session management. Sets up SQLAlchemy engine, session factory, and base model class."""
 
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Engine, event
+
 from todo_api.extensions import db
 
+db_cli = AppGroup("db", help="Database schema commands.")
+
 
 def init_db(app):
-    """Create all database tables within the application context."""
+    """Configure the engine, creating missing tables only if DATABASE_CREATE_ALL is set."""
     with app.app_context():
-        db.create_all()
+        configure_sqlite(db.engine, app.config.get("SQLITE_PRAGMAS"))
+        if app.config["DATABASE_CREATE_ALL"]:
+            db.create_all()
+    app.cli.add_command(db_cli)
+
+
+@db_cli.command("create")
+def create_tables():
+    """Create any missing tables and search indexes. Run once per release before serving."""
+    db.create_all()
+    click.echo("Database tables created")
+
+
+def configure_sqlite(engine: Engine, pragmas: dict | None) -> None:
+    """Apply PRAGMA settings to every new connection the engine opens to SQLite.
+
+    Does nothing for other database backends. Pass the sync_engine of an AsyncEngine
+    to configure asyncio connections.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
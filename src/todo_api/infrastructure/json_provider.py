@@ -0,0 +1,75 @@
+"""JSON provider selection. Installs an orjson-backed Flask JSON provider when available, producing the same bytes as Flask's default provider."""
+
+from typing import Any
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask's default JSON provider with encoding delegated to orjson where the output matches.
+
+    Types orjson would format differently (dates, dataclasses and subclasses of
+    builtins) are routed through the default provider's ``default`` hook. Output
+    containing non-ASCII text while ``ensure_ascii`` is set, objects orjson rejects
+    and calls using other formatting arguments fall back to the json module, so the
+    bytes produced are those of DefaultJSONProvider. Floats are the exception: orjson
+    writes exponents without a plus sign and non-finite values as null.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        encoded = self._orjson_dumps(obj, kwargs)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args: dict[str, Any] = {"indent": 2}
+        else:
+            dump_args = {"separators": _COMPACT_SEPARATORS}
+        encoded = self._orjson_dumps(obj, dump_args)
+        if encoded is None:
+            encoded = super().dumps(obj, **dump_args).encode()
+        return self._app.response_class(encoded + b"\n", mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj: Any, kwargs: dict[str, Any]) -> bytes | None:
+        if kwargs == {"separators": _COMPACT_SEPARATORS}:
+            option = 0
+        elif kwargs == {"indent": 2}:
+            option = orjson.OPT_INDENT_2
+        else:
+            return None
+        option |= (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            encoded = orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+        if self.ensure_ascii and not encoded.isascii():
+            return None
+        return encoded
+
+
+def init_app(app: Flask) -> None:
+    """Select the JSON provider named by JSON_PROVIDER: "default", "orjson" or "auto"."""
+    choice = app.config["JSON_PROVIDER"]
+    if choice not in ("auto", "orjson", "default"):
+        raise ValueError(f"Unknown JSON_PROVIDER {choice!r}")
+    if choice == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+    if choice == "orjson" or (choice == "auto" and orjson is not None):
+        app.json = OrjsonProvider(app)
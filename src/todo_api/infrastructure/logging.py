@@ -1 +1,38 @@
 """Logging configuration. Sets up structured logging with appropriate formatters and handlers for the application."""
+
+import json
+import logging
+from datetime import UTC, datetime
+
+from flask import Flask
+
+# Attributes every LogRecord carries; anything else was passed through ``extra``
+_RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, merging fields passed via ``extra``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(app: Flask) -> None:
+    """Send the application's loggers to stderr as JSON lines at the configured level."""
+    logger = logging.getLogger("todo_api")
+    logger.setLevel(app.config["LOG_LEVEL"])
+    if not any(isinstance(h.formatter, JsonFormatter) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
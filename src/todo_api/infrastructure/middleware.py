@@ -1 +1,154 @@
 """Application middleware. Defines Flask middleware for cross-cutting concerns such as CORS, request logging, and error handling."""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import Engine, event
+
+from todo_api.infrastructure.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    Histogram,
+    MetricsRegistry,
+)
+
+logger = logging.getLogger("todo_api.requests")
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class RequestTimings:
+    """Time spent in each phase of the current request, collected while it runs."""
+
+    __slots__ = ("db_queries", "db_seconds", "serialize_seconds", "start")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+def current_timings() -> RequestTimings | None:
+    """Return the timings of the request being handled, if any."""
+    return g.get("timings") if has_request_context() else None
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Attribute the enclosed block to the serialization phase of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_timings()
+        if timings is not None:
+            timings.serialize_seconds += time.perf_counter() - start
+
+
+def init_app(app: Flask) -> None:
+    """Time every request, count its SQL queries and expose the results.
+
+    Each response carries a Server-Timing header and produces one structured log
+    line; aggregated histograms are served in Prometheus text format at /metrics.
+    Streamed response bodies are produced after the response is recorded, so only
+    the work done before the first byte is counted for them. Statements are counted
+    on every engine, shard and replica ones included, but only those run by the
+    request's own thread; the group commit writer's are not attributed to a request.
+    """
+    registry = MetricsRegistry()
+    labels = ("method", "route")
+    request_duration = registry.register(
+        Histogram(
+            "http_request_duration_seconds",
+            "Wall time spent handling a request.",
+            (*labels, "status"),
+        )
+    )
+    db_duration = registry.register(
+        Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent executing SQL statements per request.",
+            labels,
+        )
+    )
+    db_queries = registry.register(
+        Histogram(
+            "http_request_db_queries",
+            "Number of SQL statements executed per request.",
+            labels,
+            buckets=QUERY_COUNT_BUCKETS,
+        )
+    )
+    serialize_duration = registry.register(
+        Histogram(
+            "http_request_serialize_duration_seconds",
+            "Time spent serializing response data per request.",
+            labels,
+        )
+    )
+    app.extensions["metrics"] = registry
+
+    # Listening on the class reaches engines created later, and only once per process
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_timer():
+        g.timings = RequestTimings()
+
+    @app.after_request
+    def record_timings(response):
+        timings = g.pop("timings", None)
+        if timings is None:
+            return response
+        total = time.perf_counter() - timings.start
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+        request_duration.observe(total, request.method, route, str(response.status_code))
+        db_duration.observe(timings.db_seconds, request.method, route)
+        db_queries.observe(timings.db_queries, request.method, route)
+        serialize_duration.observe(timings.serialize_seconds, request.method, route)
+
+        response.headers["Server-Timing"] = (
+            f"total;dur={total * 1000:.3f}, "
+            f'db;dur={timings.db_seconds * 1000:.3f};desc="{timings.db_queries} queries", '
+            f"serialize;dur={timings.serialize_seconds * 1000:.3f}"
+        )
+        slow = total * 1000 >= app.config["SLOW_REQUEST_MS"]
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "route": route,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 3),
+                "db_queries": timings.db_queries,
+                "db_ms": round(timings.db_seconds * 1000, 3),
+                "serialize_ms": round(timings.serialize_seconds * 1000, 3),
+            },
+        )
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return registry.render(), 200, {"Content-Type": PROMETHEUS_CONTENT_TYPE}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = current_timings()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.db_seconds += time.perf_counter() - conn.info.pop("query_start")
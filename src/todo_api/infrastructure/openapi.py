@@ -0,0 +1,31 @@
+"""OpenAPI document serving. Reads the bundled spec once and serves the cached bytes with an ETag, so clients revalidate with a 304 instead of refetching."""
+
+import hashlib
+from functools import cache
+from pathlib import Path
+
+from flask import Flask, request
+
+SPEC_PATH = Path(__file__).parent.parent / "openapi.yaml"
+SPEC_MIMETYPE = "application/yaml"
+# Cacheable anywhere, but revalidated on each use since the spec changes with deploys
+SPEC_CACHE_CONTROL = "public, no-cache"
+
+
+@cache
+def load_spec() -> tuple[bytes, str]:
+    """Return the spec's bytes and their ETag, reading the file on first use only."""
+    body = SPEC_PATH.read_bytes()
+    return body, hashlib.sha256(body).hexdigest()
+
+
+def init_app(app: Flask) -> None:
+    """Serve the OpenAPI spec at /api/docs."""
+
+    @app.route("/api/docs")
+    def openapi_spec():
+        body, etag = load_spec()
+        response = app.response_class(body, mimetype=SPEC_MIMETYPE)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = SPEC_CACHE_CONTROL
+        return response.make_conditional(request)
@@ -0,0 +1,154 @@
+"""Request profiling. Opt-in cProfile and stack-sampling profilers for individual requests, triggered by a request flag or a random sample."""
+
+import cProfile
+import hmac
+import io
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from flask import Flask, g, request
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_QUERY_PARAM = "profile"
+
+PSTATS = "pstats"
+COLLAPSED = "collapsed"
+
+
+class StackSampler:
+    """Low-overhead profiler that periodically samples one thread's call stack.
+
+    Samples are aggregated in collapsed-stack format, one ``frame;frame;frame count``
+    line per distinct stack, which flamegraph tools consume directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+
+
+def _collapse(frame: FrameType | None) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class _ActiveProfile:
+    """A profiler running for the current request and how its output is delivered."""
+
+    def __init__(self, output_format: str, sampled: bool, interval: float):
+        self.sampled = sampled
+        if output_format == PSTATS:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+                return
+            except ValueError:
+                # Python 3.12+ allows one cProfile at a time per process; sample instead
+                pass
+        self.profiler = StackSampler(threading.get_ident(), interval)
+        self.profiler.start()
+
+    def stop(self) -> str:
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.disable()
+            out = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+            return out.getvalue()
+        self.profiler.stop()
+        return self.profiler.collapsed()
+
+
+def init_app(app: Flask) -> None:
+    """Install request profiling when PROFILING_ENABLED is set.
+
+    A request sending the X-Profile header or the ``profile`` query parameter (with
+    the value ``pstats`` or ``collapsed``) is profiled and answered with the report
+    in place of its normal body. When PROFILING_TOKEN is set, such requests must also
+    carry it in X-Profile-Token. Independently, PROFILING_SAMPLE_RATE selects a
+    fraction of ordinary requests to profile with the stack sampler; their collapsed
+    stacks are written to PROFILING_DIR and the response is left untouched.
+    """
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    sample_rate = app.config["PROFILING_SAMPLE_RATE"]
+    interval = app.config["PROFILING_SAMPLE_INTERVAL"]
+    token = app.config["PROFILING_TOKEN"]
+    output_dir = Path(app.config["PROFILING_DIR"] or Path(app.instance_path) / "profiles")
+
+    @app.before_request
+    def start_profile():
+        requested = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_PARAM)
+        if requested and _authorized(token):
+            output_format = COLLAPSED if requested == COLLAPSED else PSTATS
+            g.profile = _ActiveProfile(output_format, sampled=False, interval=interval)
+        elif sample_rate and random.random() < sample_rate:
+            g.profile = _ActiveProfile(COLLAPSED, sampled=True, interval=interval)
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+        report = profile.stop()
+        if profile.sampled:
+            _store(output_dir, report)
+            return response
+        profiled = app.response_class(report, mimetype="text/plain")
+        profiled.headers["X-Profiled-Status"] = str(response.status_code)
+        return profiled
+
+    @app.teardown_request
+    def abandon_profile(_exc):
+        # Unhandled errors skip after_request; never leave a profiler running
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile.stop()
+
+
+def _authorized(token: str | None) -> bool:
+    if not token:
+        return True
+    supplied = request.headers.get(PROFILE_TOKEN_HEADER, "")
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def _store(output_dir: Path, report: str) -> None:
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    name = f"{int(time.time())}-{request.method}-{slug}-{uuid.uuid4().hex[:8]}.collapsed"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / name).write_text(report)
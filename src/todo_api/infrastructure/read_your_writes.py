@@ -0,0 +1,59 @@
+"""Read-your-writes stickiness. Pins a client's reads to the primary database for a while after it writes, using a cookie so every worker process agrees."""
+
+import math
+import time
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from itsdangerous import BadSignature, Signer
+
+STICKY_COOKIE = "todos_primary_until"
+
+
+class CookieStickiness:
+    """ReadStickiness remembering a client's last write in a cookie holding when its window ends.
+
+    The cookie is signed with the app's ``SECRET_KEY``, and the end it holds is
+    never taken as later than one window from now, so a client cannot pin itself
+    to the primary. Reads after a write in the same request are pinned as well.
+    Work outside a request, such as CLI commands, always reads from the primary.
+    """
+
+    def __init__(self, window: float, cookie: str = STICKY_COOKIE):
+        self.window = window
+        self.cookie = cookie
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self._set_cookie)
+
+    def pinned(self) -> bool:
+        if not has_request_context():
+            return True
+        if g.get("wrote_todos"):
+            return True
+        value = request.cookies.get(self.cookie)
+        if value is None:
+            return False
+        try:
+            until = float(self._signer().unsign(value))
+        except (BadSignature, ValueError):
+            return False
+        now = time.time()
+        return math.isfinite(until) and min(until, now + self.window) > now
+
+    def wrote(self) -> None:
+        if has_request_context():
+            g.wrote_todos = True
+
+    def _set_cookie(self, response: Response) -> Response:
+        if g.get("wrote_todos"):
+            response.set_cookie(
+                self.cookie,
+                self._signer().sign(f"{time.time() + self.window:.3f}").decode(),
+                max_age=math.ceil(self.window),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _signer(self) -> Signer:
+        return Signer(current_app.secret_key, salt=self.cookie)
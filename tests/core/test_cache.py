@@ -0,0 +1,55 @@
+"""Tests for the in-process LRU cache backend."""
+
+from todo_api.core.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set_counts_hits_and_misses():
+    cache = LRUCache(max_entries=4, ttl=None)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=4, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+    assert len(cache) == 0
+
+
+def test_delete_and_clear():
+    cache = LRUCache(max_entries=4, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.get("b") is None
@@ -0,0 +1,89 @@
+"""Tests for the event broker and its subscriptions."""
+
+import asyncio
+
+import pytest
+
+from todo_api.core.events import EventBroker
+
+
+def test_publish_fans_out_to_every_subscriber():
+    broker = EventBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+
+    broker.publish("a")
+
+    assert first.get(timeout=0) == "a"
+    assert second.get(timeout=0) == "a"
+    assert first.get(timeout=0) is None
+
+
+def test_close_unsubscribes():
+    broker = EventBroker()
+    subscription = broker.subscribe()
+    subscription.close()
+
+    broker.publish("a")
+
+    assert len(broker) == 0
+    assert subscription.get(timeout=0) is None
+    assert subscription.closed
+
+
+def test_full_queue_drops_subscriber_without_blocking():
+    broker = EventBroker(max_queue=2)
+    slow, fast = broker.subscribe(), broker.subscribe()
+
+    for event in ("a", "b"):
+        broker.publish(event)
+        assert fast.get(timeout=0) == event
+    broker.publish("c")
+
+    assert slow.overflowed
+    assert len(broker) == 1
+    # Events queued before the overflow are still delivered
+    assert [slow.get(timeout=0), slow.get(timeout=0)] == ["a", "b"]
+    assert slow.get(timeout=0) is None
+    assert slow.closed
+    assert fast.get(timeout=0) == "c"
+
+
+def test_invalid_queue_size():
+    with pytest.raises(ValueError):
+        EventBroker(max_queue=0)
+
+
+def test_async_subscription_receives_events_from_other_threads():
+    async def consume():
+        broker = EventBroker()
+        subscription = broker.subscribe_async()
+        await asyncio.to_thread(broker.publish, "a")
+        first = await subscription.get(timeout=1)
+        timed_out = await subscription.get(timeout=0.01)
+        return first, timed_out
+
+    assert asyncio.run(consume()) == ("a", None)
+
+
+def test_broker_close_wakes_waiting_async_consumer():
+    async def consume():
+        broker = EventBroker()
+        subscription = broker.subscribe_async()
+        waiting = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        broker.close()
+        return await asyncio.wait_for(waiting, 1), subscription.closed
+
+    assert asyncio.run(consume()) == (None, True)
+
+
+def test_async_overflow_closes_subscription():
+    async def consume():
+        broker = EventBroker(max_queue=1)
+        subscription = broker.subscribe_async()
+        broker.publish("a")
+        broker.publish("b")
+        await asyncio.sleep(0)
+        return await subscription.get(), await subscription.get(), subscription.overflowed
+
+    assert asyncio.run(consume()) == ("a", None, True)
@@ -0,0 +1,38 @@
+"""Tests for the consistent hash ring."""
+
+from collections import Counter
+
+import pytest
+
+from todo_api.core.sharding import HashRing
+
+KEYS = [f"tenant-{i}" for i in range(2000)]
+
+
+def test_placement_is_stable_across_rings():
+    first = HashRing(["a", "b", "c"])
+    second = HashRing(["c", "a", "b"])
+
+    assert [first.node_for(key) for key in KEYS] == [second.node_for(key) for key in KEYS]
+
+
+def test_keys_spread_over_every_node():
+    counts = Counter(HashRing(["a", "b", "c", "d"]).node_for(key) for key in KEYS)
+
+    assert set(counts) == {"a", "b", "c", "d"}
+    assert min(counts.values()) > len(KEYS) / 4 * 0.6
+
+
+def test_adding_a_node_only_moves_keys_onto_it():
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+
+    moved = [key for key in KEYS if before.node_for(key) != after.node_for(key)]
+    assert moved
+    assert {after.node_for(key) for key in moved} == {"d"}
+    assert len(moved) < len(KEYS) / 2
+
+
+def test_rejects_an_empty_ring():
+    with pytest.raises(ValueError):
+        HashRing([])
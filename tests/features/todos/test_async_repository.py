@@ -0,0 +1,136 @@
+"""Tests for the async SQL todo repository adapter. Runs each scenario on its own event loop against an in-memory aiosqlite database."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from flask import Config
+
+from todo_api.config import TestingConfig
+from todo_api.features.todos.adapters.async_sql_repository import AsyncSqlTodoRepository
+from todo_api.features.todos.domain import Todo, TodoStats
+from todo_api.infrastructure.async_database import (
+    async_database_uri,
+    create_async_sessions,
+    init_async_db,
+)
+
+
+def _run(scenario):
+    """Run a scenario coroutine against a fresh repository and dispose of the engine."""
+    config = Config(".")
+    config.from_object(TestingConfig)
+
+    async def _main():
+        engine, sessions = create_async_sessions(config)
+        await init_async_db(engine)
+        try:
+            await scenario(AsyncSqlTodoRepository(sessions))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_main())
+
+
+def test_create_and_get_by_id():
+    async def scenario(repo):
+        todo = await repo.create(Todo(title="Async"))
+        assert todo.id is not None
+        assert (await repo.get_by_id(todo.id)).title == "Async"
+        assert await repo.get_by_id(999) is None
+
+    _run(scenario)
+
+
+def test_get_all_and_iter_all_in_order():
+    async def scenario(repo):
+        await repo.create_many([Todo(title="A"), Todo(title="B"), Todo(title="C")])
+        first_page = await repo.get_all(limit=2)
+        assert [t.title for t in first_page] == ["A", "B"]
+        last = first_page[-1]
+        assert [t.title for t in await repo.get_all(after=(last.created_at, last.id))] == ["C"]
+        assert [t.title async for t in repo.iter_all(batch_size=2)] == ["A", "B", "C"]
+
+    _run(scenario)
+
+
+def test_toggle_many_and_apply_batch():
+    async def scenario(repo):
+        kept, doomed = await repo.create_many([Todo(title="Kept"), Todo(title="Doomed")])
+        toggled = await repo.toggle_many([kept.id, 999, kept.id])
+        assert [todo and todo.completed for todo in toggled] == [True, None, True]
+        assert await repo.toggle_many([999]) == [None]
+
+        batch = await repo.apply_batch([Todo(title="New")], [kept.id], [doomed.id, 999])
+        assert [todo.title for todo in batch.created] == ["New"]
+        assert batch.toggled[0].completed is False
+        assert batch.deleted == [True, False]
+        assert await repo.get_stats() == await repo.count_stats() == TodoStats(total=2)
+        # Each part of the batch takes a version of its own
+        assert await repo.get_version() == 5
+
+    _run(scenario)
+
+
+def test_toggle_delete_and_version():
+    async def scenario(repo):
+        todo = await repo.create(Todo(title="Flip"))
+        assert (await repo.toggle(todo.id)).completed is True
+        assert await repo.toggle(999) is None
+        assert await repo.delete_many([todo.id, 999]) == [True, False]
+        assert await repo.get_version() == 3
+
+    _run(scenario)
+
+
+def test_stats_follow_writes_and_reconcile():
+    async def scenario(repo):
+        first, second = await repo.create_many([Todo(title="A"), Todo(title="B")])
+        await repo.toggle(first.id)
+        second.completed = True
+        await repo.update_many([second])
+        await repo.delete(first.id)
+        assert await repo.get_stats() == TodoStats(total=1, completed=1)
+        assert await repo.reconcile_stats() == (TodoStats(1, 1), TodoStats(1, 1))
+
+    _run(scenario)
+
+
+def test_get_changes_and_prune():
+    async def scenario(repo):
+        first, second = await repo.create_many([Todo(title="A"), Todo(title="B")])
+        start = (await repo.get_version(), 0)
+        await repo.toggle(second.id)
+        await repo.delete(first.id)
+
+        changes = await repo.get_changes(start, limit=10)
+        assert [(c.todo_id, c.todo is None) for c in changes] == [(second.id, False), (first.id, True)]
+        assert await repo.prune_tombstones(datetime.now(UTC) + timedelta(days=1)) == 1
+        assert await repo.get_pruned_version() == await repo.get_version()
+
+    _run(scenario)
+
+
+def test_relative_sqlite_path_is_in_the_instance_folder(tmp_path):
+    config = Config(".")
+    config.from_object(TestingConfig)
+    config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///todo.db"
+
+    uri = async_database_uri(config, str(tmp_path))
+    assert uri == f"sqlite+aiosqlite:///{tmp_path / 'todo.db'}"
+    config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/abs.db"
+    assert async_database_uri(config, "/elsewhere").endswith(f"{tmp_path}/abs.db")
+
+
+def test_engine_takes_the_engine_options(tmp_path):
+    config = Config(".")
+    config.from_object(TestingConfig)
+    config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///todo.db"
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": 3, "echo": True}
+
+    engine, _ = create_async_sessions(config, str(tmp_path))
+    assert (engine.pool.size(), engine.echo) == (3, True)
+    asyncio.run(engine.dispose())
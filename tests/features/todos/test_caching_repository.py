@@ -0,0 +1,167 @@
+"""Tests for the caching todo repository decorator. Uses a mocked inner repository and a dict-backed fake cache backend."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.core.cache import CacheStats
+from todo_api.features.todos.adapters.caching_repository import CachingTodoRepository
+from todo_api.features.todos.dependencies import get_todo_repository
+from todo_api.features.todos.domain import Todo
+
+
+class FakeBackend:
+    """Unbounded dict standing in for a shared cache backend."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+
+@pytest.fixture
+def inner():
+    """Provide a mocked inner TodoRepository at version 1."""
+    inner = MagicMock()
+    inner.get_version.return_value = 1
+    return inner
+
+
+@pytest.fixture
+def repo(inner):
+    """Provide a CachingTodoRepository over the mocked repository."""
+    return CachingTodoRepository(inner, FakeBackend())
+
+
+def _make_todo(id=1, title="Test", completed=False):
+    now = datetime.now(UTC)
+    return Todo(id=id, title=title, completed=completed, created_at=now, updated_at=now)
+
+
+def test_get_by_id_reads_through_once(repo, inner):
+    inner.get_by_id.return_value = _make_todo()
+
+    assert repo.get_by_id(1).title == "Test"
+    assert repo.get_by_id(1).title == "Test"
+    inner.get_by_id.assert_called_once_with(1)
+    assert repo.stats.hits == 1
+
+
+def test_get_by_id_does_not_cache_missing(repo, inner):
+    inner.get_by_id.return_value = None
+
+    assert repo.get_by_id(1) is None
+    assert repo.get_by_id(1) is None
+    assert inner.get_by_id.call_count == 2
+
+
+def test_get_all_caches_each_page(repo, inner):
+    inner.get_all.return_value = [_make_todo()]
+
+    repo.get_all(limit=10)
+    repo.get_all(limit=10)
+    repo.get_all(limit=20)
+    assert inner.get_all.call_count == 2
+
+
+def test_new_version_invalidates_list_pages(repo, inner):
+    inner.get_all.return_value = []
+    repo.get_all()
+    repo.get_all()
+    assert inner.get_all.call_count == 1
+
+    # A write from any process bumps the store version, with or without this cache
+    inner.get_version.return_value = 2
+    repo.get_all()
+    assert inner.get_all.call_count == 2
+
+
+def test_list_pages_are_shared_per_version(inner):
+    backend = FakeBackend()
+    inner.get_all.return_value = []
+    CachingTodoRepository(inner, backend).get_all()
+    CachingTodoRepository(inner, backend).get_all()
+    assert inner.get_all.call_count == 1
+
+
+def test_toggle_invalidates_entry_and_lists(repo, inner):
+    inner.get_by_id.return_value = _make_todo(completed=False)
+    inner.get_all.return_value = []
+    repo.get_by_id(1)
+    repo.get_all()
+
+    inner.toggle.return_value = _make_todo(completed=True)
+    inner.get_version.return_value = 2
+    repo.toggle(1)
+    inner.get_by_id.return_value = _make_todo(completed=True)
+
+    assert repo.get_by_id(1).completed is True
+    repo.get_all()
+    assert inner.get_by_id.call_count == 2
+    assert inner.get_all.call_count == 2
+
+
+def test_delete_many_invalidates_entries(repo, inner):
+    inner.get_by_id.return_value = _make_todo()
+    repo.get_by_id(1)
+    inner.delete_many.return_value = [True]
+    repo.delete_many([1])
+    repo.get_by_id(1)
+    assert inner.get_by_id.call_count == 2
+
+
+def test_changing_a_returned_todo_leaves_the_cache_alone(repo, inner):
+    inner.get_by_id.return_value = _make_todo(title="Cached")
+    inner.get_all.return_value = [_make_todo(title="Listed")]
+
+    repo.get_by_id(1).title = "Changed"
+    repo.get_by_id(1).completed = True
+    repo.get_all()[0].title = "Changed"
+    repo.get_many([1])[0].title = "Changed"
+
+    assert (repo.get_by_id(1).title, repo.get_by_id(1).completed) == ("Cached", False)
+    assert repo.get_all()[0].title == "Listed"
+    assert repo.get_many([1])[0].title == "Cached"
+    assert inner.get_by_id.call_count == 1
+
+
+def test_get_many_only_fetches_misses(repo, inner):
+    inner.get_by_id.return_value = _make_todo(1)
+    repo.get_by_id(1)
+    inner.get_many.return_value = [_make_todo(2)]
+
+    todos = repo.get_many([1, 2])
+    assert sorted(t.id for t in todos) == [1, 2]
+    inner.get_many.assert_called_once_with([2])
+
+
+def test_iter_all_bypasses_cache(repo, inner):
+    inner.iter_all.return_value = iter([_make_todo()])
+    assert len(list(repo.iter_all())) == 1
+    inner.iter_all.assert_called_once()
+
+
+def test_app_wires_cache_when_enabled(monkeypatch):
+    monkeypatch.setattr(TestingConfig, "TODOS_CACHE_ENABLED", True)
+    app = create_app("testing")
+    with app.app_context():
+        assert isinstance(get_todo_repository(), CachingTodoRepository)
@@ -0,0 +1,42 @@
+"""Tests for the todo CLI commands. Runs the maintenance jobs against an in-memory database."""
+
+from datetime import datetime
+
+from todo_api.extensions import db
+from todo_api.features.todos.models import TodoModel, TodoTombstoneModel
+
+
+def test_reconcile_stats_consistent(app, client):
+    client.post("/api/todos", json={"title": "A"})
+
+    result = app.test_cli_runner().invoke(args=["todos", "reconcile-stats"])
+    assert result.exit_code == 0
+    assert "consistent: total=1 completed=0" in result.output
+
+
+def test_reconcile_stats_corrects_drift(app, client):
+    client.post("/api/todos", json={"title": "A"})
+    db.session.execute(TodoModel.__table__.delete())
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["todos", "reconcile-stats"])
+    assert result.exit_code == 1
+    assert "total 1 -> 0" in result.output
+    assert client.get("/api/todos/stats").get_json()["total"] == 0
+
+
+def test_prune_tombstones_expires_older_cursors(app, client):
+    client.post("/api/todos", json={"title": "A"})
+    cursor = client.get("/api/todos").headers["X-Changes-Cursor"]
+    client.delete("/api/todos/1")
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["todos", "prune-tombstones"])
+    assert "Pruned 0 todo tombstones older than 30 days" in result.output
+    assert client.get(f"/api/todos/changes?since={cursor}").get_json()["deleted"] == [1]
+
+    db.session.execute(TodoTombstoneModel.__table__.update().values(deleted_at=datetime(2000, 1, 1)))
+    db.session.commit()
+    result = runner.invoke(args=["todos", "prune-tombstones", "--days", "1"])
+    assert "Pruned 1 todo tombstones older than 1 days" in result.output
+    assert client.get(f"/api/todos/changes?since={cursor}").status_code == 410
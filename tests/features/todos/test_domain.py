@@ -20,3 +20,8 @@ def test_todo_with_all_fields():
     assert todo.id == 1
     assert todo.completed is True
     assert todo.created_at == now
+
+
+def test_todo_is_slotted():
+    todo = Todo(title="Test")
+    assert not hasattr(todo, "__dict__")
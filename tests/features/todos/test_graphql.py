@@ -2,6 +2,11 @@
 
 import json
 
+import pytest
+from sqlalchemy import event
+
+from todo_api.extensions import db
+
 
 def _query(client, query, variables=None):
     payload = {"query": query}
@@ -14,6 +19,29 @@ def _query(client, query, variables=None):
     )
 
 
+def _batch(client, operations):
+    return client.post(
+        "/graphql",
+        data=json.dumps(operations),
+        content_type="application/json",
+    )
+
+
+@pytest.fixture
+def todo_selects(app):
+    """Record SELECT statements against the todos table."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM todos" in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _capture)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", _capture)
+
+
 # Queries
 
 def test_todos_query_empty(client):
@@ -32,6 +60,76 @@ def test_todos_query_after_create(client):
     assert len(data["data"]["todos"]) == 2
 
 
+def test_todos_connection_pages(client):
+    for title in ("First", "Second", "Third"):
+        _query(client, "mutation($t: String!) { createTodo(title: $t) { id } }", {"t": title})
+
+    connection_query = """
+        query($after: String) {
+            todosConnection(first: 2, after: $after) {
+                edges { cursor node { title } }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+    """
+    data = _query(client, connection_query).get_json()["data"]["todosConnection"]
+    assert [e["node"]["title"] for e in data["edges"]] == ["First", "Second"]
+    assert data["pageInfo"]["hasNextPage"] is True
+    assert data["pageInfo"]["endCursor"] == data["edges"][-1]["cursor"]
+
+    data = _query(client, connection_query, {"after": data["pageInfo"]["endCursor"]}).get_json()
+    connection = data["data"]["todosConnection"]
+    assert [e["node"]["title"] for e in connection["edges"]] == ["Third"]
+    assert connection["pageInfo"]["hasNextPage"] is False
+
+
+def test_todos_filtered_and_sorted(client):
+    for title in ("Water plants", "Buy milk", "Buy bread"):
+        _query(client, "mutation($t: String!) { createTodo(title: $t) { id } }", {"t": title})
+    _query(client, 'mutation { toggleTodo(id: "3") { id } }')
+
+    response = _query(
+        client,
+        """{
+            todos(filter: {search: "buy", completed: false}, sort: TITLE, descending: true) {
+                title
+            }
+            todosConnection(first: 1, sort: TITLE) {
+                edges { node { title } }
+            }
+        }""",
+    )
+    data = response.get_json()["data"]
+    assert [t["title"] for t in data["todos"]] == ["Buy milk"]
+    assert data["todosConnection"]["edges"][0]["node"]["title"] == "Buy bread"
+
+
+def test_todos_filtered_by_owner(client):
+    _query(client, 'mutation { createTodos(titles: ["A", "B"], owner: "acme") { id } }')
+    _query(client, 'mutation { createTodo(title: "C") { id } }')
+
+    response = _query(client, '{ todos(filter: {owner: "acme"}) { title owner } }')
+    assert response.get_json()["data"]["todos"] == [
+        {"title": "A", "owner": "acme"},
+        {"title": "B", "owner": "acme"},
+    ]
+
+
+def test_todos_invalid_timestamp_filter(client):
+    response = _query(client, '{ todos(filter: {createdAfter: "yesterday"}) { id } }')
+    data = response.get_json()
+    assert data["errors"][0]["message"] == "createdAfter must be an ISO 8601 timestamp"
+
+
+def test_todo_stats_query(client):
+    for title in ("First", "Second"):
+        _query(client, "mutation($t: String!) { createTodo(title: $t) { id } }", {"t": title})
+    _query(client, 'mutation { toggleTodo(id: "1") { id } }')
+
+    response = _query(client, "{ todoStats { total completed open } }")
+    assert response.get_json()["data"]["todoStats"] == {"total": 2, "completed": 1, "open": 1}
+
+
 def test_todo_query(client):
     create_resp = _query(client, 'mutation { createTodo(title: "Find me") { id } }')
     todo_id = create_resp.get_json()["data"]["createTodo"]["id"]
@@ -49,6 +147,65 @@ def test_todo_query_not_found(client):
     assert data.get("errors") is not None
 
 
+def test_aliased_todo_lookups_share_one_query(client, todo_selects):
+    _query(client, 'mutation { createTodos(titles: ["A", "B", "C"]) { id } }')
+    todo_selects.clear()
+
+    response = _query(
+        client,
+        """
+        query($b: ID!) {
+            a: todo(id: "1") { title }
+            b: todo(id: $b) { title }
+            ...More
+        }
+        fragment More on Query { c: todo(id: "3") { title } }
+        """,
+        {"b": "2"},
+    )
+    data = response.get_json()["data"]
+    assert [data[k]["title"] for k in ("a", "b", "c")] == ["A", "B", "C"]
+    assert len(todo_selects) == 1
+
+
+def test_batched_operations(client, todo_selects):
+    _query(client, 'mutation { createTodos(titles: ["A", "B"]) { id } }')
+    todo_selects.clear()
+
+    response = _batch(client, [
+        {"query": '{ todo(id: "1") { title } }'},
+        {"query": "query($id: ID!) { todo(id: $id) { title } }", "variables": {"id": "2"}},
+        {"query": '{ todo(id: "999") { title } }'},
+    ])
+    assert response.status_code == 200
+    results = response.get_json()
+    assert results[0]["data"]["todo"]["title"] == "A"
+    assert results[1]["data"]["todo"]["title"] == "B"
+    assert results[2]["errors"]
+    assert len(todo_selects) == 1
+
+
+def test_batched_mutation_refreshes_later_queries(client):
+    _query(client, 'mutation { createTodo(title: "A") { id } }')
+
+    response = _batch(client, [
+        {"query": '{ todo(id: "1") { completed } }'},
+        {"query": 'mutation { toggleTodo(id: "1") { completed } }'},
+        {"query": '{ todo(id: "1") { completed } }'},
+    ])
+    results = response.get_json()
+    assert results[0]["data"]["todo"]["completed"] is False
+    assert results[1]["data"]["toggleTodo"]["completed"] is True
+    assert results[2]["data"]["todo"]["completed"] is True
+
+
+def test_batch_size_limit(client):
+    response = _batch(client, [{"query": "{ todos { id } }"}] * 21)
+    assert response.status_code == 400
+    response = _batch(client, [])
+    assert response.status_code == 400
+
+
 # Mutations
 
 def test_create_todo_mutation(client):
@@ -67,6 +224,31 @@ def test_create_todo_blank_title(client):
     assert data.get("errors") is not None
 
 
+def test_batch_mutations(client):
+    response = _query(client, 'mutation { createTodos(titles: ["A", "B"]) { id title } }')
+    created = response.get_json()["data"]["createTodos"]
+    assert [t["title"] for t in created] == ["A", "B"]
+    ids = [t["id"] for t in created]
+
+    response = _query(
+        client,
+        "mutation($ids: [ID!]!) { toggleTodos(ids: $ids) { id completed } }",
+        {"ids": [ids[0], "999"]},
+    )
+    toggled = response.get_json()["data"]["toggleTodos"]
+    assert toggled[0]["completed"] is True
+    assert toggled[1] is None
+
+    response = _query(
+        client,
+        "mutation($ids: [ID!]!) { deleteTodos(ids: $ids) { success } }",
+        {"ids": ids + ["999"]},
+    )
+    assert response.get_json()["data"]["deleteTodos"] == [
+        {"success": True}, {"success": True}, {"success": False}
+    ]
+
+
 def test_toggle_todo_mutation(client):
     create_resp = _query(client, 'mutation { createTodo(title: "Toggle me") { id } }')
     todo_id = create_resp.get_json()["data"]["createTodo"]["id"]
@@ -0,0 +1,182 @@
+"""Tests for the group commit todo repository adapter. Runs concurrent writers against a SQLite file and counts the transactions committed."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.group_commit_repository import (
+    GroupCommitTodoRepository,
+)
+from todo_api.features.todos.adapters.sql_repository import UncommittedSqlTodoRepository
+from todo_api.features.todos.dependencies import get_todo_repository
+from todo_api.features.todos.domain import Todo, TodoStats
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'todos.db'}")
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def open_repo(engine):
+    """Open group commit repositories on the engine, closing them at the end of the test."""
+    opened = []
+    sessions = scoped_session(sessionmaker(engine))
+
+    def open_repo(**options) -> GroupCommitTodoRepository:
+        repository = GroupCommitTodoRepository(engine, sessions, **options)
+        opened.append(repository)
+        return repository
+
+    yield open_repo
+    for repository in opened:
+        repository.close()
+    sessions.remove()
+
+
+def _commits(engine) -> list[int]:
+    commits = []
+    event.listen(engine, "commit", lambda _connection: commits.append(1))
+    return commits
+
+
+def _concurrently(*calls):
+    start = threading.Barrier(len(calls))
+
+    def run(call):
+        start.wait()
+        return call()
+
+    with ThreadPoolExecutor(len(calls)) as pool:
+        futures = [pool.submit(run, call) for call in calls]
+    return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_writes_share_a_commit(engine, open_repo):
+    repo = open_repo(window=0.2)
+    commits = _commits(engine)
+
+    created = _concurrently(*(lambda i=i: repo.create(Todo(title=f"T{i}")) for i in range(8)))
+
+    assert sorted(todo.title for todo in created) == [f"T{i}" for i in range(8)]
+    assert len({todo.id for todo in created}) == 8
+    assert len(commits) < 8
+    assert repo.get_stats() == TodoStats(total=8)
+    assert repo.get_version() == 8
+
+
+def test_batches_are_capped(engine, open_repo):
+    repo = open_repo(window=0.2, max_batch=2)
+    commits = _commits(engine)
+
+    _concurrently(*(lambda i=i: repo.create(Todo(title=f"T{i}")) for i in range(6)))
+
+    assert len(commits) >= 3
+
+
+def test_a_failing_write_only_fails_its_caller(open_repo):
+    repo = open_repo(window=0.2)
+
+    results = _concurrently(
+        lambda: repo.create(Todo(title="A")),
+        lambda: repo.create(Todo(title=None)),
+        lambda: repo.create(Todo(title="B")),
+    )
+
+    assert isinstance(results[1], IntegrityError)
+    assert sorted(todo.title for todo in (results[0], results[2])) == ["A", "B"]
+    assert repo.get_stats() == repo.count_stats() == TodoStats(total=2)
+    assert repo.get_version() == 2
+
+
+def test_writes_changing_nothing_take_no_version(open_repo):
+    repo = open_repo(window=0.2)
+    todo = repo.create(Todo(title="A"))
+
+    results = _concurrently(
+        lambda: repo.toggle(999),
+        lambda: repo.toggle(todo.id),
+        lambda: repo.delete(999),
+        lambda: repo.create(Todo(title="B")),
+    )
+
+    assert results[0] is None and results[2] is False
+    assert results[1].completed is True
+    assert repo.get_version() == 3
+    assert [change.version for change in repo.get_changes((0, 0), limit=10)] == [2, 3]
+
+
+def test_writer_survives_a_failed_rollback(open_repo, monkeypatch):
+    repo = open_repo()
+    rollback = Session.rollback
+
+    def broken_rollback(session):
+        monkeypatch.setattr(Session, "rollback", rollback)
+        raise RuntimeError("Connection lost")
+
+    monkeypatch.setattr(Session, "rollback", broken_rollback)
+    with pytest.raises(RuntimeError):
+        repo.create(Todo(title=None))
+
+    todo = repo.create(Todo(title="After"))
+    assert repo.get_all() == [todo]
+    assert repo.get_stats() == TodoStats(total=1)
+
+
+def test_callers_stop_waiting_after_the_timeout(open_repo, monkeypatch):
+    repo = open_repo(timeout=0.05)
+    create_many = UncommittedSqlTodoRepository.create_many
+
+    def slow_create_many(repository, todos):
+        time.sleep(0.3)
+        return create_many(repository, todos)
+
+    monkeypatch.setattr(UncommittedSqlTodoRepository, "create_many", slow_create_many)
+    with pytest.raises(TimeoutError):
+        repo.create(Todo(title="Slow"))
+
+
+def test_writes_after_close_fail(open_repo):
+    repo = open_repo()
+    repo.close()
+
+    with pytest.raises(RuntimeError):
+        repo.create(Todo(title="Late"))
+
+
+def test_close_commits_queued_writes(open_repo):
+    repo = open_repo(window=0.2)
+    todo = repo.create(Todo(title="A"))
+    repo.close()
+
+    assert repo.get_by_id(todo.id) == todo
+
+
+def test_rejects_an_in_memory_database():
+    with pytest.raises(ValueError):
+        GroupCommitTodoRepository(create_engine("sqlite://"))
+
+
+def test_app_uses_group_commit_when_configured(monkeypatch, tmp_path):
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 't.db'}")
+    monkeypatch.setattr(TestingConfig, "TODOS_GROUP_COMMIT", True)
+    app = create_app("testing")
+    client = app.test_client()
+
+    assert client.post("/api/todos", json={"title": "A"}).status_code == 201
+    assert [todo["title"] for todo in client.get("/api/todos").get_json()] == ["A"]
+    with app.app_context():
+        repository = get_todo_repository()
+        assert isinstance(repository, GroupCommitTodoRepository)
+        repository.close()
@@ -0,0 +1,170 @@
+"""Tests for the in-memory todo repository's snapshots and recovery. The port itself is covered by the contract tests in test_repository."""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.features.todos.adapters.memory_repository import InMemoryTodoRepository
+from todo_api.features.todos.dependencies import get_todo_repository
+from todo_api.features.todos.domain import Todo, TodoQuery, TodoStats
+
+
+def _write_some(repo):
+    first, second, third = repo.create_many([Todo(title="A"), Todo(title="B"), Todo(title="C")])
+    repo.toggle(first.id)
+    second.title = "B2"
+    repo.update(second)
+    repo.delete(third.id)
+    return repo.get_all()
+
+
+def _state(repo):
+    return (
+        repo.get_all(),
+        repo.get_version(),
+        repo.get_stats(),
+        repo.get_changes((0, 0), limit=100),
+        repo.get_all(query=TodoQuery(search="b2")),
+    )
+
+
+def test_recovers_from_the_journal_alone(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path)
+    _write_some(repo)
+    expected = _state(repo)
+
+    # Nothing written since opening has been snapshotted, as after a crash
+    recovered = InMemoryTodoRepository(path)
+
+    assert _state(recovered) == expected
+    assert recovered.create(Todo(title="D")).id == 3
+
+
+def test_recovers_from_a_snapshot_and_later_writes(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path)
+    _write_some(repo)
+    assert repo.snapshot() is True
+    assert repo.snapshot() is False
+    repo.create(Todo(title="After"))
+    expected = _state(repo)
+
+    assert _state(InMemoryTodoRepository(path)) == expected
+
+
+def test_close_folds_the_journal_into_the_snapshot(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path)
+    _write_some(repo)
+    expected = _state(repo)
+    repo.close()
+
+    assert path.with_name("todos.snapshot.journal").read_text() == ""
+    assert _state(InMemoryTodoRepository(path)) == expected
+
+
+def test_ignores_a_torn_last_journal_entry(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path)
+    repo.create(Todo(title="Kept"))
+    with open(path.with_name("todos.snapshot.journal"), "a") as journal:
+        journal.write('{"put":[["Lost",fal')
+
+    recovered = InMemoryTodoRepository(path)
+
+    assert [todo.title for todo in recovered.get_all()] == ["Kept"]
+    assert recovered.get_version() == 1
+
+
+def test_prunes_survive_recovery(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path)
+    todo = repo.create(Todo(title="A"))
+    repo.delete(todo.id)
+    assert repo.prune_tombstones(datetime.max) == 1
+
+    recovered = InMemoryTodoRepository(path)
+
+    assert recovered.get_pruned_version() == 2
+    assert recovered.get_changes((0, 0), limit=10) == []
+
+
+def test_snapshots_periodically(tmp_path):
+    path = tmp_path / "todos.snapshot"
+    repo = InMemoryTodoRepository(path, snapshot_interval=0.01)
+    repo.create(Todo(title="A"))
+
+    deadline = time.monotonic() + 5
+    while json.loads(path.read_text().splitlines()[0])["version"] != 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    repo.close()
+
+
+def test_snapshot_needs_a_path():
+    with pytest.raises(ValueError):
+        InMemoryTodoRepository().snapshot()
+
+
+def test_failed_restore_closes_the_journal(tmp_path, monkeypatch):
+    opened = []
+    open_journal = InMemoryTodoRepository._open_journal
+    monkeypatch.setattr(
+        InMemoryTodoRepository,
+        "_open_journal",
+        lambda self: opened.append(open_journal(self)) or opened[-1],
+    )
+    monkeypatch.setattr(InMemoryTodoRepository, "snapshot", lambda self: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        InMemoryTodoRepository(tmp_path / "todos.snapshot")
+    assert [journal.closed for journal in opened] == [True]
+
+
+def test_concurrent_writers_keep_indexes_consistent():
+    repo = InMemoryTodoRepository()
+
+    def write(worker):
+        for i in range(50):
+            todo = repo.create(Todo(title=f"Worker {worker} item {i}"))
+            if i % 2:
+                repo.toggle(todo.id)
+            if i % 5 == 0:
+                repo.delete(todo.id)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert repo.get_stats() == repo.count_stats() == TodoStats(total=160, completed=80)
+    assert len(repo.get_all(query=TodoQuery(completed=True))) == 80
+    assert len(repo.get_all(query=TodoQuery(search="worker"))) == 160
+    assert repo.get_version() == 4 * (50 + 25 + 10)
+
+
+def test_app_uses_memory_store_when_configured(monkeypatch, tmp_path):
+    monkeypatch.setattr(TestingConfig, "TODOS_STORE", "memory")
+    monkeypatch.setattr(TestingConfig, "TODOS_MEMORY_SNAPSHOT_PATH", str(tmp_path / "todos"))
+    app = create_app("testing")
+    client = app.test_client()
+
+    assert client.post("/api/todos", json={"title": "A"}).status_code == 201
+    assert [todo["title"] for todo in client.get("/api/todos").get_json()] == ["A"]
+    with app.app_context():
+        repository = get_todo_repository()
+        assert isinstance(repository, InMemoryTodoRepository)
+        repository.close()
+
+
+def test_rejects_an_unknown_store(monkeypatch):
+    monkeypatch.setattr(TestingConfig, "TODOS_STORE", "redis")
+    with pytest.raises(ValueError):
+        create_app("testing")
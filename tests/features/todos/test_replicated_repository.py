@@ -0,0 +1,153 @@
+"""Tests for the replicated todo repository adapter. Uses SQLite files copied from the primary as replicas, so writes after the copy show which database a read went to."""
+
+import sqlite3
+import time
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.replicated_repository import (
+    ReplicatedTodoRepository,
+    connect_replica,
+)
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.dependencies import get_todo_repository
+from todo_api.features.todos.domain import Todo, TodoStats
+
+
+class FakeStickiness:
+    def __init__(self):
+        self.is_pinned = False
+        self.writes = 0
+
+    def pinned(self) -> bool:
+        return self.is_pinned
+
+    def wrote(self) -> None:
+        self.writes += 1
+
+
+def _copy(source, target) -> None:
+    # The backup API copies committed pages from the WAL too
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+@pytest.fixture
+def primary(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    db.metadata.create_all(engine)
+    sessions = scoped_session(sessionmaker(engine))
+    yield SqlTodoRepository(sessions)
+    sessions.remove()
+    engine.dispose()
+
+
+@pytest.fixture
+def open_replicated(tmp_path, primary):
+    """Copy the primary to replica files and open a replicated repository over them."""
+    opened = []
+
+    def open_replicated(*names, stickiness=None) -> ReplicatedTodoRepository:
+        replicas = []
+        for name in names:
+            _copy(tmp_path / "primary.db", tmp_path / f"{name}.db")
+            replicas.append(connect_replica(f"sqlite:///{tmp_path / name}.db"))
+        repository = ReplicatedTodoRepository(primary, replicas, stickiness)
+        opened.append(repository)
+        return repository
+
+    yield open_replicated
+    for repository in opened:
+        repository.close()
+
+
+def test_reads_go_to_replicas_and_writes_to_the_primary(primary, open_replicated):
+    copied = primary.create(Todo(title="Copied"))
+    repo = open_replicated("replica")
+
+    created = repo.create(Todo(title="After the copy"))
+
+    assert primary.get_by_id(created.id) == created
+    assert repo.get_by_id(created.id) is None
+    assert repo.get_all() == [copied]
+    assert list(repo.iter_all()) == [copied]
+    assert repo.get_many([copied.id, created.id]) == [copied]
+    assert repo.get_version() == 1
+    assert repo.get_stats() == TodoStats(total=1)
+    assert [change.todo_id for change in repo.get_changes((0, 0), 10)] == [copied.id]
+    assert repo.count_stats() == TodoStats(total=2)
+
+
+def test_reads_take_turns_over_replicas(tmp_path, primary, open_replicated):
+    repo = open_replicated("first", "second")
+    # Only the second replica gets this todo
+    todo = primary.create(Todo(title="Late"))
+    _copy(tmp_path / "primary.db", tmp_path / "second.db")
+
+    assert [repo.get_by_id(todo.id) for _ in range(4)] == [None, todo, None, todo]
+
+
+def test_a_request_reads_from_one_replica(tmp_path, primary, open_replicated):
+    first = primary.create(Todo(title="First"))
+    repo = open_replicated("behind", "ahead")
+    second = primary.create(Todo(title="Second"))
+    _copy(tmp_path / "primary.db", tmp_path / "ahead.db")
+    app = Flask(__name__)
+
+    seen = []
+    for _ in range(2):
+        with app.test_request_context():
+            version = repo.get_version()
+            todos = repo.get_all()
+            changes = repo.get_changes((0, 0), 10)
+            seen.append((version, todos, [change.todo_id for change in changes]))
+
+    assert seen == [(1, [first], [first.id]), (2, [first, second], [first.id, second.id])]
+
+
+def test_pinned_clients_read_from_the_primary(primary, open_replicated):
+    stickiness = FakeStickiness()
+    repo = open_replicated("replica", stickiness=stickiness)
+
+    created = repo.create(Todo(title="Mine"))
+    repo.toggle(999)
+    assert stickiness.writes == 2
+
+    stickiness.is_pinned = True
+    assert repo.get_by_id(created.id) == created
+    assert list(repo.iter_all()) == [created]
+    stickiness.is_pinned = False
+    assert repo.get_by_id(created.id) is None
+
+
+def test_needs_a_replica(primary):
+    with pytest.raises(ValueError):
+        ReplicatedTodoRepository(primary, [])
+
+
+def test_app_reads_own_writes_from_the_primary(monkeypatch, tmp_path):
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary_path}")
+    create_app("testing")
+    _copy(primary_path, replica_path)
+    monkeypatch.setattr(TestingConfig, "TODOS_READ_REPLICAS", f"sqlite:///{replica_path}")
+    monkeypatch.setattr(TestingConfig, "TODOS_READ_STICKY_SECONDS", 0.2)
+    app = create_app("testing")
+    writer, reader = app.test_client(), app.test_client()
+
+    assert writer.post("/api/todos", json={"title": "A"}).status_code == 201
+
+    assert [todo["title"] for todo in writer.get("/api/todos").get_json()] == ["A"]
+    assert reader.get("/api/todos").get_json() == []
+    time.sleep(0.3)
+    assert writer.get("/api/todos").get_json() == []
+    with app.app_context():
+        repository = get_todo_repository()
+        assert isinstance(repository, ReplicatedTodoRepository)
+        repository.close()
@@ -1,13 +1,51 @@
-"""Tests for the SQL todo repository adapter. Verifies CRUD operations against an in-memory database."""
+"""Contract tests for the todo repository adapters. Runs every test of the port against the SQL adapter on an in-memory database, the in-memory adapter and the group commit adapter, plus checks specific to SQL."""
+
+import time
+from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.group_commit_repository import (
+    GroupCommitTodoRepository,
+)
+from todo_api.features.todos.adapters.memory_repository import InMemoryTodoRepository
+from todo_api.features.todos.adapters.sql_repository import (
+    SqlTodoRepository,
+    UncommittedSqlTodoRepository,
+)
+from todo_api.features.todos.domain import Todo, TodoQuery, TodoStats
+from todo_api.features.todos.models import TodoModel, TodoTombstoneModel
 
-from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
-from todo_api.features.todos.domain import Todo
+
+@pytest.fixture(params=["sql", "memory", "group_commit"])
+def repo(request, app, tmp_path):
+    """Provide each TodoRepository adapter in turn, the SQL one within an app context.
+
+    Group commit needs a database the writer thread can open its own connection to,
+    so it runs on a file.
+    """
+    if request.param == "memory":
+        yield InMemoryTodoRepository()
+        return
+    if request.param == "group_commit":
+        engine = create_engine(f"sqlite:///{tmp_path / 'todos.db'}")
+        db.metadata.create_all(engine)
+        sessions = scoped_session(sessionmaker(engine))
+        repository = GroupCommitTodoRepository(engine, sessions)
+        yield repository
+        repository.close()
+        sessions.remove()
+        engine.dispose()
+        return
+    with app.app_context():
+        yield SqlTodoRepository()
 
 
 @pytest.fixture
-def repo(app):
+def sql_repo(app):
     """Provide a SqlTodoRepository within an app context."""
     with app.app_context():
         yield SqlTodoRepository()
@@ -38,6 +76,18 @@ def test_get_all_empty(repo):
     assert repo.get_all() == []
 
 
+def test_reads_do_not_load_orm_instances(sql_repo):
+    created = sql_repo.create_many([Todo(title="A"), Todo(title="B")])
+    sql_repo.toggle(created[0].id)
+
+    sql_repo.get_all()
+    sql_repo.get_by_id(created[0].id)
+    sql_repo.get_many([todo.id for todo in created])
+    list(sql_repo.iter_all())
+
+    assert len(db.session.identity_map) == 0
+
+
 def test_get_by_id_not_found(repo):
     assert repo.get_by_id(999) is None
 
@@ -61,11 +111,319 @@ def test_update_not_found(repo):
     assert result is None
 
 
+def test_toggle(repo):
+    todo = repo.create(Todo(title="Flip me"))
+
+    toggled = repo.toggle(todo.id)
+    assert toggled.completed is True
+    assert repo.get_by_id(todo.id).completed is True
+    assert repo.toggle(todo.id).completed is False
+
+
+def test_toggle_not_found(repo):
+    assert repo.toggle(999) is None
+
+
+def test_toggle_if_unchanged(repo):
+    todo = repo.create(Todo(title="Flip me"))
+
+    assert repo.toggle(todo.id, if_updated_at=todo.updated_at + timedelta(seconds=1)) is None
+    assert repo.get_by_id(todo.id) == todo
+    assert repo.get_version() == 1
+    assert repo.toggle(todo.id, if_updated_at=todo.updated_at).completed is True
+
+
+def test_delete_if_unchanged(repo):
+    todo = repo.create(Todo(title="To delete"))
+
+    assert repo.delete(todo.id, if_updated_at=todo.updated_at + timedelta(seconds=1)) is False
+    assert repo.get_by_id(todo.id) == todo
+    assert repo.delete(todo.id, if_updated_at=todo.updated_at) is True
+    assert repo.get_by_id(todo.id) is None
+
+
 def test_delete(repo):
     todo = repo.create(Todo(title="To delete"))
     assert repo.delete(todo.id) is True
     assert repo.get_by_id(todo.id) is None
 
 
+def test_version_moves_on_writes_only(repo):
+    assert repo.get_version() == 0
+    todo = repo.create(Todo(title="Versioned"))
+    assert repo.get_version() == 1
+
+    repo.toggle(todo.id)
+    repo.toggle(999)
+    repo.delete(999)
+    assert repo.get_version() == 2
+
+    repo.delete(todo.id)
+    assert repo.get_version() == 3
+
+
 def test_delete_not_found(repo):
     assert repo.delete(999) is False
+
+
+def test_get_all_with_limit(repo):
+    for title in ("First", "Second", "Third"):
+        repo.create(Todo(title=title))
+
+    todos = repo.get_all(limit=2)
+    assert [t.title for t in todos] == ["First", "Second"]
+
+
+def test_get_all_after_position(repo):
+    first = repo.create(Todo(title="First"))
+    repo.create(Todo(title="Second"))
+    repo.create(Todo(title="Third"))
+
+    todos = repo.get_all(after=(first.created_at, first.id))
+    assert [t.title for t in todos] == ["Second", "Third"]
+
+
+def test_iter_all_streams_in_order(repo):
+    for title in ("First", "Second", "Third"):
+        repo.create(Todo(title=title))
+
+    todos = repo.iter_all(batch_size=2)
+    assert [t.title for t in todos] == ["First", "Second", "Third"]
+
+
+def test_get_many(repo):
+    first = repo.create(Todo(title="First"))
+    second = repo.create(Todo(title="Second"))
+
+    todos = repo.get_many([second.id, first.id, 999])
+    assert sorted(t.title for t in todos) == ["First", "Second"]
+
+
+def test_create_many(repo):
+    created = repo.create_many([Todo(title="A"), Todo(title="B", completed=True)])
+    assert [t.title for t in created] == ["A", "B"]
+    assert [t.completed for t in created] == [False, True]
+    assert all(t.id is not None for t in created)
+    assert len(repo.get_all()) == 2
+
+
+def test_update_many(repo):
+    first, second = repo.create_many([Todo(title="A"), Todo(title="B")])
+    first.completed = True
+    second.title = "B2"
+
+    updated = repo.update_many([first, second, Todo(id=999, title="Ghost")])
+    assert updated[0].completed is True
+    assert updated[1].title == "B2"
+    assert updated[2] is None
+    assert repo.get_by_id(first.id).completed is True
+
+
+def test_delete_many(repo):
+    first, second = repo.create_many([Todo(title="A"), Todo(title="B")])
+
+    assert repo.delete_many([first.id, 999, second.id]) == [True, False, True]
+    assert repo.get_all() == []
+
+
+def test_toggle_many(repo):
+    first, second = repo.create_many([Todo(title="A"), Todo(title="B", completed=True)])
+
+    toggled = repo.toggle_many([first.id, 999, second.id, first.id])
+
+    assert [todo and todo.completed for todo in toggled] == [True, None, False, True]
+    assert toggled[3] == toggled[0]
+    assert repo.get_stats() == repo.count_stats() == TodoStats(total=2, completed=1)
+    assert repo.get_version() == 2
+    assert repo.toggle_many([999]) == [None]
+    assert repo.get_version() == 2
+
+
+def test_apply_batch(repo):
+    kept, doomed = repo.create_many([Todo(title="Kept"), Todo(title="Doomed")])
+
+    batch = repo.apply_batch([Todo(title="New")], [kept.id, 999], [doomed.id, 999])
+
+    assert [todo.title for todo in batch.created] == ["New"]
+    assert batch.toggled == [repo.get_by_id(kept.id), None]
+    assert batch.deleted == [True, False]
+    assert [todo.title for todo in repo.get_all()] == ["Kept", "New"]
+    assert repo.get_stats() == repo.count_stats() == TodoStats(total=2, completed=1)
+
+
+def test_apply_batch_writes_nothing_if_a_part_fails(sql_repo, monkeypatch):
+    todo = sql_repo.create(Todo(title="A"))
+
+    def fail(repository, todo_ids):
+        raise RuntimeError("Lost the connection")
+
+    monkeypatch.setattr(UncommittedSqlTodoRepository, "delete_many", fail)
+    with pytest.raises(RuntimeError):
+        sql_repo.apply_batch([Todo(title="B")], [todo.id], [todo.id])
+
+    assert sql_repo.get_all() == [todo]
+    assert sql_repo.get_version() == 1
+    assert sql_repo.get_stats() == TodoStats(total=1)
+
+
+def test_get_all_filters_by_completed(repo):
+    repo.create_many([Todo(title="A"), Todo(title="B", completed=True), Todo(title="C")])
+
+    todos = repo.get_all(query=TodoQuery(completed=False))
+    assert [t.title for t in todos] == ["A", "C"]
+
+
+def test_get_all_filters_by_owner(repo):
+    repo.create_many(
+        [Todo(title="A", owner="acme"), Todo(title="B"), Todo(title="C", owner="acme")]
+    )
+
+    todos = repo.get_all(query=TodoQuery(owner="acme"))
+    assert [(t.title, t.owner) for t in todos] == [("A", "acme"), ("C", "acme")]
+
+
+def test_get_owners(sql_repo):
+    sql_repo.create_many([Todo(title="A", owner="acme"), Todo(title="B")])
+
+    assert sorted(sql_repo.get_owners()) == ["acme", "default"]
+
+
+def test_get_all_sorted_by_title_descending(repo):
+    repo.create_many([Todo(title="b"), Todo(title="c"), Todo(title="a")])
+
+    todos = repo.get_all(query=TodoQuery(sort="title", descending=True))
+    assert [t.title for t in todos] == ["c", "b", "a"]
+
+    after = (todos[0].title, todos[0].id)
+    todos = repo.get_all(after=after, query=TodoQuery(sort="title", descending=True))
+    assert [t.title for t in todos] == ["b", "a"]
+
+
+def test_search_matches_words_and_prefix(repo):
+    repo.create_many(
+        [Todo(title="Buy oat milk"), Todo(title="Café visit"), Todo(title="Milking time")]
+    )
+
+    assert [t.title for t in repo.get_all(query=TodoQuery(search="milk"))] == [
+        "Buy oat milk",
+        "Milking time",
+    ]
+    assert [t.title for t in repo.get_all(query=TodoQuery(search="cafe"))] == ["Café visit"]
+    assert repo.get_all(query=TodoQuery(search='"buy) (oat')) == [repo.get_by_id(1)]
+    assert repo.get_all(query=TodoQuery(search="*")) == []
+
+
+def test_search_index_follows_updates_and_deletes(repo):
+    todo = repo.create(Todo(title="Old title"))
+
+    todo.title = "New title"
+    repo.update(todo)
+    assert repo.get_all(query=TodoQuery(search="old")) == []
+    assert [t.id for t in repo.get_all(query=TodoQuery(search="new"))] == [todo.id]
+
+    repo.delete(todo.id)
+    assert repo.get_all(query=TodoQuery(search="new")) == []
+
+
+def test_stats_follow_writes(repo):
+    assert repo.get_stats() == TodoStats()
+    first, second, third = repo.create_many(
+        [Todo(title="A"), Todo(title="B", completed=True), Todo(title="C")]
+    )
+    assert repo.get_stats() == TodoStats(total=3, completed=1)
+
+    repo.toggle(first.id)
+    second.title, second.completed = "B2", False
+    third.completed = True
+    repo.update_many([second, third])
+    assert repo.get_stats() == TodoStats(total=3, completed=2)
+
+    repo.delete_many([first.id, 999])
+    assert repo.get_stats() == TodoStats(total=2, completed=1)
+    assert repo.get_stats() == repo.count_stats()
+
+
+def test_stats_seeded_from_existing_rows(sql_repo):
+    # Rows written before the summary row existed are counted when it is created
+    db.session.execute(TodoModel.__table__.insert(), [{"title": "Old", "completed": True}])
+    db.session.commit()
+    assert sql_repo.get_stats() == TodoStats(total=1, completed=1)
+
+    sql_repo.create(Todo(title="New"))
+    assert sql_repo.get_stats() == TodoStats(total=2, completed=1)
+
+
+def test_reconcile_stats_corrects_drift(sql_repo):
+    sql_repo.create_many([Todo(title="A"), Todo(title="B")])
+    assert sql_repo.reconcile_stats() == (TodoStats(2, 0), TodoStats(2, 0))
+
+    # Simulate a write that bypassed the repository
+    db.session.execute(TodoModel.__table__.delete())
+    db.session.commit()
+    version = sql_repo.get_version()
+
+    assert sql_repo.reconcile_stats() == (TodoStats(2, 0), TodoStats(0, 0))
+    assert sql_repo.get_stats() == TodoStats()
+    assert sql_repo.get_version() == version
+
+
+def _feed(changes):
+    return [(c.todo_id, c.todo.title if c.todo else None) for c in changes]
+
+
+def test_get_changes_in_write_order(repo):
+    first, second, third = repo.create_many([Todo(title="A"), Todo(title="B"), Todo(title="C")])
+    start = (repo.get_version(), 0)
+    repo.toggle(second.id)
+    first.title = "A2"
+    repo.update(first)
+    repo.delete(third.id)
+    repo.toggle(999)
+
+    assert _feed(repo.get_changes(start, limit=10)) == [(2, "B"), (1, "A2"), (3, None)]
+    assert _feed(repo.get_changes(start, limit=2)) == [(2, "B"), (1, "A2")]
+    assert _feed(repo.get_changes((0, 0), limit=10)) == [(2, "B"), (1, "A2"), (3, None)]
+    assert repo.get_changes((repo.get_version() + 1, 0), limit=10) == []
+
+
+def test_get_changes_skips_tombstones_of_reused_ids(repo):
+    todo = repo.create(Todo(title="A"))
+    repo.delete(todo.id)
+    reused = repo.create(Todo(title="B"))
+    assert reused.id == todo.id
+
+    assert _feed(repo.get_changes((0, 0), limit=10)) == [(todo.id, "B")]
+
+
+def test_prune_tombstones_deleted_before(repo):
+    first, second = repo.create_many([Todo(title="A"), Todo(title="B")])
+    repo.delete(first.id)
+    pruned_at = repo.get_version()
+    time.sleep(0.002)
+    cutoff = datetime.now(UTC)
+    time.sleep(0.002)
+    repo.delete(second.id)
+
+    assert repo.prune_tombstones(cutoff) == 1
+    assert repo.get_pruned_version() == pruned_at
+    assert _feed(repo.get_changes((0, 0), limit=10)) == [(second.id, None)]
+    assert repo.prune_tombstones(cutoff) == 0
+
+
+def test_prune_tombstones(sql_repo):
+    first, second = sql_repo.create_many([Todo(title="A"), Todo(title="B")])
+    sql_repo.delete(first.id)
+    pruned_at = sql_repo.get_version()
+    sql_repo.delete(second.id)
+    db.session.execute(
+        TodoTombstoneModel.__table__.update()
+        .where(TodoTombstoneModel.todo_id == first.id)
+        .values(deleted_at=datetime(2000, 1, 1))
+    )
+    db.session.commit()
+
+    assert sql_repo.prune_tombstones(datetime.now(UTC) - timedelta(days=1)) == 1
+    assert sql_repo.get_pruned_version() == pruned_at
+    assert _feed(sql_repo.get_changes((0, 0), limit=10)) == [(second.id, None)]
+    assert sql_repo.prune_tombstones(datetime(2000, 1, 1)) == 0
+    assert sql_repo.get_pruned_version() == pruned_at
@@ -1,6 +1,9 @@
 """Tests for the todo REST endpoints. Verifies HTTP request handling, response formats, and status codes."""
 
 import json
+from dataclasses import replace
+
+from todo_api.features.todos.service import TodoService
 
 
 def test_list_todos_empty(client):
@@ -22,6 +25,18 @@ def test_create_todo(client):
     assert "id" in data
 
 
+def test_create_todo_for_owner(client):
+    response = client.post("/api/todos", json={"title": "Plan", "owner": "acme"})
+    assert response.status_code == 201
+    assert response.get_json()["owner"] == "acme"
+    client.post("/api/todos", json={"title": "Other"})
+
+    listing = client.get("/api/todos?owner=acme").get_json()
+    assert [todo["title"] for todo in listing] == ["Plan"]
+    assert client.get("/api/todos").get_json()[1]["owner"] == "default"
+    assert client.post("/api/todos", json={"title": "X", "owner": ""}).status_code == 400
+
+
 def test_create_todo_missing_title(client):
     response = client.post(
         "/api/todos",
@@ -121,3 +136,342 @@ def test_delete_todo(client):
 def test_delete_todo_not_found(client):
     response = client.delete("/api/todos/999")
     assert response.status_code == 404
+
+
+def test_list_todos_paginated(client):
+    for title in ("First", "Second", "Third"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+
+    response = client.get("/api/todos?limit=2")
+    assert response.status_code == 200
+    assert [t["title"] for t in response.get_json()] == ["First", "Second"]
+    assert 'rel="next"' in response.headers["Link"]
+
+    next_url = response.headers["Link"].split(";")[0].strip("<>")
+    response = client.get(next_url)
+    assert [t["title"] for t in response.get_json()] == ["Third"]
+    assert "Link" not in response.headers
+
+
+def test_list_todos_filtered_and_sorted(client):
+    for title in ("Water plants", "Buy milk", "Buy bread"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+    client.patch("/api/todos/1")
+
+    response = client.get("/api/todos?q=buy&sort=-title")
+    assert [t["title"] for t in response.get_json()] == ["Buy milk", "Buy bread"]
+
+    response = client.get("/api/todos?completed=false&sort=title")
+    assert [t["title"] for t in response.get_json()] == ["Buy bread", "Buy milk"]
+
+    response = client.get("/api/todos?created_before=2000-01-01T00:00:00Z")
+    assert response.get_json() == []
+
+
+def test_list_todos_paginated_keeps_filters(client):
+    for title in ("c", "b", "a", "skip"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+    client.patch("/api/todos/4")
+
+    response = client.get("/api/todos?limit=2&sort=title&completed=false")
+    assert [t["title"] for t in response.get_json()] == ["a", "b"]
+
+    next_url = response.headers["Link"].split(";")[0].strip("<>")
+    response = client.get(next_url)
+    assert [t["title"] for t in response.get_json()] == ["c"]
+
+
+def test_list_todos_cursor_from_other_sort(client):
+    for title in ("First", "Second"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+
+    next_url = client.get("/api/todos?limit=1").headers["Link"].split(";")[0].strip("<>")
+    response = client.get(next_url + "&sort=title")
+    assert response.status_code == 400
+
+
+def test_list_todos_invalid_filters(client):
+    assert client.get("/api/todos?sort=priority").status_code == 400
+    assert client.get("/api/todos?completed=maybe").status_code == 400
+    assert client.get("/api/todos?updated_after=yesterday").status_code == 400
+    assert client.get("/api/todos?q=" + "x" * 201).status_code == 400
+
+
+def test_list_todos_invalid_limit(client):
+    response = client.get("/api/todos?limit=abc")
+    assert response.status_code == 400
+
+
+def test_list_todos_invalid_cursor(client):
+    response = client.get("/api/todos?after=%%%")
+    assert response.status_code == 400
+
+
+def test_list_todos_ndjson_stream(client):
+    for title in ("First", "Second"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+
+    response = client.get("/api/todos", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["First", "Second"]
+
+
+def test_batch_todos(client):
+    create_resp = client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Existing"}),
+        content_type="application/json",
+    )
+    existing_id = create_resp.get_json()["id"]
+
+    response = client.post(
+        "/api/todos/batch",
+        data=json.dumps({
+            "create": [{"title": "A"}, {"title": "B"}],
+            "toggle": [existing_id, 999],
+            "delete": [998],
+        }),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [t["title"] for t in data["created"]] == ["A", "B"]
+    assert data["toggled"][0]["status"] == 200
+    assert data["toggled"][0]["todo"]["completed"] is True
+    assert data["toggled"][1] == {"id": 999, "status": 404, "error": "Todo with id 999 not found"}
+    assert data["deleted"][0]["status"] == 404
+
+    response = client.post(
+        "/api/todos/batch",
+        data=json.dumps({"delete": [existing_id]}),
+        content_type="application/json",
+    )
+    assert response.get_json()["deleted"] == [{"id": existing_id, "status": 204}]
+    assert len(client.get("/api/todos").get_json()) == 2
+
+
+def test_batch_todos_invalid_body(client):
+    response = client.post(
+        "/api/todos/batch",
+        data=json.dumps({"toggle": ["one"]}),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+
+
+def test_batch_todos_blank_title(client):
+    response = client.post(
+        "/api/todos/batch",
+        data=json.dumps({"create": [{"title": "ok"}, {"title": " "}]}),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert client.get("/api/todos").get_json() == []
+
+
+def test_list_todos_etag_not_modified(client):
+    response = client.get("/api/todos")
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/todos", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+    client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Changes the list"}),
+        content_type="application/json",
+    )
+    response = client.get("/api/todos", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_todos_etag_varies_by_page(client):
+    first = client.get("/api/todos?limit=1").headers["ETag"]
+    second = client.get("/api/todos?limit=2").headers["ETag"]
+    assert first != second
+
+
+def test_get_todo_etag_not_modified(client):
+    create_resp = client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Cache me"}),
+        content_type="application/json",
+    )
+    todo_id = create_resp.get_json()["id"]
+    etag = client.get(f"/api/todos/{todo_id}").headers["ETag"]
+    assert create_resp.headers["ETag"] == etag
+
+    response = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.patch(f"/api/todos/{todo_id}")
+    response = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_toggle_todo_if_match(client):
+    create_resp = client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Guarded"}),
+        content_type="application/json",
+    )
+    todo_id = create_resp.get_json()["id"]
+    etag = create_resp.headers["ETag"]
+
+    response = client.patch(f"/api/todos/{todo_id}", headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = client.patch(f"/api/todos/{todo_id}", headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert response.get_json()["error"] == f"Todo with id {todo_id} has changed"
+
+
+def test_delete_todo_if_match(client):
+    create_resp = client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Guarded"}),
+        content_type="application/json",
+    )
+    todo_id = create_resp.get_json()["id"]
+
+    response = client.delete(f"/api/todos/{todo_id}", headers={"If-Match": '"stale"'})
+    assert response.status_code == 412
+
+    response = client.delete(
+        f"/api/todos/{todo_id}", headers={"If-Match": create_resp.headers["ETag"]}
+    )
+    assert response.status_code == 204
+
+
+def test_if_match_catches_a_write_after_the_check(client, monkeypatch):
+    create_resp = client.post("/api/todos", json={"title": "Guarded"})
+    todo_id = create_resp.get_json()["id"]
+    get_todo = TodoService.get_todo
+
+    def get_todo_then_race(service, todo_id):
+        todo = get_todo(service, todo_id)
+        # Another client writes between the If-Match check and the toggle
+        service._repository.update(replace(todo, title="Raced"))
+        return todo
+
+    monkeypatch.setattr(TodoService, "get_todo", get_todo_then_race)
+    if_match = {"If-Match": create_resp.headers["ETag"]}
+    response = client.patch(f"/api/todos/{todo_id}", headers=if_match)
+
+    assert response.status_code == 412
+    monkeypatch.undo()
+    assert client.get(f"/api/todos/{todo_id}").get_json()["completed"] is False
+
+
+def test_todo_stats(client):
+    assert client.get("/api/todos/stats").get_json() == {"total": 0, "completed": 0, "open": 0}
+    for title in ("First", "Second"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+    client.patch("/api/todos/1")
+
+    response = client.get("/api/todos/stats")
+    assert response.status_code == 200
+    assert response.get_json() == {"total": 2, "completed": 1, "open": 1}
+
+
+def test_list_changes_since_listing(client):
+    for title in ("First", "Second", "Third"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+    cursor = client.get("/api/todos").headers["X-Changes-Cursor"]
+
+    client.patch("/api/todos/2")
+    client.delete("/api/todos/1")
+    client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Fourth"}),
+        content_type="application/json",
+    )
+
+    response = client.get(f"/api/todos/changes?since={cursor}&limit=2")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [t["title"] for t in data["todos"]] == ["Second"]
+    assert data["todos"][0]["completed"] is True
+    assert data["deleted"] == [1]
+    assert data["has_more"] is True
+
+    data = client.get(f"/api/todos/changes?since={data['cursor']}").get_json()
+    assert [t["title"] for t in data["todos"]] == ["Fourth"]
+    assert data["has_more"] is False
+
+    caught_up = client.get(f"/api/todos/changes?since={data['cursor']}").get_json()
+    assert caught_up == {"todos": [], "deleted": [], "cursor": data["cursor"], "has_more": False}
+
+
+def test_list_changes_invalid_cursor(client):
+    assert client.get("/api/todos/changes").status_code == 400
+    assert client.get("/api/todos/changes?since=%%%").status_code == 400
+
+    # Listing pagination cursors are not change cursors
+    for title in ("First", "Second"):
+        client.post(
+            "/api/todos",
+            data=json.dumps({"title": title}),
+            content_type="application/json",
+        )
+    next_url = client.get("/api/todos?limit=1").headers["Link"].split(";")[0].strip("<>")
+    page_cursor = next_url.split("after=")[1]
+    assert client.get(f"/api/todos/changes?since={page_cursor}").status_code == 400
+
+
+def test_todo_events_stream(app, client):
+    app.config["TODOS_EVENTS_KEEPALIVE"] = 0.01
+    response = client.get("/api/todos/events", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    stream = iter(response.response)
+    assert next(stream) == b"retry: 3000\n\n"
+
+    client.post(
+        "/api/todos",
+        data=json.dumps({"title": "Live"}),
+        content_type="application/json",
+    )
+    client.delete("/api/todos/1")
+
+    created = next(stream).decode()
+    assert created.startswith("event: created\ndata: ")
+    assert json.loads(created.split("data: ")[1])["title"] == "Live"
+    assert next(stream) == b'event: deleted\ndata: {"id":1}\n\n'
+    assert next(stream) == b": keepalive\n\n"
+
+    response.close()
+    assert len(app.extensions["todos.events"]) == 0
@@ -0,0 +1,45 @@
+"""Todo serializer tests. Verifies the fast serializer matches the marshmallow response schema."""
+
+from datetime import UTC, datetime
+
+from marshmallow import fields
+
+from todo_api.extensions import ma
+from todo_api.features.todos.domain import Todo
+from todo_api.features.todos.rest.schemas import todo_schema, todos_schema
+from todo_api.features.todos.rest.serializers import FastSerializer, todo_serializer
+
+
+def _todos():
+    return [
+        Todo(title="Naive", id=1, created_at=datetime(2024, 1, 2, 3, 4, 5, 678901)),
+        Todo(
+            title="Aware ✓",
+            id=2,
+            completed=True,
+            updated_at=datetime(2024, 1, 2, tzinfo=UTC),
+        ),
+    ]
+
+
+def test_dump_matches_marshmallow_including_key_order():
+    for todo in _todos():
+        fast = todo_serializer.dump(todo)
+        assert fast == todo_schema.dump(todo)
+        assert list(fast) == list(todo_schema.dump(todo))
+
+
+def test_dump_many_matches_marshmallow():
+    todos = _todos()
+    assert todo_serializer.dump_many(todos) == todos_schema.dump(todos)
+
+
+def test_unhandled_fields_fall_back_to_marshmallow():
+    class LabelSchema(ma.Schema):
+        id = fields.Integer(as_string=True)
+        label = fields.String(attribute="title")
+        created = fields.DateTime(attribute="created_at", format="%Y")
+
+    todo = _todos()[0]
+
+    assert FastSerializer(LabelSchema()).dump(todo) == LabelSchema().dump(todo)
@@ -1,12 +1,25 @@
 """Tests for the todo service layer. Verifies use case behavior using mocked repository implementations."""
 
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from unittest.mock import MagicMock
 
 import pytest
 
-from todo_api.core.exceptions import NotFoundError, ValidationError
-from todo_api.features.todos.domain import Todo
+from todo_api.core.exceptions import (
+    ExpiredCursorError,
+    NotFoundError,
+    PreconditionFailedError,
+    ValidationError,
+)
+from todo_api.core.pagination import decode_cursor
+from todo_api.features.todos.domain import (
+    Todo,
+    TodoBatch,
+    TodoChange,
+    TodoEvent,
+    TodoQuery,
+    TodoStats,
+)
 from todo_api.features.todos.service import TodoService
 
 
@@ -23,7 +36,7 @@ def service(repo):
 
 
 def _make_todo(id=1, title="Test", completed=False):
-    now = datetime.now(timezone.utc)
+    now = datetime.now(UTC)
     return Todo(id=id, title=title, completed=completed, created_at=now, updated_at=now)
 
 
@@ -41,6 +54,56 @@ def test_list_todos_empty(service, repo):
     assert service.list_todos() == []
 
 
+def test_stream_todos(service, repo):
+    repo.iter_all.return_value = iter([_make_todo(1, "A"), _make_todo(2, "B")])
+    assert [t.title for t in service.stream_todos()] == ["A", "B"]
+    repo.iter_all.assert_called_once()
+
+
+# list_todos_page
+
+def test_list_todos_page_has_next(service, repo):
+    repo.get_all.return_value = [_make_todo(1, "A"), _make_todo(2, "B"), _make_todo(3, "C")]
+    page = service.list_todos_page(limit=2)
+    assert [t.title for t in page.items] == ["A", "B"]
+    assert page.has_next is True
+    assert page.end_cursor == service.cursor_for(page.items[-1])
+    repo.get_all.assert_called_once_with(limit=3, after=None, query=TodoQuery())
+
+
+def test_list_todos_page_decodes_cursor(service, repo):
+    last = _make_todo(7, "Last seen")
+    repo.get_all.return_value = []
+    page = service.list_todos_page(limit=10, after=service.cursor_for(last))
+    assert page.items == []
+    assert page.has_next is False
+    repo.get_all.assert_called_once_with(
+        limit=11, after=(last.created_at, 7), query=TodoQuery()
+    )
+
+
+def test_list_todos_page_invalid_limit(service, repo):
+    with pytest.raises(ValidationError):
+        service.list_todos_page(limit=0)
+
+
+def test_list_todos_page_invalid_cursor(service, repo):
+    with pytest.raises(ValidationError):
+        service.list_todos_page(limit=10, after="not-a-cursor")
+
+
+@pytest.mark.parametrize(
+    "other",
+    [TodoQuery(descending=True), TodoQuery(sort="updated_at"), TodoQuery(sort="title")],
+)
+def test_list_todos_page_rejects_cursor_of_another_order(service, repo, other):
+    cursor = service.cursor_for(_make_todo(), TodoQuery())
+
+    with pytest.raises(ValidationError):
+        service.list_todos_page(limit=10, after=cursor, query=other)
+    repo.get_all.assert_not_called()
+
+
 # get_todo
 
 def test_get_todo(service, repo):
@@ -85,34 +148,209 @@ def test_create_todo_whitespace_only_title(service, repo):
         service.create_todo("   ")
 
 
+def test_create_todos(service, repo):
+    repo.create_many.return_value = [_make_todo(1, "A"), _make_todo(2, "B")]
+    result = service.create_todos([" A ", "B"])
+    assert [t.title for t in result] == ["A", "B"]
+    sent = repo.create_many.call_args[0][0]
+    assert [t.title for t in sent] == ["A", "B"]
+
+
+def test_create_todos_for_owner(service, repo):
+    repo.create_many.return_value = []
+    service.create_todos(["A"], owner="acme")
+    assert repo.create_many.call_args[0][0][0].owner == "acme"
+
+    with pytest.raises(ValidationError):
+        service.create_todos(["A"], owner="x" * 65)
+
+
+def test_create_todos_rejects_blank_title(service, repo):
+    with pytest.raises(ValidationError):
+        service.create_todos(["Fine", "  "])
+    repo.create_many.assert_not_called()
+
+
+def test_create_todos_rejects_oversized_batch(service, repo):
+    with pytest.raises(ValidationError):
+        service.create_todos(["x"] * 501)
+
+
 # toggle_completed
 
 def test_toggle_completed(service, repo):
-    todo = _make_todo(completed=False)
-    toggled = _make_todo(completed=True)
-    repo.get_by_id.return_value = todo
-    repo.update.return_value = toggled
+    repo.toggle.return_value = _make_todo(completed=True)
 
     result = service.toggle_completed(1)
     assert result.completed is True
-    repo.update.assert_called_once()
+    repo.toggle.assert_called_once_with(1, None)
+    repo.get_by_id.assert_not_called()
+    repo.update.assert_not_called()
 
 
 def test_toggle_completed_not_found(service, repo):
-    repo.get_by_id.return_value = None
+    repo.toggle.return_value = None
     with pytest.raises(NotFoundError):
         service.toggle_completed(999)
 
 
+def test_toggle_completed_changed_since(service, repo):
+    todo = _make_todo()
+    repo.toggle.return_value = None
+    repo.get_by_id.return_value = todo
+
+    with pytest.raises(PreconditionFailedError):
+        service.toggle_completed(1, todo.updated_at)
+    repo.toggle.assert_called_once_with(1, todo.updated_at)
+
+
+def test_conditional_toggle_not_found(service, repo):
+    repo.toggle.return_value = None
+    repo.get_by_id.return_value = None
+    with pytest.raises(NotFoundError):
+        service.toggle_completed(999, datetime.now(UTC))
+
+
+# toggle_todos
+
+def test_toggle_todos(service, repo):
+    toggled = _make_todo(1, completed=True)
+    repo.toggle_many.return_value = [toggled, None, toggled]
+
+    assert service.toggle_todos([1, 2, 1]) == [toggled, None, toggled]
+    repo.toggle_many.assert_called_once_with([1, 2, 1])
+    repo.get_many.assert_not_called()
+
+
+# write_batch
+
+def test_write_batch_is_one_repository_call(service, repo):
+    repo.apply_batch.return_value = TodoBatch([_make_todo(3)], [None], [True])
+
+    batch = service.write_batch([" New "], [1], [2], owner="acme")
+
+    assert batch == repo.apply_batch.return_value
+    (created, toggle, delete), _ = repo.apply_batch.call_args
+    assert [(t.title, t.owner) for t in created] == [("New", "acme")]
+    assert (toggle, delete) == ([1], [2])
+
+
+def test_write_batch_rejects_a_bad_part_before_writing(service, repo):
+    with pytest.raises(ValidationError):
+        service.write_batch(["Fine"], [1], list(range(501)))
+    with pytest.raises(ValidationError):
+        service.write_batch([" "], [1], [2])
+    repo.apply_batch.assert_not_called()
+
+
 # delete_todo
 
 def test_delete_todo(service, repo):
     repo.delete.return_value = True
     service.delete_todo(1)
-    repo.delete.assert_called_once_with(1)
+    repo.delete.assert_called_once_with(1, None)
 
 
 def test_delete_todo_not_found(service, repo):
     repo.delete.return_value = False
     with pytest.raises(NotFoundError):
         service.delete_todo(999)
+
+
+def test_delete_todo_changed_since(service, repo):
+    todo = _make_todo()
+    repo.delete.return_value = False
+    repo.get_by_id.return_value = todo
+
+    with pytest.raises(PreconditionFailedError):
+        service.delete_todo(1, todo.updated_at)
+
+
+# delete_todos
+
+def test_delete_todos(service, repo):
+    repo.delete_many.return_value = [True, False]
+    assert service.delete_todos([1, 2]) == [True, False]
+    repo.delete_many.assert_called_once_with([1, 2])
+
+
+# events
+
+def test_writes_publish_events():
+    repo, events = MagicMock(), MagicMock()
+    service = TodoService(repository=repo, events=events)
+    todo = _make_todo(1)
+    repo.create.return_value = todo
+    repo.toggle.return_value = todo
+    repo.delete_many.return_value = [True, False, True]
+
+    service.create_todo("Test")
+    service.toggle_completed(1)
+    service.delete_todos([1, 2, 1])
+
+    assert [c.args[0] for c in events.publish.call_args_list] == [
+        TodoEvent("created", 1, todo),
+        TodoEvent("toggled", 1, todo),
+        TodoEvent("deleted", 1),
+    ]
+
+
+def test_failed_write_publishes_nothing():
+    repo, events = MagicMock(), MagicMock()
+    service = TodoService(repository=repo, events=events)
+    repo.delete.return_value = False
+
+    with pytest.raises(NotFoundError):
+        service.delete_todo(1)
+    events.publish.assert_not_called()
+
+
+# stats
+
+def test_get_stats(service, repo):
+    repo.get_stats.return_value = TodoStats(total=3, completed=1)
+    stats = service.get_stats()
+    assert (stats.total, stats.completed, stats.open) == (3, 1, 2)
+    repo.count_stats.assert_not_called()
+
+
+# list_changes
+
+def test_list_changes_pages(service, repo):
+    repo.get_pruned_version.return_value = 0
+    repo.get_changes.return_value = [
+        TodoChange(5, 1, _make_todo(1)),
+        TodoChange(6, 2),
+        TodoChange(7, 3, _make_todo(3)),
+    ]
+    page = service.list_changes(service.changes_cursor(4), limit=2)
+
+    repo.get_changes.assert_called_once_with((5, 0), 3)
+    assert [c.todo_id for c in page.items] == [1, 2]
+    assert page.has_next is True
+    assert decode_cursor(page.end_cursor) == (6, 2)
+
+
+def test_list_changes_resumes_from_end_cursor(service, repo):
+    repo.get_pruned_version.return_value = 0
+    repo.get_changes.return_value = [TodoChange(6, 2)]
+    end_cursor = service.list_changes(service.changes_cursor(4)).end_cursor
+
+    repo.get_changes.return_value = []
+    page = service.list_changes(end_cursor)
+    repo.get_changes.assert_called_with((6, 2), 51)
+    assert page.end_cursor == end_cursor
+
+
+def test_list_changes_rejects_listing_cursor(service, repo):
+    listing_cursor = service.cursor_for(_make_todo())
+    with pytest.raises(ValidationError):
+        service.list_changes(listing_cursor)
+
+
+def test_list_changes_expired_cursor(service, repo):
+    repo.get_changes.return_value = []
+    repo.get_pruned_version.return_value = 10
+    with pytest.raises(ExpiredCursorError):
+        service.list_changes(service.changes_cursor(9))
+    assert service.list_changes(service.changes_cursor(10)).items == []
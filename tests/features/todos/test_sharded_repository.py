@@ -0,0 +1,197 @@
+"""Tests for the sharded todo repository adapter. Spreads tenants over SQLite files in a temporary directory."""
+
+from dataclasses import replace
+
+import pytest
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.core.exceptions import UnsupportedError
+from todo_api.core.pagination import encode_cursor
+from todo_api.features.todos.adapters.sharded_repository import (
+    ID_SPAN,
+    ShardedTodoRepository,
+    create_shard,
+)
+from todo_api.features.todos.dependencies import get_todo_repository
+from todo_api.features.todos.domain import Todo, TodoQuery, TodoStats
+
+TENANTS = [f"tenant-{i}" for i in range(12)]
+
+
+@pytest.fixture
+def open_shards(tmp_path):
+    """Open repositories over shard files, closing them all at the end of the test."""
+    opened = []
+
+    def open_shards(*names: str) -> ShardedTodoRepository:
+        repository = ShardedTodoRepository([
+            create_shard(name, position, f"sqlite:///{tmp_path / name}.db")
+            for position, name in enumerate(names)
+        ])
+        repository.create_all()
+        opened.append(repository)
+        return repository
+
+    yield open_shards
+    for repository in opened:
+        repository.close()
+
+
+@pytest.fixture
+def repo(open_shards):
+    return open_shards("a", "b", "c")
+
+
+def _seed(repo, per_tenant=3):
+    return repo.create_many([
+        Todo(title=f"{tenant} {i}", owner=tenant) for tenant in TENANTS for i in range(per_tenant)
+    ])
+
+
+def test_creates_todos_on_their_tenants_shard(repo):
+    created = _seed(repo)
+
+    assert [todo.title for todo in created] == [
+        f"{tenant} {i}" for tenant in TENANTS for i in range(3)
+    ]
+    for todo in created:
+        assert todo.id // ID_SPAN == repo.shard_for(todo.owner).position
+    assert len({todo.id for todo in created}) == len(created)
+    assert len({repo.shard_for(tenant).name for tenant in TENANTS}) == 3
+
+
+def test_listing_merges_every_shard_in_order(repo):
+    created = _seed(repo)
+
+    assert [todo.id for todo in repo.get_all()] == [
+        todo.id for todo in sorted(created, key=lambda t: (t.created_at, t.id))
+    ]
+    by_title = TodoQuery(sort="title", descending=True)
+    expected = sorted(created, key=lambda t: (t.title, t.id), reverse=True)
+    first = repo.get_all(limit=5, query=by_title)
+    assert first == expected[:5]
+    after = (first[-1].title, first[-1].id)
+    assert repo.get_all(limit=5, after=after, query=by_title) == expected[5:10]
+    assert list(repo.iter_all(batch_size=4, query=by_title)) == expected
+
+
+def test_owner_listing_reads_one_shard(repo):
+    _seed(repo)
+
+    todos = repo.get_all(query=TodoQuery(owner="tenant-3"))
+    assert [todo.title for todo in todos] == ["tenant-3 0", "tenant-3 1", "tenant-3 2"]
+
+
+def test_writes_by_id_reach_every_shard(repo):
+    created = _seed(repo)
+    ids = [todo.id for todo in created[::4]]
+
+    assert {todo.id for todo in repo.get_many(ids + [999])} == set(ids)
+    assert repo.toggle(ids[0]).completed is True
+    renamed = repo.update_many([replace(created[4], title="Renamed"), Todo(title="X", id=999)])
+    assert renamed[0].title == "Renamed" and renamed[1] is None
+    assert repo.delete_many([ids[1], 999]) == [True, False]
+    assert repo.get_by_id(ids[1]) is None
+
+    assert repo.get_stats() == TodoStats(total=len(created) - 1, completed=1)
+    assert repo.reconcile_stats() == (repo.get_stats(), repo.get_stats())
+
+
+def test_version_moves_on_with_every_write(repo):
+    before = repo.get_version()
+    repo.create(Todo(title="A", owner="tenant-1"))
+    repo.create(Todo(title="B", owner="tenant-2"))
+
+    assert repo.get_version() == before + 2
+
+
+def test_change_feed_is_not_served(repo):
+    assert repo.has_change_feed is False
+    with pytest.raises(UnsupportedError):
+        repo.get_changes((0, 0), 10)
+
+
+def test_owner_listing_finds_todos_left_by_added_shards(open_shards):
+    created = _seed(open_shards("a", "b"))
+    grown = open_shards("a", "b", "c")
+    mover = next(tenant for tenant, _, _ in grown.misplaced())
+    expected = [todo for todo in created if todo.owner == mover]
+    query = TodoQuery(owner=mover)
+
+    assert grown.get_all(query=query) == expected
+    grown.rebalance()
+    assert grown.get_all(query=query) == expected
+    assert list(grown.iter_all(query=query)) == expected
+
+
+def test_rebalance_moves_tenants_onto_an_added_shard(open_shards):
+    created = _seed(open_shards("a", "b"))
+    grown = open_shards("a", "b", "c")
+    movers = {tenant for tenant, _, _ in grown.misplaced()}
+    assert movers and all(grown.shard_for(tenant).name == "c" for tenant in movers)
+
+    moved = grown.rebalance()
+
+    assert moved == {tenant: 3 for tenant in movers}
+    assert grown.misplaced() == []
+    assert grown.get_all() == sorted(created, key=lambda t: (t.created_at, t.id))
+    assert grown.get_by_id(created[0].id) == created[0]
+    mover = min(movers)
+    assert grown.get_all(query=TodoQuery(owner=mover)) == [
+        todo for todo in created if todo.owner == mover
+    ]
+    assert grown.get_stats() == TodoStats(total=len(created))
+    assert grown.reconcile_stats() == (grown.get_stats(), grown.get_stats())
+
+
+def test_moved_ids_are_not_handed_out_again(open_shards):
+    before = open_shards("a", "b")
+    _seed(before)
+    grown = open_shards("a", "b", "c")
+    mover, source, _ = grown.misplaced()[0]
+    # The last ID the source hands out belongs to the tenant about to leave it
+    last = before.create(Todo(title="Last", owner=mover))
+    stayer = next(t for t in TENANTS if grown.shard_for(t) is source)
+
+    grown.rebalance()
+
+    assert grown.create(Todo(title="New", owner=stayer)).id == last.id + 1
+    assert grown.get_by_id(last.id) == last
+
+
+def test_app_uses_shards_when_configured(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        TestingConfig,
+        "TODOS_SHARDS",
+        f"a=sqlite:///{tmp_path / 'a.db'},b=sqlite:///{tmp_path / 'b.db'}",
+    )
+    app = create_app("testing")
+    client = app.test_client()
+
+    with app.app_context():
+        repository = get_todo_repository()
+        assert isinstance(repository, ShardedTodoRepository)
+        batch = {"owner": "acme", "create": [{"title": "A"}]}
+        assert client.post("/api/todos/batch", json=batch).status_code == 200
+        client.post("/api/todos", json={"title": "B", "owner": "globex"})
+
+        listing = client.get("/api/todos?owner=acme")
+        assert [todo["title"] for todo in listing.get_json()] == ["A"]
+        assert "X-Changes-Cursor" not in listing.headers
+        changes = client.get(f"/api/todos/changes?since={encode_cursor(1, 0)}")
+        assert changes.status_code == 501
+        assert len(client.get("/api/todos").get_json()) == 2
+
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=["todos", "rebalance", "--dry-run"])
+        assert result.exit_code == 0 and result.output == ""
+        result = runner.invoke(args=["todos", "rebalance"])
+        assert "Rebalanced 0 tenants" in result.output
+        repository.close()
+
+
+def test_rebalance_needs_shards(app):
+    result = app.test_cli_runner().invoke(args=["todos", "rebalance"])
+    assert result.exit_code != 0
+    assert "TODOS_SHARDS is not configured" in result.output
@@ -0,0 +1,59 @@
+"""Tests for the GraphQL document cache and Automatic Persisted Queries on the /graphql endpoint."""
+
+import hashlib
+import json
+
+TODOS_QUERY = "{ todos { id title } }"
+TODOS_HASH = hashlib.sha256(TODOS_QUERY.encode()).hexdigest()
+
+
+def _post(client, payload):
+    return client.post("/graphql", data=json.dumps(payload), content_type="application/json")
+
+
+def _persisted(sha):
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha}}
+
+
+def test_repeated_query_is_parsed_once(app, client):
+    _post(client, {"query": TODOS_QUERY})
+    # The cache is built by the first request
+    documents = app.extensions["graphql.documents"]
+    response = _post(client, {"query": TODOS_QUERY})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["todos"] == []
+    assert (documents.stats.misses, documents.stats.hits) == (1, 1)
+
+
+def test_cached_validation_errors_are_reported(client):
+    for _ in range(2):
+        response = _post(client, {"query": "{ todos { nope } }"})
+        assert response.status_code == 400
+        assert "nope" in response.get_json()["errors"][0]["message"]
+
+
+def test_syntax_error_is_reported(client):
+    response = _post(client, {"query": "{ todos {"})
+    assert response.status_code == 400
+    assert response.get_json()["errors"]
+
+
+def test_persisted_query_round_trip(client):
+    response = _post(client, {"extensions": _persisted(TODOS_HASH)})
+    assert response.status_code == 200
+    error = response.get_json()["errors"][0]
+    assert error["message"] == "PersistedQueryNotFound"
+    assert error["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    response = _post(client, {"query": TODOS_QUERY, "extensions": _persisted(TODOS_HASH)})
+    assert response.get_json()["data"]["todos"] == []
+
+    response = _post(client, {"extensions": _persisted(TODOS_HASH)})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["todos"] == []
+
+
+def test_persisted_query_hash_mismatch(client):
+    response = _post(client, {"query": TODOS_QUERY, "extensions": _persisted("0" * 64)})
+    assert response.status_code == 400
+    assert response.get_json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
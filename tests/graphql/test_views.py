@@ -0,0 +1,30 @@
+"""Tests for the /graphql endpoint's deferred loading of the GraphQL libraries and schema."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import todo_api
+
+_CHECK = """
+import sys
+from todo_api import create_app
+app = create_app("testing")
+assert "graphql" not in sys.modules and "ariadne" not in sys.modules, "loaded at startup"
+response = app.test_client().post("/graphql", json={"query": "{ todoStats { total } }"})
+assert response.status_code == 200, response.status_code
+assert "graphql.documents" in app.extensions
+"""
+
+
+def test_graphql_loaded_by_first_request_not_startup():
+    # A fresh interpreter, since this one has already imported the schema
+    src = str(Path(todo_api.__file__).parent.parent)
+    result = subprocess.run(
+        [sys.executable, "-c", _CHECK],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": src, "LOG_LEVEL": "WARNING"},
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
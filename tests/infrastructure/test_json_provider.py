@@ -0,0 +1,50 @@
+"""JSON provider tests. Verifies the orjson provider emits the same bytes as Flask's default provider."""
+
+import dataclasses
+import uuid
+from datetime import UTC, date, datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+pytest.importorskip("orjson")
+
+from todo_api.infrastructure.json_provider import OrjsonProvider
+
+
+@dataclasses.dataclass
+class _Point:
+    y: int
+    x: int
+
+
+PAYLOADS = [
+    {"b": 1, "a": [True, None, "x"], "nested": {"z": 1, "m": 2}},
+    [{"title": "Buy milk", "id": 1}],
+    {"when": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC), "day": date(2024, 1, 2)},
+    {"id": uuid.UUID(int=1), "point": _Point(y=2, x=1)},
+    {"title": "café ✓"},
+    {1: "int keys"},
+    2**70,
+    [],
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize("debug", [False, True])
+def test_response_bytes_match_default_provider(app, payload, debug):
+    app.debug = debug
+    expected = DefaultJSONProvider(app).response(payload).get_data()
+
+    assert OrjsonProvider(app).response(payload).get_data() == expected
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_dumps_matches_default_provider(app, payload):
+    for kwargs in ({}, {"separators": (",", ":")}, {"indent": 2}):
+        expected = DefaultJSONProvider(app).dumps(payload, **kwargs)
+        assert OrjsonProvider(app).dumps(payload, **kwargs) == expected
+
+
+def test_auto_provider_is_orjson(app):
+    assert isinstance(app.json, OrjsonProvider)
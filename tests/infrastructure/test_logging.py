@@ -0,0 +1,27 @@
+"""Logging tests. Verifies records are formatted as JSON lines including extra fields."""
+
+import json
+import logging
+
+from todo_api.infrastructure.logging import JsonFormatter
+
+
+def test_json_formatter_merges_extra_fields():
+    record = logging.makeLogRecord(
+        {
+            "name": "todo_api.requests",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+            "msg": "GET %s",
+            "args": ("/api/todos",),
+            "status": 200,
+        }
+    )
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "GET /api/todos"
+    assert payload["logger"] == "todo_api.requests"
+    assert payload["level"] == "INFO"
+    assert payload["status"] == 200
+    assert "timestamp" in payload
@@ -0,0 +1,52 @@
+"""Metrics tests. Verifies counters and histograms render valid Prometheus text."""
+
+from todo_api.infrastructure.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_counter_renders_per_label_set():
+    counter = Counter("jobs_total", "Jobs run.", ("kind",))
+    counter.inc("a")
+    counter.inc("a", amount=2)
+    counter.inc("b")
+
+    assert counter.render() == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="a"} 3',
+        'jobs_total{kind="b"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.1, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.6',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+    assert histogram.count("/a") == 3
+
+
+def test_label_values_are_escaped():
+    counter = Counter("paths_total", "Paths.", ("path",))
+    counter.inc('/say "hi"')
+
+    assert counter.render()[-1] == 'paths_total{path="/say \\"hi\\""} 1'
+
+
+def test_registry_renders_all_metrics():
+    registry = MetricsRegistry()
+    registry.register(Counter("a_total", "A."))
+    registry.register(Histogram("b_seconds", "B."))
+
+    text = registry.render()
+
+    assert "# TYPE a_total counter" in text
+    assert "# TYPE b_seconds histogram" in text
+    assert text.endswith("\n")
@@ -0,0 +1,97 @@
+"""Request instrumentation tests. Verifies Server-Timing headers, query counting, request logs and the /metrics endpoint."""
+
+import logging
+import re
+import time
+
+from todo_api import create_app
+from todo_api.config import TestingConfig
+from todo_api.features.todos.dependencies import get_todo_shards
+
+
+def _timing(response, name):
+    header = response.headers["Server-Timing"]
+    match = re.search(rf'{name};dur=([\d.]+)(?:;desc="(\d+) queries")?', header)
+    assert match is not None
+    return match
+
+
+def test_server_timing_header_reports_phases(client):
+    client.post("/api/todos", json={"title": "Timed"})
+
+    response = client.get("/api/todos")
+
+    assert float(_timing(response, "total").group(1)) > 0
+    assert int(_timing(response, "db").group(2)) >= 1
+    assert float(_timing(response, "serialize").group(1)) >= 0
+
+
+def test_serialize_phase_includes_json_encoding(app, client, monkeypatch):
+    encode = app.json.response
+
+    def slow_encode(*args, **kwargs):
+        time.sleep(0.05)
+        return encode(*args, **kwargs)
+
+    monkeypatch.setattr(app.json, "response", slow_encode)
+    response = client.get("/api/todos")
+
+    assert float(_timing(response, "serialize").group(1)) >= 50
+
+
+def test_db_timing_covers_shard_engines(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        TestingConfig,
+        "TODOS_SHARDS",
+        f"a=sqlite:///{tmp_path / 'a.db'},b=sqlite:///{tmp_path / 'b.db'}",
+    )
+    app = create_app("testing")
+
+    with app.app_context():
+        response = app.test_client().get("/api/todos?owner=acme")
+        get_todo_shards().close()
+
+    assert int(_timing(response, "db").group(2)) >= 1
+    assert float(_timing(response, "db").group(1)) > 0
+
+
+def test_query_count_is_per_request(client):
+    response = client.get("/health")
+
+    assert _timing(response, "db").group(2) == "0"
+
+
+def test_request_log_line_carries_timings(client, caplog):
+    with caplog.at_level(logging.INFO, logger="todo_api.requests"):
+        client.get("/api/todos/42")
+
+    record = next(r for r in caplog.records if r.name == "todo_api.requests")
+    assert record.route == "/api/todos/<int:todo_id>"
+    assert record.status == 404
+    assert record.db_queries >= 1
+    assert record.duration_ms > 0
+
+
+def test_slow_requests_log_as_warning(app, client, caplog):
+    app.config["SLOW_REQUEST_MS"] = 0
+
+    with caplog.at_level(logging.INFO, logger="todo_api.requests"):
+        client.get("/health")
+
+    record = next(r for r in caplog.records if r.name == "todo_api.requests")
+    assert record.levelno == logging.WARNING
+
+
+def test_metrics_endpoint_exposes_latency_histograms(client):
+    client.get("/api/todos")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    text = response.get_data(as_text=True)
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/todos",status="200"} 1'
+        in text
+    )
+    assert 'http_request_db_queries_bucket{method="GET",route="/api/todos",le="+Inf"} 1' in text
@@ -0,0 +1,21 @@
+"""Tests for serving the OpenAPI spec with cached bytes and an ETag."""
+
+from todo_api.infrastructure.openapi import SPEC_PATH
+
+
+def test_spec_served_with_etag(client):
+    response = client.get("/api/docs")
+    assert response.status_code == 200
+    assert response.content_type == "application/yaml"
+    assert response.data == SPEC_PATH.read_bytes()
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+
+def test_matching_etag_is_not_modified(client):
+    etag = client.get("/api/docs").headers["ETag"]
+
+    response = client.get("/api/docs", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert client.get("/api/docs", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,94 @@
+"""Request profiling tests. Verifies flagged requests return reports and sampled requests are stored."""
+
+import threading
+import time
+
+import pytest
+
+from todo_api.infrastructure import profiling
+from todo_api.infrastructure.profiling import StackSampler
+
+
+@pytest.fixture
+def profiled_app(app, tmp_path):
+    app.config.update(
+        PROFILING_ENABLED=True, PROFILING_SAMPLE_INTERVAL=0.001, PROFILING_DIR=str(tmp_path)
+    )
+    profiling.init_app(app)
+    return app
+
+
+def test_profiling_disabled_by_default(client):
+    response = client.get("/api/todos", headers={"X-Profile": "pstats"})
+
+    assert response.is_json
+    assert "X-Profiled-Status" not in response.headers
+
+
+def test_header_returns_pstats_report(profiled_app):
+    response = profiled_app.test_client().get("/api/todos", headers={"X-Profile": "pstats"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert "cumulative" in response.get_data(as_text=True)
+
+
+def test_query_flag_returns_collapsed_stacks(profiled_app):
+    response = profiled_app.test_client().get("/api/todos?profile=collapsed")
+
+    assert response.headers["X-Profiled-Status"] == "200"
+    for line in response.get_data(as_text=True).splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) >= 1
+
+
+def test_token_required_when_configured(app, tmp_path):
+    app.config.update(
+        PROFILING_ENABLED=True, PROFILING_TOKEN="s3cret", PROFILING_DIR=str(tmp_path)
+    )
+    profiling.init_app(app)
+    client = app.test_client()
+
+    denied = client.get("/api/todos", headers={"X-Profile": "pstats"})
+    allowed = client.get(
+        "/api/todos", headers={"X-Profile": "pstats", "X-Profile-Token": "s3cret"}
+    )
+
+    assert denied.is_json
+    assert allowed.headers["X-Profiled-Status"] == "200"
+
+
+def test_sampled_requests_are_stored_without_changing_response(app, tmp_path):
+    app.config.update(
+        PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=str(tmp_path)
+    )
+    profiling.init_app(app)
+
+    response = app.test_client().get("/api/todos")
+
+    assert response.is_json
+    [stored] = tmp_path.iterdir()
+    assert "-GET-api_todos-" in stored.name
+    assert stored.suffix == ".collapsed"
+
+
+def test_stack_sampler_collects_target_thread_stacks():
+    done = threading.Event()
+
+    def busy_wait():
+        while not done.is_set():
+            time.sleep(0.001)
+
+    worker = threading.Thread(target=busy_wait)
+    worker.start()
+    sampler = StackSampler(worker.ident, interval=0.001)
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    done.set()
+    worker.join()
+
+    assert sampler.samples
+    assert all("busy_wait" in stack for stack in sampler.samples)
@@ -0,0 +1,84 @@
+"""Tests for cookie-based read-your-writes stickiness."""
+
+import time
+
+from flask import Flask
+from itsdangerous import Signer
+
+from todo_api.infrastructure.read_your_writes import STICKY_COOKIE, CookieStickiness
+
+
+def _app(stickiness: CookieStickiness) -> Flask:
+    app = Flask(__name__)
+    app.secret_key = "test"
+    stickiness.init_app(app)
+
+    @app.post("/write")
+    def write():
+        stickiness.wrote()
+        return {"pinned": stickiness.pinned()}
+
+    @app.get("/read")
+    def read():
+        return {"pinned": stickiness.pinned()}
+
+    return app
+
+
+def test_writes_pin_the_client_for_the_window():
+    stickiness = CookieStickiness(window=0.2)
+    client = _app(stickiness).test_client()
+
+    assert client.get("/read").get_json() == {"pinned": False}
+    response = client.post("/write")
+    assert response.get_json() == {"pinned": True}
+    assert STICKY_COOKIE in response.headers["Set-Cookie"]
+    assert "HttpOnly" in response.headers["Set-Cookie"]
+
+    assert client.get("/read").get_json() == {"pinned": True}
+    assert "Set-Cookie" not in client.get("/read").headers
+    time.sleep(0.3)
+    assert client.get("/read").get_json() == {"pinned": False}
+
+
+def test_other_clients_are_not_pinned():
+    app = _app(CookieStickiness(window=5))
+    app.test_client().post("/write")
+
+    assert app.test_client().get("/read").get_json() == {"pinned": False}
+
+
+def test_ignores_a_malformed_cookie():
+    client = _app(CookieStickiness(window=5)).test_client()
+    client.set_cookie(STICKY_COOKIE, "soon")
+
+    assert client.get("/read").get_json() == {"pinned": False}
+
+
+def test_ignores_an_unsigned_cookie():
+    client = _app(CookieStickiness(window=5)).test_client()
+    client.set_cookie(STICKY_COOKIE, "1e18")
+
+    assert client.get("/read").get_json() == {"pinned": False}
+
+
+def test_ignores_a_cookie_signed_with_another_key():
+    other = _app(CookieStickiness(window=5))
+    other.secret_key = "other"
+    cookie = other.test_client().post("/write").headers["Set-Cookie"]
+    client = _app(CookieStickiness(window=5)).test_client()
+    client.set_cookie(STICKY_COOKIE, cookie.split(";")[0].split("=", 1)[1])
+
+    assert client.get("/read").get_json() == {"pinned": False}
+
+
+def test_rejects_a_non_finite_end():
+    client = _app(CookieStickiness(window=5)).test_client()
+    signed = Signer("test", salt=STICKY_COOKIE).sign("inf").decode()
+    client.set_cookie(STICKY_COOKIE, signed)
+
+    assert client.get("/read").get_json() == {"pinned": False}
+
+
+def test_work_outside_requests_reads_the_primary():
+    assert CookieStickiness(window=5).pinned() is True
@@ -1,7 +1,12 @@
 """Database integration tests. Verifies that the Todo model and database tables are created correctly."""
 
+from sqlalchemy import create_engine, text
+
+from todo_api import create_app
+from todo_api.config import ProductionConfig, TestingConfig
 from todo_api.extensions import db
 from todo_api.features.todos.models import TodoModel
+from todo_api.infrastructure.database import configure_sqlite
 
 
 def test_todo_table_exists(app):
@@ -24,3 +29,56 @@ def test_todo_model_roundtrip(app):
         assert retrieved.completed is False
         assert retrieved.created_at is not None
         assert retrieved.updated_at is not None
+
+
+def test_sqlite_pragmas_applied_to_app_connections(app):
+    """Verify the configured pragmas are set on connections from the app engine."""
+    with app.app_context():
+        busy_timeout = db.session.execute(text("PRAGMA busy_timeout")).scalar()
+        assert busy_timeout == app.config["SQLITE_PRAGMAS"]["busy_timeout"]
+
+
+def test_configure_sqlite_enables_wal_on_file_database(tmp_path):
+    """Verify a file database switches to WAL with the configured synchronous level."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    configure_sqlite(engine, {"journal_mode": "WAL", "synchronous": "NORMAL"})
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL is reported as 1
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+    engine.dispose()
+
+
+def test_production_config_pool_options():
+    """Verify production configures a bounded, pre-pinged, recycled connection pool."""
+    options = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+    assert options["pool_size"] > 0
+    assert options["max_overflow"] >= 0
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] > 0
+
+
+def test_apps_get_their_own_dict_settings():
+    """Verify changing an app's dict settings leaves the config class and other apps alone."""
+    first, second = create_app("testing"), create_app("testing")
+    first.config["SQLITE_PRAGMAS"]["busy_timeout"] = 1
+
+    assert second.config["SQLITE_PRAGMAS"]["busy_timeout"] != 1
+    assert TestingConfig.SQLITE_PRAGMAS["busy_timeout"] != 1
+
+
+def test_tables_created_by_cli_when_not_at_startup(tmp_path, monkeypatch):
+    """Verify startup skips create_all unless enabled, leaving it to `flask db create`."""
+    monkeypatch.setattr(TestingConfig, "DATABASE_CREATE_ALL", False)
+    database_uri = f"sqlite:///{tmp_path / 'cli.db'}"
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", database_uri)
+    app = create_app("testing")
+    with app.app_context():
+        assert db.inspect(db.engine).get_table_names() == []
+
+    result = app.test_cli_runner().invoke(args=["db", "create"])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        tables = db.inspect(db.engine).get_table_names()
+        assert {"todos", "todos_fts"} <= set(tables)
+        db.engine.dispose()
@@ -0,0 +1,123 @@
+"""Query plan regression tests. Runs EXPLAIN QUERY PLAN on every statement issued by the SQL repository's hot queries and fails on full table scans or temporary sort B-trees."""
+
+import pytest
+from sqlalchemy import event
+
+from todo_api.extensions import db
+from todo_api.features.todos.adapters.sql_repository import SqlTodoRepository
+from todo_api.features.todos.domain import SORT_FIELDS, Todo, TodoQuery
+
+
+@pytest.fixture
+def repo(app):
+    """Provide a SqlTodoRepository with a few rows so the planner sees a populated table."""
+    with app.app_context():
+        repository = SqlTodoRepository()
+        for i in range(5):
+            repository.create(Todo(title=f"Todo {i}", completed=i % 2 == 0))
+        yield repository
+
+
+@pytest.fixture
+def captured_selects(app):
+    """Record every SELECT statement (with parameters) sent to the database."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _capture)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", _capture)
+
+
+def _query_plan(statement, parameters):
+    rows = db.session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return [row[3] for row in rows]
+
+
+def _assert_indexed(statements):
+    assert statements, "expected the repository to issue at least one SELECT"
+    for statement, parameters in statements:
+        plan = _query_plan(statement, parameters)
+        for detail in plan:
+            assert "TEMP B-TREE" not in detail, f"temp sort in plan {plan} for {statement}"
+            if detail.startswith("SCAN"):
+                assert "USING" in detail, f"full table scan in plan {plan} for {statement}"
+
+
+def test_declared_indexes_exist(app):
+    with app.app_context():
+        indexes = {ix["name"] for ix in db.inspect(db.engine).get_indexes("todos")}
+    assert {
+        "ix_todos_created_at_id",
+        "ix_todos_completed_created_at",
+        "ix_todos_updated_at_id",
+        "ix_todos_title_id",
+    } <= indexes
+
+
+def test_get_all_plan(repo, captured_selects):
+    repo.get_all()
+    _assert_indexed(captured_selects)
+
+
+def test_get_all_first_page_plan(repo, captured_selects):
+    repo.get_all(limit=2)
+    _assert_indexed(captured_selects)
+
+
+def test_get_all_after_cursor_plan(repo, captured_selects):
+    first = repo.get_all(limit=1)[0]
+    captured_selects.clear()
+    repo.get_all(limit=2, after=(first.created_at, first.id))
+    _assert_indexed(captured_selects)
+
+
+@pytest.mark.parametrize("sort", SORT_FIELDS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_page_plan(repo, captured_selects, sort, descending):
+    query = TodoQuery(sort=sort, descending=descending)
+    first = repo.get_all(limit=1, query=query)[0]
+    captured_selects.clear()
+    repo.get_all(limit=2, after=(getattr(first, sort), first.id), query=query)
+    _assert_indexed(captured_selects)
+
+
+def test_completed_filter_plan(repo, captured_selects):
+    repo.get_all(limit=2, query=TodoQuery(completed=True))
+    _assert_indexed(captured_selects)
+    plan = _query_plan(*captured_selects[0])
+    assert any("ix_todos_completed_created_at" in detail for detail in plan), plan
+
+
+def test_search_plan(repo, captured_selects):
+    repo.get_all(limit=2, query=TodoQuery(search="todo"))
+    plan = _query_plan(*captured_selects[0])
+    assert any("todos_fts VIRTUAL TABLE INDEX" in detail for detail in plan), plan
+    assert not any(
+        detail.startswith("SCAN") and "USING" not in detail and "todos_fts" not in detail
+        for detail in plan
+    ), plan
+
+
+def test_get_by_id_plan(repo, captured_selects):
+    repo.get_by_id(1)
+    _assert_indexed(captured_selects)
+
+
+def test_get_stats_plan(repo, captured_selects):
+    repo.get_stats()
+    _assert_indexed(captured_selects)
+    assert not any("todos" in statement.split("FROM")[1] for statement, _ in captured_selects)
+
+
+def test_get_changes_plan(repo, captured_selects):
+    repo.delete(1)
+    captured_selects.clear()
+    repo.get_changes((1, 0), limit=10)
+    _assert_indexed(captured_selects)
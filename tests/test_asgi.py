@@ -0,0 +1,152 @@
+"""Tests for the ASGI entry point. Exercises the async REST routes and GraphQL executor against an in-memory aiosqlite database."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from starlette.testclient import TestClient
+
+from todo_api.asgi import create_asgi_app
+
+
+@pytest.fixture
+def asgi_client():
+    """Provide a Starlette test client with the app's lifespan running."""
+    with TestClient(create_asgi_app("testing")) as client:
+        yield client
+
+
+def test_health(asgi_client):
+    response = asgi_client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_openapi_spec_revalidates_with_etag(asgi_client):
+    response = asgi_client.get("/api/docs")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/yaml"
+
+    etag = response.headers["ETag"]
+    assert asgi_client.get("/api/docs", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_todo_crud(asgi_client):
+    response = asgi_client.post("/api/todos", json={"title": "Async"})
+    assert response.status_code == 201
+    todo_id = response.json()["id"]
+
+    assert asgi_client.get(f"/api/todos/{todo_id}").json()["title"] == "Async"
+    assert asgi_client.patch(f"/api/todos/{todo_id}").json()["completed"] is True
+    assert asgi_client.delete(f"/api/todos/{todo_id}").status_code == 204
+    assert asgi_client.get(f"/api/todos/{todo_id}").status_code == 404
+
+
+def test_create_todo_validation(asgi_client):
+    assert asgi_client.post("/api/todos", json={}).status_code == 400
+    assert asgi_client.post("/api/todos", json={"title": "  "}).status_code == 400
+
+
+def test_list_todos_paginated(asgi_client):
+    for title in ("First", "Second", "Third"):
+        asgi_client.post("/api/todos", json={"title": title})
+
+    response = asgi_client.get("/api/todos?limit=2")
+    assert [t["title"] for t in response.json()] == ["First", "Second"]
+    next_url = response.headers["Link"].split(";")[0].strip("<>")
+    assert [t["title"] for t in asgi_client.get(next_url).json()] == ["Third"]
+    assert len(asgi_client.get("/api/todos").json()) == 3
+
+
+def test_batch_todos(asgi_client):
+    response = asgi_client.post(
+        "/api/todos/batch", json={"create": [{"title": "A"}], "toggle": [999]}
+    )
+    data = response.json()
+    assert [t["title"] for t in data["created"]] == ["A"]
+    assert data["toggled"][0]["status"] == 404
+
+
+def test_graphql(asgi_client):
+    response = asgi_client.post(
+        "/graphql", json={"query": 'mutation { createTodo(title: "Async") { id } }'}
+    )
+    todo_id = response.json()["data"]["createTodo"]["id"]
+
+    response = asgi_client.post(
+        "/graphql",
+        json={
+            "query": "query($id: ID!) { todo(id: $id) { title } todos { id } }",
+            "variables": {"id": todo_id},
+        },
+    )
+    data = response.json()["data"]
+    assert data["todo"]["title"] == "Async"
+    assert len(data["todos"]) == 1
+
+
+def test_todo_stats(asgi_client):
+    asgi_client.post("/api/todos/batch", json={"create": [{"title": "A"}, {"title": "B"}]})
+    asgi_client.patch("/api/todos/1")
+
+    assert asgi_client.get("/api/todos/stats").json() == {"total": 2, "completed": 1, "open": 1}
+    response = asgi_client.post("/graphql", json={"query": "{ todoStats { open } }"})
+    assert response.json()["data"]["todoStats"] == {"open": 1}
+
+
+def test_list_changes(asgi_client):
+    asgi_client.post("/api/todos", json={"title": "A"})
+    cursor = asgi_client.get("/api/todos").headers["X-Changes-Cursor"]
+    asgi_client.delete("/api/todos/1")
+
+    data = asgi_client.get("/api/todos/changes", params={"since": cursor}).json()
+    assert data["deleted"] == [1]
+    assert asgi_client.get("/api/todos/changes").status_code == 400
+
+
+def test_todo_events_subscription(asgi_client):
+    with asgi_client.websocket_connect("/graphql/", subprotocols=["graphql-transport-ws"]) as ws:
+        ws.send_json({"type": "connection_init"})
+        assert ws.receive_json()["type"] == "connection_ack"
+        ws.send_json({
+            "type": "subscribe",
+            "id": "1",
+            "payload": {"query": "subscription { todoEvents { type id todo { title } } }"},
+        })
+        # Wait until the subscription is registered before writing
+        while len(asgi_client.app.state.todo_events) == 0:
+            time.sleep(0.001)
+
+        asgi_client.post("/api/todos", json={"title": "Live"})
+        asgi_client.delete("/api/todos/1")
+
+        events = [ws.receive_json()["payload"]["data"]["todoEvents"] for _ in range(2)]
+        assert events == [
+            {"type": "CREATED", "id": "1", "todo": {"title": "Live"}},
+            {"type": "DELETED", "id": "1", "todo": None},
+        ]
+        ws.send_json({"type": "complete", "id": "1"})
+
+
+def test_todo_events_stream(asgi_client):
+    events = asgi_client.app.state.todo_events
+
+    def write_then_shut_down():
+        while len(events) == 0:
+            time.sleep(0.001)
+        asgi_client.post("/api/todos", json={"title": "Live"})
+        # Closing the broker ends open streams, as on shutdown
+        events.close()
+
+    writer = threading.Thread(target=write_then_shut_down)
+    writer.start()
+    response = asgi_client.get("/api/todos/events")
+    writer.join()
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = response.text.split("\n\n")
+    assert messages[0] == "retry: 3000"
+    assert messages[1].startswith('event: created\ndata: {"id":1,"title":"Live"')